@@ -0,0 +1,107 @@
+"""
+Nearest-neighbour index over past analyses
+Lets a recurring fault reuse the diagnosis of the closest previous one
+"""
+
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from llm_cache import parse_feature_lines
+
+
+class AnalysisIndex:
+    """In-memory index of feature-deviation vectors of past analyses.
+
+    Each analysis is embedded as a vector of z-scores over `features` (zero for
+    features outside its top-k block, clipped to +/-z_cap), parsed from its
+    feature_analysis text. nearest() is one vectorized distance computation over
+    at most `capacity` stored analyses; the oldest are overwritten first. Like
+    AnalysisCache entries, analyses older than `max_age_seconds` (by their "time"
+    field) are never reused.
+    """
+
+    def __init__(self, features: List[str], max_distance: float = 1.0,
+                 max_age_seconds: float = 86400, z_cap: float = 10.0, capacity: int = 5000):
+        self.features = list(features)
+        self._column = {feature: i for i, feature in enumerate(self.features)}
+        self.max_distance = max_distance
+        self.max_age_seconds = max_age_seconds
+        self.z_cap = z_cap
+        self.capacity = capacity
+        self.vectors = np.zeros((capacity, len(self.features)))
+        self.times = np.zeros(capacity)
+        self.records: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.count = 0
+        self.lookups = 0
+        self.reuses = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def vector(self, comparison: str) -> Optional[np.ndarray]:
+        vec = np.zeros(len(self.features))
+        found = False
+        for feature, z in parse_feature_lines(comparison or ""):
+            i = self._column.get(feature)
+            if i is not None:
+                vec[i] = np.clip(z, -self.z_cap, self.z_cap)
+                found = True
+        return vec if found else None
+
+    def add(self, record: Dict[str, Any]) -> bool:
+        """Index an analysis record (needs feature_analysis and at least one successful model)"""
+        analyses = record.get("llm_analyses") or {}
+        if not any(a.get("status") == "success" for a in analyses.values()):
+            return False
+        vec = self.vector(record.get("feature_analysis", ""))
+        if vec is None:
+            return False
+        slot = self.count % self.capacity
+        self.vectors[slot] = vec
+        self.times[slot] = float(record.get("time") or 0.0)
+        self.records[slot] = record
+        self.count += 1
+        return True
+
+    def load_jsonl(self, path: str) -> int:
+        added = 0
+        try:
+            with open(path) as f:
+                for line in f:
+                    try:
+                        added += self.add(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return added
+
+    def nearest(self, comparison: str, max_distance: Optional[float] = None) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """(distance, record) of the closest past analysis within max_distance and
+        max_age_seconds, else None"""
+        self.lookups += 1
+        vec = self.vector(comparison)
+        n = len(self)
+        if vec is None or n == 0:
+            return None
+        distances = np.linalg.norm(self.vectors[:n] - vec, axis=1)
+        distances[self.times[:n] < time.time() - self.max_age_seconds] = np.inf
+        best = int(np.argmin(distances))
+        limit = self.max_distance if max_distance is None else max_distance
+        if distances[best] > limit:
+            return None
+        self.reuses += 1
+        return float(distances[best]), self.records[best]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "indexed": len(self),
+            "capacity": self.capacity,
+            "max_distance": self.max_distance,
+            "max_age_seconds": self.max_age_seconds,
+            "lookups": self.lookups,
+            "reuses": self.reuses,
+        }
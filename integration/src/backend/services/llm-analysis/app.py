@@ -7,6 +7,7 @@ from pydantic import BaseModel
 from dotenv import load_dotenv
 import json
 import base64
+import httpx
 import matplotlib
 import pandas as pd
 import asyncio
@@ -15,6 +16,10 @@ matplotlib.use("Agg")
 
 from prompts import EXPLAIN_PROMPT, EXPLAIN_ROOT, SYSTEM_MESSAGE
 from multi_llm_client import MultiLLMClient
+from llm_jobs import LLMJobQueue
+from llm_cache import AnalysisCache
+from analysis_index import AnalysisIndex
+from prompt_budget import compact_prompt
 
 import sys
 import os
@@ -60,6 +65,9 @@ try:
     config = load_config(config_path)
 
     PROMPT_SELECT = EXPLAIN_PROMPT if config["prompt"] == "explain" else EXPLAIN_ROOT
+    # The process description and the task instructions never change, so they form one compacted
+    # system message that providers can cache; per-fault user prompts carry only the feature block.
+    ANALYSIS_SYSTEM_MESSAGE = compact_prompt(f"{SYSTEM_MESSAGE}\n\n{PROMPT_SELECT}")
     fault_trigger_consecutive_step = config["fault_trigger_consecutive_step"]
 
     # Initialize Multi-LLM Client
@@ -75,7 +83,7 @@ from typing import Optional, Dict, Any, List
 from collections import deque
 from fastapi import Body
 
-from model import FaultDetectionModel
+from model import FaultDetectionModel, RecursivePCA, training_key
 
 # Feature columns to use for PCA (match bridge mapping and frontend columnFilter subset)
 FEATURE_COLUMNS: List[str] = [
@@ -87,22 +95,46 @@ FEATURE_COLUMNS: List[str] = [
     "Separator Coolant Temp"
 ]
 
-# Train PCA model on normal operation (fault0.csv) restricted to FEATURE_COLUMNS
+# PCA model for normal operation (fault0.csv) restricted to FEATURE_COLUMNS.
+# The fitted model is cached as data/models/pca_<key>.npz, where key hashes the
+# training file and fit parameters, so restarts only retrain when the data changes.
 import pandas as _pd
 
 try:
-    _train_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "fault0.csv")
-    _train_df = _pd.read_csv(_train_path)
-    if "time" in _train_df.columns:
-        _train_df = _train_df.drop(columns=["time"])  # drop timestamp col if present
-    missing_cols = [c for c in FEATURE_COLUMNS if c not in _train_df.columns]
-    if missing_cols:
-        raise RuntimeError(f"Training data missing expected columns: {missing_cols}")
-    _train_df = _train_df[FEATURE_COLUMNS]
-
-    pca_model = FaultDetectionModel(n_components=0.9, alpha=config.get("anomaly_threshold", 0.01))
-    pca_model.fit(_train_df)
-    print("✅ PCA model trained on normal operation (fault0.csv) with", len(FEATURE_COLUMNS), "features")
+    _data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+    _train_path = os.path.join(_data_dir, "fault0.csv")
+    _model_params = {"n_components": 0.9, "alpha": config.get("anomaly_threshold", 0.01)}
+    _model_key = training_key(_train_path, FEATURE_COLUMNS, **_model_params)
+    _model_path = os.path.join(_data_dir, "models", f"pca_{_model_key}.npz")
+    _model_opts = {
+        "buffer_size": int(config.get("pca_buffer_size", 10000)),
+        "monitor": config.get("anomaly_statistic", "t2"),
+    }
+
+    pca_model = None
+    if os.path.exists(_model_path):
+        try:
+            pca_model = FaultDetectionModel.load(_model_path, **_model_opts)
+            print("✅ PCA model loaded from", os.path.basename(_model_path))
+        except Exception as e:
+            print("⚠️ Could not load saved PCA model, retraining:", e)
+
+    if pca_model is None:
+        _train_df = _pd.read_csv(_train_path)
+        if "time" in _train_df.columns:
+            _train_df = _train_df.drop(columns=["time"])  # drop timestamp col if present
+        missing_cols = [c for c in FEATURE_COLUMNS if c not in _train_df.columns]
+        if missing_cols:
+            raise RuntimeError(f"Training data missing expected columns: {missing_cols}")
+        _train_df = _train_df[FEATURE_COLUMNS]
+
+        pca_model = FaultDetectionModel(**_model_params, **_model_opts)
+        pca_model.fit(_train_df)
+        print("✅ PCA model trained on normal operation (fault0.csv) with", len(FEATURE_COLUMNS), "features")
+        try:
+            pca_model.save(_model_path, key=_model_key)
+        except OSError as e:
+            print("⚠️ Could not save PCA model:", e)
 except Exception as e:
     print("❌ Failed to initialize PCA model:", e)
     raise
@@ -117,6 +149,23 @@ llm_min_interval_seconds = int(config.get("llm_min_interval_seconds", 60))
 feature_shift_jaccard_threshold = float(config.get("feature_shift_jaccard_threshold", 0.6))
 feature_shift_min_interval_seconds = int(config.get("feature_shift_min_interval_seconds", 120))
 
+# Optional recursive PCA: follows slow drift on normal points and hot-swaps refreshed models
+def _make_adaptive_pca(cfg: Dict[str, Any]) -> RecursivePCA:
+    return RecursivePCA(
+        pca_model,
+        forgetting=float(cfg.get("forgetting", 0.999)),
+        refresh_every=int(cfg.get("refresh_every", 50)),
+    )
+
+_adaptive_cfg: Dict[str, Any] = config.get("adaptive_pca", {})
+adaptive_pca: Optional[RecursivePCA] = _make_adaptive_pca(_adaptive_cfg) if _adaptive_cfg.get("enabled", False) else None
+
+# LLM analyses triggered from /ingest run as background jobs (see llm_jobs.py)
+llm_jobs = LLMJobQueue(
+    max_pending=int(config.get("llm_max_pending_jobs", 4)),
+    workers=int(config.get("llm_job_workers", 1)),
+)
+
 _consecutive_anomalies = 0
 _last_analysis_result: Optional[Dict[str, Any]] = None
 _last_llm_trigger_time: float = 0.0
@@ -197,6 +246,67 @@ _history_md_file = os.path.join(_diag_dir, 'analysis_history.md')
 _history_days_dir = os.path.join(_diag_dir, 'analysis_history')
 os.makedirs(_history_days_dir, exist_ok=True)
 
+# Fault-signature cache of LLM analyses (see llm_cache.py), persisted next to the history
+_cache_cfg: Dict[str, Any] = config.get("llm_cache", {})
+llm_cache: Optional[AnalysisCache] = AnalysisCache(
+    os.path.join(_diag_dir, "llm_cache.json"),
+    max_entries=int(_cache_cfg.get("max_entries", 256)),
+    ttl_seconds=float(_cache_cfg.get("ttl_seconds", 24 * 3600)),
+    z_step=float(_cache_cfg.get("z_step", 1.0)),
+) if _cache_cfg.get("enabled", True) else None
+
+
+# Nearest-neighbour reuse of past analyses from analysis_history.jsonl (see analysis_index.py).
+# Off unless analysis_reuse.enabled is set: a reused diagnosis belongs to a different, if similar, fault.
+_reuse_cfg: Dict[str, Any] = config.get("analysis_reuse", {})
+analysis_index: Optional[AnalysisIndex] = None
+if _reuse_cfg.get("enabled", False):
+    analysis_index = AnalysisIndex(
+        FEATURE_COLUMNS,
+        max_distance=float(_reuse_cfg.get("max_distance", 1.0)),
+        max_age_seconds=float(_reuse_cfg.get("max_age_seconds", _cache_cfg.get("ttl_seconds", 24 * 3600))),
+    )
+    print(f"📚 Indexed {analysis_index.load_jsonl(_history_file)} past analyses for reuse")
+
+
+def _live_dispatch() -> str:
+    """How a live analysis job asks the providers: "routed", "first_n" or "all"."""
+    if config.get("llm_routing", {}).get("enabled", True):
+        return "routed"
+    return "first_n" if config.get("llm_first_n") else "all"
+
+
+def _analysis_config(dispatch: str) -> tuple:
+    """Everything besides the feature comparison that shapes a stored analysis.
+    New settings that change the answer belong here so cached entries never collide."""
+    budget = multi_llm_client.prompt_budget
+    return (
+        f"{ANALYSIS_SYSTEM_MESSAGE}\n{PROMPT_SELECT}",
+        [[name, config["models"].get(name, {}).get("model_name")] for name in multi_llm_client.enabled_models],
+        dispatch,
+        config.get("llm_first_n") if dispatch == "first_n" else None,
+        [budget.max_input_tokens, budget.min_features],
+    )
+
+
+def _cache_key(comparison: str, dispatch: str = "all") -> Optional[str]:
+    """Cache key for a feature comparison under the current analysis config and dispatch mode."""
+    if llm_cache is None:
+        return None
+    return llm_cache.key(comparison, _analysis_config(dispatch))
+
+
+def _store_analysis(cache_key: Optional[str], comparison: str, formatted: Dict[str, Any]) -> None:
+    # only answers with at least one successful provider are worth reusing
+    if llm_cache is None or not cache_key:
+        return
+    if any(r.get("status") == "success" for r in formatted.get("llm_analyses", {}).values()):
+        llm_cache.put(cache_key, formatted, llm_cache.signature(comparison))
+
+
+def _cached_analysis(entry: Dict[str, Any], comparison: str) -> Dict[str, Any]:
+    return {**entry["value"], "feature_analysis": comparison, "cached": True, "cached_at": entry["stored"]}
+
 
 
 sse_logger = logging.getLogger("diag.sse")
@@ -373,9 +483,164 @@ class IngestRequest(BaseModel):
     data_point: Dict[str, float]  # keys must include FEATURE_COLUMNS subset; may include time/step
     id: Optional[str] = None
 
+def _adapt_model(rows, flags) -> None:
+    """Feed normal aggregated rows to the recursive PCA and swap in a refreshed model if one is ready.
+    Runs on the event loop between scoring calls, so the swap is atomic for /ingest."""
+    global pca_model
+    if adaptive_pca is None:
+        return
+    adaptive_pca.update_batch(rows[~flags])
+    refreshed = adaptive_pca.take()
+    if refreshed is not None:
+        pca_model = refreshed
+        logger.info("recursive pca refresh #%d t2_threshold=%.4f spe_threshold=%.4f",
+                    adaptive_pca.refreshes, pca_model.t2_threshold, pca_model.spe_threshold)
+
+async def _run_llm_analysis(user_prompt: str, comparison: str, now: float, report, cache_key: Optional[str] = None) -> Dict[str, Any]:
+    """Background job body: query the models, record the result and append it to the history files.
+    With llm_routing enabled (default) only the fastest healthy provider is asked, hedged by the
+    next one; otherwise all models are. Each provider's answer is reported on the job as soon as it arrives."""
+    global _last_analysis_result
+    partial: Dict[str, Any] = {}
+
+    def on_result(model_name: str, result: Dict[str, Any]) -> None:
+        partial[model_name] = result
+        report(partial=dict(partial))
+
+    if _live_dispatch() == "routed":
+        llm_results = await multi_llm_client.route_analysis(
+            system_message=ANALYSIS_SYSTEM_MESSAGE,
+            user_prompt=user_prompt,
+            on_result=on_result,
+        )
+    else:
+        llm_results = await multi_llm_client.get_analysis_from_all_models(
+            system_message=ANALYSIS_SYSTEM_MESSAGE,
+            user_prompt=user_prompt,
+            first_n=config.get("llm_first_n"),
+            on_result=on_result,
+        )
+    formatted = multi_llm_client.format_comparative_results(results=llm_results, feature_comparison=comparison)
+    _last_analysis_result = formatted
+    _store_analysis(cache_key, comparison, formatted)
+    try:
+        # build a snapshot with an id for persistence
+        import time as _time
+        snap = {"id": int(_time.time()*1000), "time": now, **formatted}
+        _analysis_history.append(snap)
+        if analysis_index is not None:
+            analysis_index.add(snap)
+        # persist to JSONL
+        try:
+            with open(_history_file, 'a') as f:
+                import json as _json
+                f.write(_json.dumps(snap) + "\n")
+            # also write Markdown lines (append to cumulative + daily file)
+            try:
+                import time as _time
+                ts = snap.get("timestamp") or _time.strftime("%Y-%m-%d %H:%M:%S")
+                md = f"\n## {ts} (id: {snap.get('id')})\n\n" + (snap.get("feature_analysis") or "") + "\n"
+                with open(_history_md_file, 'a') as mf:
+                    mf.write(md)
+                day_name = _time.strftime("%Y-%m-%d")
+                day_path = os.path.join(_history_days_dir, f"{day_name}.md")
+                with open(day_path, 'a') as df:
+                    df.write(md)
+            except Exception as _em:
+                logger.warning("failed to append md history: %s", _em)
+        except Exception as _e:
+            logger.warning("failed to append history file: %s", _e)
+    except Exception as _:
+        _analysis_history.append({"time": now, "summary": formatted.get("summary",""), "results": formatted.get("results",{})})
+    return {"summary": formatted.get("summary", ""), "analysis_id": _analysis_history[-1].get("id")}
+
+
+async def _maybe_trigger_llm(is_anom: bool) -> Dict[str, Any]:
+    """LLM trigger gating shared by /ingest and /ingest/batch; returns the result["llm"] entry."""
+    global _consecutive_anomalies, _last_analysis_result, _last_llm_trigger_time, _last_llm_top_features
+    # LLM trigger gating: need enough anomalies, enough context, and respect min interval
+    import time as _time
+    import pandas as _pd3
+    can_rate_limit = (_time.time() - _last_llm_trigger_time) >= llm_min_interval_seconds
+    enough_context = len(live_buffer) >= max(5, int(LIVE_WINDOW_SIZE/2))  # relax for quicker triggers
+    if is_anom and _consecutive_anomalies >= min(1, consecutive_anomalies_required) and enough_context and can_rate_limit:
+        buf_df = _pd3.DataFrame(list(live_buffer))
+        deltas = (buf_df.iloc[-1][FEATURE_COLUMNS] - buf_df[FEATURE_COLUMNS].mean()).abs().sort_values(ascending=False)
+        topk = int(config.get("topkfeatures", 6))
+        top_features = list(deltas.index[:topk])
+
+        # Feature-shift retrigger criteria: compare with last trigger's top features
+        def jaccard(a: list[str], b: list[str]) -> float:
+            sa, sb = set(a), set(b)
+            return len(sa & sb) / max(1, len(sa | sb))
+
+        now = _time.time()
+        elapsed = now - _last_llm_trigger_time
+        allow_feature_shift = (
+            elapsed >= feature_shift_min_interval_seconds and
+            (not _last_llm_top_features or jaccard(top_features, _last_llm_top_features) < feature_shift_jaccard_threshold)
+        )
+
+        if not can_rate_limit and not allow_feature_shift:
+            llm = {"status": "not_triggered"}
+        else:
+            feature_series = {feat: buf_df[feat].tail(LIVE_WINDOW_SIZE).tolist() for feat in top_features}
+            comparison = build_live_feature_comparison(feature_series)
+            user_prompt = f"Here are the top six features with values during the fault and normal operation:\n{comparison}"
+
+            cache_key = _cache_key(comparison, _live_dispatch())
+            cached = llm_cache.get(cache_key) if llm_cache is not None else None
+            if cached is not None:
+                # same fault signature as a stored analysis: answer from the cache
+                _last_analysis_result = _cached_analysis(cached, comparison)
+                _analysis_history.append({"id": int(now * 1000), "time": now, **_last_analysis_result})
+                llm = {"status": "triggered", "cached": True, "top_features": top_features}
+            elif analysis_index is not None and (match := analysis_index.nearest(comparison)) is not None:
+                # close to a past fault: show its diagnosis now, optionally refresh it in the background
+                distance, record = match
+                _last_analysis_result = {**record, "feature_analysis": comparison, "reused": True,
+                                         "reused_from": record.get("id"), "reuse_distance": round(distance, 3)}
+                _analysis_history.append({**_last_analysis_result, "id": int(now * 1000), "time": now})
+                llm = {"status": "triggered", "reused": True, "reused_from": record.get("id"),
+                       "reuse_distance": round(distance, 3), "top_features": top_features}
+                if _reuse_cfg.get("refresh", False):
+                    job = llm_jobs.submit(
+                        lambda report: _run_llm_analysis(user_prompt, comparison, now, report, cache_key),
+                        kind="refresh_analysis",
+                        top_features=top_features,
+                    )
+                    if job is not None:
+                        llm["job_id"] = job["id"]
+            else:
+                job = llm_jobs.submit(
+                    lambda report: _run_llm_analysis(user_prompt, comparison, now, report, cache_key),
+                    kind="live_analysis",
+                    top_features=top_features,
+                )
+                if job is None:
+                    # queue full: leave the trigger state alone so a later point retries
+                    return {"status": "busy", "pending": llm_jobs.pending()}
+                llm = {"status": "triggered", "job_id": job["id"], "job_status": job["status"], "top_features": top_features}
+            _consecutive_anomalies = 0
+            _last_llm_trigger_time = now
+            _last_llm_top_features = top_features
+    else:
+        llm = {"status": "not_triggered"}
+    return llm
+
+
+def _residual_stats(spe: float, phi: float) -> Dict[str, float]:
+    """SPE/Q and combined-index fields carried next to t2_stat in /ingest results and SSE rows."""
+    return {
+        "spe": spe,
+        "spe_threshold": float(pca_model.spe_threshold),
+        "phi": phi,
+        "phi_threshold": float(pca_model.phi_threshold),
+    }
+
 @app.post("/ingest")
 async def ingest_live_point(req: IngestRequest):
-    global _consecutive_anomalies, _last_analysis_result, _recent_raw_rows, _aggregated_count, _last_llm_trigger_time, _last_llm_top_features
+    global _consecutive_anomalies, _recent_raw_rows, _aggregated_count
     try:
         # Keep only required feature columns for PCA
         raw_row = {k: float(v) for k, v in req.data_point.items() if k in FEATURE_COLUMNS}
@@ -400,13 +665,15 @@ async def ingest_live_point(req: IngestRequest):
 
         df = _pd3.DataFrame([row])
         t2, is_anom = pca_model.process_data_point(df)
+        spe, phi = float(df.at[0, "spe"]), float(df.at[0, "phi"])
 
         # Maintain live buffer for context (store t2/anomaly too for streaming)
         row_with_stats = {**row,
                            "t2_stat": float(t2),
                            "anomaly": bool(is_anom),
                            "time": _aggregated_count,
-                           "threshold": float(pca_model.t2_threshold)}
+                           "threshold": float(pca_model.t2_threshold),
+                           **_residual_stats(spe, phi)}
         live_buffer.append(row_with_stats)
 
         # Count consecutive anomalies
@@ -421,99 +688,159 @@ async def ingest_live_point(req: IngestRequest):
             "threshold": pca_model.t2_threshold,
             "consecutive_anomalies": _consecutive_anomalies,
             "aggregated_index": _aggregated_count,
+            **_residual_stats(spe, phi),
         }
-        ingest_logger.info("aggregated idx=%d t2=%.4f anomaly=%s", _aggregated_count, t2, bool(is_anom))
+        ingest_logger.info("aggregated idx=%d t2=%.4f spe=%.4f phi=%.4f anomaly=%s", _aggregated_count, t2, spe, phi, bool(is_anom))
+        _adapt_model(mean_vec[None, :], _np.array([bool(is_anom)]))
 
-        # LLM trigger gating: need enough anomalies, enough context, and respect min interval
-        import time as _time
-        can_rate_limit = (_time.time() - _last_llm_trigger_time) >= llm_min_interval_seconds
-        enough_context = len(live_buffer) >= max(5, int(LIVE_WINDOW_SIZE/2))  # relax for quicker triggers
-        if is_anom and _consecutive_anomalies >= min(1, consecutive_anomalies_required) and enough_context and can_rate_limit:
-            buf_df = _pd3.DataFrame(list(live_buffer))
-            deltas = (buf_df.iloc[-1][FEATURE_COLUMNS] - buf_df[FEATURE_COLUMNS].mean()).abs().sort_values(ascending=False)
-            topk = int(config.get("topkfeatures", 6))
-            top_features = list(deltas.index[:topk])
-
-            # Feature-shift retrigger criteria: compare with last trigger's top features
-            def jaccard(a: list[str], b: list[str]) -> float:
-                sa, sb = set(a), set(b)
-                return len(sa & sb) / max(1, len(sa | sb))
-
-            now = _time.time()
-            elapsed = now - _last_llm_trigger_time
-            allow_feature_shift = (
-                elapsed >= feature_shift_min_interval_seconds and
-                (not _last_llm_top_features or jaccard(top_features, _last_llm_top_features) < feature_shift_jaccard_threshold)
-            )
-
-            if not can_rate_limit and not allow_feature_shift:
-                result["llm"] = {"status": "not_triggered"}
-            else:
-                feature_series = {feat: buf_df[feat].tail(LIVE_WINDOW_SIZE).tolist() for feat in top_features}
-                comparison = build_live_feature_comparison(feature_series)
-                user_prompt = f"{PROMPT_SELECT}\n\nHere are the top six features with values during the fault and normal operation:\n{comparison}"
-
-                llm_results = await multi_llm_client.get_analysis_from_all_models(
-                    system_message=SYSTEM_MESSAGE,
-                    user_prompt=user_prompt,
-                )
-                formatted = multi_llm_client.format_comparative_results(results=llm_results, feature_comparison=comparison)
-                _last_analysis_result = formatted
-                try:
-                    # build a snapshot with an id for persistence
-                    import time as _time
-                    snap = {"id": int(_time.time()*1000), "time": now, **formatted}
-                    _analysis_history.append(snap)
-                    # persist to JSONL
-                    try:
-                        with open(_history_file, 'a') as f:
-                            import json as _json
-                            f.write(_json.dumps(snap) + "\n")
-                        # also write Markdown lines (append to cumulative + daily file)
-                        try:
-                            import time as _time
-                            ts = snap.get("timestamp") or _time.strftime("%Y-%m-%d %H:%M:%S")
-                            md = f"\n## {ts} (id: {snap.get('id')})\n\n" + (snap.get("feature_analysis") or "") + "\n"
-                            with open(_history_md_file, 'a') as mf:
-                                mf.write(md)
-                            day_name = _time.strftime("%Y-%m-%d")
-                            day_path = os.path.join(_history_days_dir, f"{day_name}.md")
-                            with open(day_path, 'a') as df:
-                                df.write(md)
-                        except Exception as _em:
-                            logger.warning("failed to append md history: %s", _em)
-                    except Exception as _e:
-                        logger.warning("failed to append history file: %s", _e)
-                except Exception as _:
-                    _analysis_history.append({"time": now, "summary": formatted.get("summary",""), "results": formatted.get("results",{})})
-                result["llm"] = {"status": "triggered", "top_features": top_features}
-                _consecutive_anomalies = 0
-                _last_llm_trigger_time = now
-                _last_llm_top_features = top_features
-        else:
-            result["llm"] = {"status": "not_triggered"}
+        result["llm"] = await _maybe_trigger_llm(bool(is_anom))
 
         return result
     except Exception as e:
         logger.exception("ingest error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+class IngestBatchRequest(BaseModel):
+    # Either a list of points (as in /ingest) or a columnar payload {feature: [values...]}
+    data_points: Optional[List[Dict[str, float]]] = None
+    columns: Optional[Dict[str, List[float]]] = None
+    id: Optional[str] = None
+
+
+def _anomaly_runs(flags, start: int):
+    """Consecutive-anomaly counter after each flag, continuing from `start`."""
+    import numpy as _np
+    idx = _np.arange(1, len(flags) + 1)
+    last_normal = _np.maximum.accumulate(_np.where(flags, 0, idx))
+    runs = idx - last_normal
+    return _np.where(last_normal == 0, runs + start, runs)
+
+
+@app.post("/ingest/batch")
+async def ingest_live_batch(req: IngestBatchRequest):
+    """Bulk version of /ingest for backfills and accelerated simulations.
+    Decimation, T² scoring and anomaly-run accounting run over the whole batch
+    with NumPy; the LLM trigger is evaluated once, for the last aggregated point.
+    Returns one result per input point, in order, shaped like the /ingest response;
+    the trigger result sits on the point that completed the last window and, as
+    "llm", at the top level (points after it may still be aggregating).
+    """
+    global _consecutive_anomalies, _recent_raw_rows, _aggregated_count
+    try:
+        import numpy as _np
+        import pandas as _pd3
+
+        # Build the (n, features) matrix; points missing features are ignored
+        results: List[Dict[str, Any]] = []
+        if req.columns is not None:
+            present = [c for c in FEATURE_COLUMNS if c in req.columns]
+            n = len(next(iter(req.columns.values()), []))
+            if len(present) != len(FEATURE_COLUMNS):
+                ingest_logger.info("batch ignored missing_features present=%s", present)
+                return {"status": "ignored", "reason": "missing_features", "present": present, "results": []}
+            X = _np.column_stack([_np.asarray(req.columns[c], dtype=float) for c in FEATURE_COLUMNS]) if n else _np.empty((0, len(FEATURE_COLUMNS)))
+            valid = list(range(len(X)))
+            results = [None] * len(X)
+        else:
+            points = req.data_points or []
+            rows, valid = [], []
+            results = [None] * len(points)
+            for i, p in enumerate(points):
+                if all(c in p for c in FEATURE_COLUMNS):
+                    rows.append([p[c] for c in FEATURE_COLUMNS])
+                    valid.append(i)
+                else:
+                    results[i] = {"status": "ignored", "reason": "missing_features", "present": [k for k in p if k in FEATURE_COLUMNS]}
+            X = _np.asarray(rows, dtype=float).reshape(-1, len(FEATURE_COLUMNS))
+
+        # Decimation: pending raw rows + batch, mean over every full window of N rows
+        N = max(1, decimation_N)
+        pending = _np.array([[r[c] for c in FEATURE_COLUMNS] for r in _recent_raw_rows]).reshape(-1, len(FEATURE_COLUMNS))
+        allrows = _np.vstack([pending, X])
+        n_windows = len(allrows) // N
+        agg = allrows[:n_windows * N].reshape(n_windows, N, -1).mean(axis=1)
+        leftover = allrows[n_windows * N:]
+        _recent_raw_rows = deque(({c: float(v) for c, v in zip(FEATURE_COLUMNS, r)} for r in leftover), maxlen=decimation_N)
+
+        # Score all aggregated rows at once
+        t2 = _np.empty(0)
+        anomalies = _np.empty(0, dtype=bool)
+        if n_windows:
+            t2, anomalies, spe, phi = pca_model.process_batch(_pd3.DataFrame(agg, columns=FEATURE_COLUMNS), with_stats=True)
+            runs = _anomaly_runs(anomalies, _consecutive_anomalies)
+            _consecutive_anomalies = int(runs[-1])
+            first_index = _aggregated_count + 1
+            _aggregated_count += n_windows
+            threshold = float(pca_model.t2_threshold)
+            for k in range(max(0, n_windows - LIVE_WINDOW_SIZE), n_windows):
+                live_buffer.append({**{c: float(v) for c, v in zip(FEATURE_COLUMNS, agg[k])},
+                                    "t2_stat": float(t2[k]),
+                                    "anomaly": bool(anomalies[k]),
+                                    "time": first_index + k,
+                                    "threshold": threshold,
+                                    **_residual_stats(float(spe[k]), float(phi[k]))})
+
+        # Per-point results: window-completing points carry the aggregated score
+        have = len(pending)
+        window = 0
+        last_scored = None
+        for i in valid:
+            have += 1
+            if have < N:
+                results[i] = {"status": "ok", "aggregating": True, "have": have, "need": decimation_N}
+                continue
+            results[i] = {
+                "t2_stat": float(t2[window]),
+                "anomaly": bool(anomalies[window]),
+                "threshold": pca_model.t2_threshold,
+                "consecutive_anomalies": int(runs[window]),
+                "aggregated_index": first_index + window,
+                **_residual_stats(float(spe[window]), float(phi[window])),
+            }
+            have = 0
+            window += 1
+            last_scored = i
+
+        ingest_logger.info("batch points=%d aggregated=%d anomalies=%d", len(valid), n_windows, int(anomalies.sum()))
+
+        if n_windows:
+            _adapt_model(agg, anomalies)
+
+        # LLM trigger gating on the most recent aggregated point only
+        response = {"status": "ok", "points": len(results), "aggregated": int(n_windows), "results": results}
+        if n_windows:
+            llm = await _maybe_trigger_llm(bool(anomalies[-1]))
+            results[last_scored]["llm"] = llm
+            response["llm"] = llm
+
+        return response
+    except Exception as e:
+        logger.exception("ingest batch error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.get("/stream")
 async def stream_live_points():
     """Server-Sent Events stream of the latest aggregated live point.
     Previous implementation yielded only when len(live_buffer) grew, which stalls
     once the deque reaches its maxlen. Here we track the 'time' field of the last
     row (which equals aggregated_count) and emit whenever it changes.
+    LLM job status changes are sent as `event: llm_job` messages.
     """
     async def event_generator():
         import asyncio as _asyncio
         last_time_seen = None
+        last_job_seq = llm_jobs.last_seq()
         sse_logger.info("client connected")
         try:
             while True:
                 try:
+                    # LLM job status changes go out as named events so plain onmessage clients ignore them
+                    for event in llm_jobs.events_since(last_job_seq):
+                        last_job_seq = event["seq"]
+                        event = {k: v for k, v in event.items() if k != "result"}
+                        yield f"event: llm_job\ndata: {json.dumps(event)}\n\n"
                     if live_buffer:
-                        row = live_buffer[-1]  # has t2_stat, anomaly, threshold, time
+                        row = live_buffer[-1]  # has t2_stat, spe, phi, anomaly, thresholds, time
                         current_time_val = row.get("time")
                         if current_time_val != last_time_seen:
                             payload = json.dumps(row)
@@ -608,6 +935,12 @@ def metrics():
         "consecutive_anomalies_required": consecutive_anomalies_required,
         "llm_min_interval_seconds": llm_min_interval_seconds,
         "baseline_features": (int(len(_normal_stats)) if _normal_stats is not None else 0),
+        "llm_providers": multi_llm_client.provider_stats(),
+        "llm_jobs": llm_jobs.stats(),
+        "llm_cache": llm_cache.stats() if llm_cache is not None else None,
+        "analysis_reuse": analysis_index.stats() if analysis_index is not None else None,
+        "llm_prompts": multi_llm_client.prompt_stats(),
+        "llm_routing": multi_llm_client.router.stats(),
     }
 
 @app.get("/preview/top6")
@@ -638,8 +971,31 @@ async def update_alpha(payload: Dict[str, Any] = Body(...)):
         if not (0 < new_alpha < 1):
             raise ValueError("alpha must be between 0 and 1")
         pca_model.alpha = new_alpha
-        pca_model.set_t2_threshold()
-        return {"status": "ok", "alpha": new_alpha, "t2_threshold": pca_model.t2_threshold}
+        pca_model.set_thresholds()
+        return {"status": "ok", "alpha": new_alpha, "t2_threshold": pca_model.t2_threshold,
+                "spe_threshold": pca_model.spe_threshold, "phi_threshold": pca_model.phi_threshold}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/model/adaptive")
+async def get_adaptive_pca():
+    if adaptive_pca is None:
+        return {"enabled": False}
+    return {"enabled": True, **adaptive_pca.stats()}
+
+@app.post("/model/adaptive")
+async def update_adaptive_pca(payload: Dict[str, Any] = Body(...)):
+    """Enable/disable recursive PCA or change its forgetting factor / refresh interval.
+    Enabling (or changing parameters) restarts the tracker from the current live model."""
+    global adaptive_pca
+    try:
+        cfg = {**_adaptive_cfg, **(adaptive_pca.stats() if adaptive_pca else {}), **payload}
+        if not (0 < float(cfg.get("forgetting", 0.999)) < 1):
+            raise ValueError("forgetting must be between 0 and 1")
+        if adaptive_pca is not None:
+            adaptive_pca.close()
+        adaptive_pca = _make_adaptive_pca(cfg) if payload.get("enabled", True) else None
+        return await get_adaptive_pca()
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -652,7 +1008,11 @@ def status():
         "simulation_running": _simulation_running,
         "llm_enabled": True,
         "aggregated_count": _aggregated_count,
-        "live_buffer_size": len(live_buffer)
+        "live_buffer_size": len(live_buffer),
+        "t2_threshold": float(pca_model.t2_threshold),
+        "spe_threshold": float(pca_model.spe_threshold),
+        "phi_threshold": float(pca_model.phi_threshold),
+        "anomaly_statistic": pca_model.monitor,
     }
 
 # Global simulation control variables
@@ -707,6 +1067,7 @@ async def stop_all_tasks():
 
         # Stop all LLM tasks
         result = multi_llm_client.stop_all_tasks()
+        result["jobs_cancelled"] = llm_jobs.cancel_all()
 
         # Reset stop flag after a moment to allow new requests
         import asyncio
@@ -726,6 +1087,29 @@ async def stop_all_tasks():
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/analysis/jobs")
+async def list_analysis_jobs(limit: int = 20):
+    return {"jobs": llm_jobs.list(limit), "stats": llm_jobs.stats()}
+
+@app.get("/analysis/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    job = llm_jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return job
+
+@app.get("/analysis/cache")
+async def analysis_cache_stats():
+    if llm_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **llm_cache.stats()}
+
+@app.post("/analysis/cache/clear")
+async def clear_analysis_cache():
+    if llm_cache is not None:
+        llm_cache.clear()
+    return await analysis_cache_stats()
+
 @app.get("/analysis/history")
 def analysis_history(limit: int = 10):
     """Return last N items (from disk if available, else memory)."""
@@ -776,14 +1160,6 @@ def analysis_item(item_id: int):
         return {"status":"error","error":str(e)}
     return {"status":"not_found"}
 
-    return {
-        "running": True,
-        "aggregated_count": _aggregated_count,
-        "live_buffer": len(live_buffer),
-        "t2_threshold": float(pca_model.t2_threshold),
-        "models": multi_llm_client.enabled_models,
-    }
-
 @app.get("/last_analysis")
 def last_analysis():
     if _last_analysis_result is None:
@@ -800,14 +1176,20 @@ def last_analysis():
 def read_root():
     return {"message": "FaultExplainer Multi-LLM API", "status": "running"}
 
+_health_http = httpx.AsyncClient(timeout=5.0, limits=httpx.Limits(max_connections=2, max_keepalive_connections=2))
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await _health_http.aclose()
+    await multi_llm_client.aclose()
+
 @app.get("/health/lmstudio")
 async def check_lmstudio_health():
     """Check LMStudio health status"""
     try:
-        import requests
-
-        # Quick connection test
-        response = requests.get("http://localhost:1234/v1/models", timeout=5)
+        # Quick connection test, on the event loop over a pooled connection
+        base_url = config.get("lmstudio", {}).get("base_url", "http://localhost:1234/v1").rstrip("/")
+        response = await _health_http.get(f"{base_url}/models")
         if response.status_code == 200:
             models = response.json().get("data", [])
             return {
@@ -843,13 +1225,19 @@ async def explain(request: ExplainationRequest):
 
         # Generate feature comparison
         comparison_result = generate_feature_comparison(request.data, request.file)
-        user_prompt = f"{PROMPT_SELECT}\n{comparison_result}"
+        user_prompt = comparison_result
 
         logger.info("feature comparison prepared")
 
+        cache_key = _cache_key(comparison_result, "all")
+        cached = llm_cache.get(cache_key) if llm_cache is not None else None
+        if cached is not None:
+            logger.info("explain cache hit id=%s key=%s", request.id, cache_key)
+            return JSONResponse(content=_cached_analysis(cached, comparison_result))
+
         # Get analysis from all enabled models
         llm_results = await multi_llm_client.get_analysis_from_all_models(
-            system_message=SYSTEM_MESSAGE,
+            system_message=ANALYSIS_SYSTEM_MESSAGE,
             user_prompt=user_prompt
         )
 
@@ -858,6 +1246,7 @@ async def explain(request: ExplainationRequest):
             results=llm_results,
             feature_comparison=comparison_result
         )
+        _store_analysis(cache_key, comparison_result, formatted_results)
 
         logger.info("multi-llm analysis completed id=%s", request.id)
 
@@ -869,6 +1258,62 @@ async def explain(request: ExplainationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/explain/stream", response_model=None)
+async def explain_stream(request: ExplainationRequest):
+    """Streaming variant of /explain over Server-Sent Events.
+
+    Sends `event: start` with the feature comparison and the model lineup, then
+    `event: token` {model, index, content} as each provider's text arrives and
+    `event: result` {model, response, response_time, status} when a provider is
+    done. The last message is `event: analysis` with the same payload /explain returns.
+    """
+    try:
+        comparison_result = generate_feature_comparison(request.data, request.file)
+    except Exception as e:
+        logger.exception("explain stream error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    user_prompt = comparison_result
+    cache_key = _cache_key(comparison_result, "all")
+
+    def sse(event: str, data: Dict[str, Any]) -> str:
+        return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+    async def event_generator():
+        logger.info("explain stream start id=%s file=%s models=%s", request.id, request.file, multi_llm_client.enabled_models)
+        yield sse("start", {"id": request.id, "models": multi_llm_client.enabled_models,
+                            "feature_analysis": comparison_result})
+        cached = llm_cache.get(cache_key) if llm_cache is not None else None
+        if cached is not None:
+            logger.info("explain stream cache hit id=%s key=%s", request.id, cache_key)
+            yield sse("analysis", _cached_analysis(cached, comparison_result))
+            return
+
+        results: Dict[str, Dict[str, Any]] = {}
+        try:
+            async for event in multi_llm_client.stream_analysis_from_all_models(ANALYSIS_SYSTEM_MESSAGE, user_prompt):
+                kind = event.pop("event")
+                if kind == "result":
+                    results[event["model"]] = {k: v for k, v in event.items() if k != "model"}
+                yield sse(kind, event)
+        except Exception as e:
+            logger.exception("explain stream error: %s", e)
+            yield sse("error", {"id": request.id, "error": str(e)})
+            return
+
+        formatted = multi_llm_client.format_comparative_results(
+            results={name: results[name] for name in multi_llm_client.enabled_models if name in results} or results,
+            feature_comparison=comparison_result
+        )
+        _store_analysis(cache_key, comparison_result, formatted)
+        logger.info("multi-llm stream completed id=%s", request.id)
+        yield sse("analysis", formatted)
+
+    resp = StreamingResponse(event_generator(), media_type="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"
+    return resp
+
+
 @app.post("/send_message", response_model=MessageResponse)
 async def send_message(request: MessageRequest):
     try:
@@ -0,0 +1,123 @@
+"""
+Fault-signature cache for multi-LLM analyses
+Repeated triggers of the same fault reuse the stored answer instead of re-querying every provider
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# "3. Reactor Pressure: Fault=2801.2 | Normal=2705.0 | Δ=96.2 (3.56%) | z=4.12"
+_FEATURE_LINE = re.compile(r"^\s*\d+\.\s*(?P<feature>[^:]+):.*\|\s*z=(?P<z>-?\d+(?:\.\d+)?)")
+
+
+def parse_feature_lines(comparison: str) -> List[Tuple[str, float]]:
+    """(feature, z) for every line of a feature comparison block that carries a z-score"""
+    out = []
+    for line in comparison.splitlines():
+        match = _FEATURE_LINE.match(line)
+        if match:
+            out.append((match.group("feature").strip(), float(match.group("z"))))
+    return out
+
+
+class AnalysisCache:
+    """LRU + TTL cache of formatted analyses keyed by a normalized fault signature.
+
+    The signature is the set of top-k features in a feature comparison block, each with
+    its direction and |z| quantized to `z_step` (capped at `z_cap`), so small changes
+    in the values or in the ranking still map to the same key. The analysis config
+    (prompt template, model lineup, dispatch mode, ...) is hashed into the key too. Entries are persisted as JSON.
+    """
+
+    def __init__(self, path: str, max_entries: int = 256, ttl_seconds: float = 86400,
+                 z_step: float = 1.0, z_cap: float = 10.0):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.z_step = z_step
+        self.z_cap = z_cap
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.load()
+
+    def signature(self, comparison: str) -> Optional[List[List[Any]]]:
+        """[feature, direction, |z| bucket] per feature line, sorted by feature; None without z-scores"""
+        sig = []
+        for feature, z in parse_feature_lines(comparison):
+            bucket = int(min(abs(z), self.z_cap) // self.z_step)
+            sig.append([feature, 1 if z > 0 else -1 if z < 0 else 0, bucket])
+        return sorted(sig) or None
+
+    def key(self, comparison: str, analysis_config: Any) -> Optional[str]:
+        """Key for a comparison under an analysis config (any JSON-serializable value:
+        prompt, model lineup, dispatch mode, budgets, ...)"""
+        sig = self.signature(comparison)
+        if sig is None:
+            return None
+        payload = json.dumps({"signature": sig, "config": analysis_config}, sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        entry = self.entries.get(key) if key else None
+        if entry is not None and time.time() - entry["stored"] > self.ttl_seconds:
+            del self.entries[key]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        entry["hits"] += 1
+        self.hits += 1
+        return entry
+
+    def put(self, key: Optional[str], value: Dict[str, Any], signature: Optional[List[List[Any]]] = None):
+        if not key:
+            return
+        self.entries[key] = {"stored": time.time(), "hits": 0, "signature": signature, "value": value}
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self.save()
+
+    def clear(self):
+        self.entries.clear()
+        self.save()
+
+    def load(self):
+        try:
+            with open(self.path) as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in stored.get("entries", []):
+            if now - entry.get("stored", 0) <= self.ttl_seconds:
+                self.entries[key] = entry
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump({"entries": list(self.entries.items())}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save LLM cache: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
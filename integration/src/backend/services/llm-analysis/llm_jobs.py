@@ -0,0 +1,139 @@
+"""
+Background job queue for LLM analyses
+Keeps slow model calls off the /ingest request path
+"""
+
+import asyncio
+import itertools
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class LLMJobQueue:
+    """Bounded asyncio queue of LLM analysis jobs with ids, status and completion events.
+
+    submit() returns immediately with a job record; `workers` tasks run the jobs on the
+    event loop. A job is `run(report)`, where report(**fields) publishes progress
+    (e.g. partial results) on the job record. Every status change or report is appended
+    to `events` with an increasing `seq`, which SSE streams poll with events_since().
+    """
+
+    def __init__(self, max_pending: int = 4, workers: int = 1, keep: int = 100):
+        self.max_pending = max_pending
+        self.workers = workers
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()  # newest last, trimmed to `keep`
+        self.keep = keep
+        self.events: deque = deque(maxlen=keep)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancelled: set = set()  # running jobs stopped by cancel_all()
+        self._ids = itertools.count(1)
+        self._seq = itertools.count(1)
+
+    def _ensure_workers(self):
+        # started lazily so the queue binds to the server's running loop
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        self._tasks = [t for t in self._tasks if not t.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    def _emit(self, job: Dict[str, Any]):
+        self.events.append({"seq": next(self._seq), **self.public(job)})
+
+    @staticmethod
+    def public(job: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def pending(self) -> int:
+        return sum(1 for j in self.jobs.values() if j["status"] == "queued")
+
+    def submit(self, run: Callable[[Callable[..., None]], Awaitable[Any]], **meta) -> Optional[Dict[str, Any]]:
+        """Queue `run(report)`; returns the job record, or None when max_pending jobs are already waiting."""
+        self._ensure_workers()
+        if self.pending() >= self.max_pending:
+            return None
+        job_id = f"{int(time.time() * 1000)}-{next(self._ids)}"
+        job = {"id": job_id, "status": "queued", "created": time.time(),
+               "started": None, "finished": None, "error": None, **meta, "_run": run}
+        self.jobs[job_id] = job
+        while len(self.jobs) > self.keep:
+            self.jobs.popitem(last=False)
+        self._queue.put_nowait(job_id)
+        self._emit(job)
+        return self.public(job)
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            job = self.jobs.get(job_id)
+            if job is None or job["status"] != "queued":
+                continue
+            job["status"] = "running"
+            job["started"] = time.time()
+            self._emit(job)
+            task = asyncio.ensure_future(job.pop("_run")(lambda **fields: self._report(job, **fields)))
+            self._running[job_id] = task
+            try:
+                job["result"] = await task
+                job["status"] = "done"
+            except asyncio.CancelledError:
+                job["status"] = "cancelled"
+                if job_id not in self._cancelled:
+                    task.cancel()
+                    raise  # the worker itself is being cancelled (e.g. at shutdown)
+            except Exception as e:
+                job["status"] = "error"
+                job["error"] = str(e)
+            finally:
+                self._running.pop(job_id, None)
+                self._cancelled.discard(job_id)
+                job["finished"] = time.time()
+                self._emit(job)
+
+    def _report(self, job: Dict[str, Any], **fields):
+        job.update(fields)
+        self._emit(job)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        job = self.jobs.get(job_id)
+        return self.public(job) if job else None
+
+    def list(self, limit: int = 20) -> List[Dict[str, Any]]:
+        # newest first, without results to keep the listing small
+        out = []
+        for job in reversed(self.jobs.values()):
+            out.append({k: v for k, v in self.public(job).items() if k != "result"})
+            if len(out) >= limit:
+                break
+        return out
+
+    def events_since(self, seq: int) -> List[Dict[str, Any]]:
+        return [e for e in self.events if e["seq"] > seq]
+
+    def last_seq(self) -> int:
+        return self.events[-1]["seq"] if self.events else 0
+
+    def cancel_all(self) -> int:
+        """Cancel queued and running jobs; returns how many were cancelled."""
+        n = 0
+        for job in self.jobs.values():
+            if job["status"] == "queued":
+                job["status"] = "cancelled"
+                job.pop("_run", None)
+                job["finished"] = time.time()
+                self._emit(job)
+                n += 1
+        for job_id, task in list(self._running.items()):
+            self._cancelled.add(job_id)
+            task.cancel()
+            n += 1
+        return n
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {"max_pending": self.max_pending, "workers": self.workers, **counts}
@@ -0,0 +1,104 @@
+"""
+Latency-aware routing across LLM providers
+Tracks per-provider latency and failure rates so the live path can use one fast provider and hedge the rest
+"""
+
+import time
+from collections import deque
+from typing import Any, Dict, List
+
+import numpy as np
+
+
+class ProviderRouter:
+    """EWMA latency, error rate and timeout rate per provider.
+
+    rank() orders providers healthy first, then by EWMA latency; providers that were
+    never measured go first so they get a sample. A provider is unhealthy while its
+    error or timeout rate is above the limit, but is tried again once it has been left
+    alone for `probe_after` seconds. hedge_delay() is the `hedge_percentile` latency of
+    the provider's recent successful calls, i.e. how long to wait before hedging it.
+    """
+
+    def __init__(self, alpha: float = 0.3, max_error_rate: float = 0.5, max_timeout_rate: float = 0.3,
+                 hedge_percentile: float = 90.0, hedge_min_seconds: float = 2.0,
+                 hedge_default_seconds: float = 15.0, min_samples: int = 5,
+                 probe_after: float = 300.0, window: int = 100):
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.max_timeout_rate = max_timeout_rate
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_seconds = hedge_min_seconds
+        self.hedge_default_seconds = hedge_default_seconds
+        self.min_samples = min_samples
+        self.probe_after = probe_after
+        self.window = window
+        self.providers: Dict[str, Dict[str, Any]] = {}
+        self.routed = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+
+    def _state(self, name: str) -> Dict[str, Any]:
+        if name not in self.providers:
+            self.providers[name] = {
+                "calls": 0, "latency": None, "error_rate": 0.0, "timeout_rate": 0.0,
+                "last_call": 0.0, "latencies": deque(maxlen=self.window),
+            }
+        return self.providers[name]
+
+    def record(self, name: str, status: str, latency: float):
+        """Fold one finished call into the provider's averages (cancelled calls are ignored)"""
+        if status in ("cancelled", "skipped"):
+            return
+        state = self._state(name)
+        a = self.alpha
+        state["calls"] += 1
+        state["last_call"] = time.time()
+        state["error_rate"] = (1 - a) * state["error_rate"] + a * (status == "error")
+        state["timeout_rate"] = (1 - a) * state["timeout_rate"] + a * (status == "timeout")
+        if status == "success":
+            state["latencies"].append(latency)
+            state["latency"] = latency if state["latency"] is None else (1 - a) * state["latency"] + a * latency
+
+    def record_slow(self, name: str, elapsed: float):
+        """A call cancelled after losing a hedge: its elapsed time is a lower bound on the
+        latency, folded into the EWMA so a degraded provider stops being ranked first"""
+        state = self._state(name)
+        if state["latency"] is not None and elapsed > state["latency"]:
+            state["latency"] = (1 - self.alpha) * state["latency"] + self.alpha * elapsed
+
+    def healthy(self, name: str) -> bool:
+        state = self._state(name)
+        if time.time() - state["last_call"] > self.probe_after:
+            return True
+        return state["error_rate"] <= self.max_error_rate and state["timeout_rate"] <= self.max_timeout_rate
+
+    def rank(self, names: List[str]) -> List[str]:
+        def key(name: str):
+            latency = self._state(name)["latency"]
+            return (not self.healthy(name), latency is not None, latency or 0.0)
+        return sorted(names, key=key)
+
+    def hedge_delay(self, name: str) -> float:
+        latencies = self._state(name)["latencies"]
+        if len(latencies) < self.min_samples:
+            return self.hedge_default_seconds
+        return max(self.hedge_min_seconds, float(np.percentile(latencies, self.hedge_percentile)))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "routed": self.routed,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "providers": {
+                name: {
+                    "calls": state["calls"],
+                    "ewma_latency_s": round(state["latency"], 3) if state["latency"] is not None else None,
+                    "error_rate": round(state["error_rate"], 3),
+                    "timeout_rate": round(state["timeout_rate"], 3),
+                    "healthy": self.healthy(name),
+                    "hedge_delay_s": round(self.hedge_delay(name), 2),
+                }
+                for name, state in self.providers.items()
+            },
+        }
@@ -3,17 +3,105 @@ import numpy as np
 from sklearn.decomposition import PCA
 from sklearn.preprocessing import StandardScaler
 import uuid
+import hashlib
+import json
+
+MODEL_FORMAT_VERSION = 2
+
+
+def training_key(path, feature_names, **params):
+    """Short hash of a training file plus the feature order and fit parameters.
+
+    Used to name saved model artifacts so that a changed file (or config) forces a refit.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    meta = {"features": list(feature_names), "format": MODEL_FORMAT_VERSION, **params}
+    h.update(json.dumps(meta, sort_keys=True).encode())
+    return h.hexdigest()[:16]
+
+
+class RingBuffer:
+    """Fixed-capacity columnar history of scored points: feature values, t2_stat and anomaly.
+
+    Indices are absolute sample numbers since the last clear(); only the newest
+    `capacity` samples are retained. Negative indices count back from the newest.
+    """
+
+    def __init__(self, feature_names, capacity=10000):
+        self.feature_names = list(feature_names)
+        self.capacity = int(capacity)
+        self.values = np.zeros((self.capacity, len(self.feature_names)))
+        self.t2_stat = np.zeros(self.capacity)
+        self.anomaly = np.zeros(self.capacity, dtype=bool)
+        self.count = 0  # samples appended since clear()
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def start(self):
+        # absolute index of the oldest retained sample
+        return self.count - len(self)
+
+    def clear(self):
+        self.count = 0
+
+    def append(self, x, t2_stat, anomaly):
+        i = self.count % self.capacity
+        self.values[i] = x
+        self.t2_stat[i] = t2_stat
+        self.anomaly[i] = anomaly
+        self.count += 1
+
+    def extend(self, X, t2_stat, anomaly):
+        n = len(X)
+        keep = min(n, self.capacity)
+        idx = (self.count + np.arange(n - keep, n)) % self.capacity
+        self.values[idx] = np.asarray(X)[n - keep:]
+        self.t2_stat[idx] = np.asarray(t2_stat)[n - keep:]
+        self.anomaly[idx] = np.asarray(anomaly)[n - keep:]
+        self.count += n
+
+    def slot(self, index):
+        if index < 0:
+            index += self.count
+        if not self.start <= index < self.count:
+            raise IndexError(f"sample {index} is not in the buffer [{self.start}, {self.count})")
+        return index % self.capacity
+
+    def row(self, index):
+        return self.values[self.slot(index)]
+
+    def window(self, n=None):
+        """(values, t2_stat, anomaly) for the newest n samples, oldest first.
+
+        Views into the buffer unless the window wraps around its end.
+        """
+        n = len(self) if n is None else max(0, min(n, len(self)))
+        first = (self.count - n) % self.capacity
+        if first + n <= self.capacity:
+            sl = slice(first, first + n)
+            return self.values[sl], self.t2_stat[sl], self.anomaly[sl]
+        idx = np.r_[first:self.capacity, 0:first + n - self.capacity]
+        return self.values[idx], self.t2_stat[idx], self.anomaly[idx]
 
 
 class FaultDetectionModel:
-    def __init__(self, n_components=0.9, alpha=0.01):
+    def __init__(self, n_components=0.9, alpha=0.01, buffer_size=10000, monitor="t2"):
         
         self.scaler = StandardScaler()
         self.pca = PCA(n_components=n_components)
-        self.data_buffer = pd.DataFrame()
+        self.buffer_size = buffer_size
+        self.data_buffer = None  # RingBuffer, allocated by fit()
         self.fault_callbacks = []
         self.alpha = alpha
         self.t2_threshold = None
+        self.spe_threshold = None
+        self.phi_threshold = None
+        self.monitor = monitor  # statistic that flags anomalies: t2, spe, phi or t2_or_spe
         self.current_fault_id = None
         self.post_fault_data_count = 0
         self.post_fault_threshold = (
@@ -30,8 +118,74 @@ class FaultDetectionModel:
         self.n = self.pca.n_samples_
         self.P = self.pca.components_.T
         self.lamda = self.pca.explained_variance_
+        # eigenvalues of the discarded (residual) subspace, for the SPE limit
+        self.cov_z = np.cov(Z, rowvar=False)  # correlation of the training data, for RecursivePCA
+        eigvals = np.linalg.eigvalsh(self.cov_z)[::-1]
+        self.lamda_res = np.clip(eigvals[self.a:], 0, None)
+        self.data_buffer = RingBuffer(self.feature_names, self.buffer_size)
         # set thresholds
-        self.set_t2_threshold()
+        self.set_thresholds()
+        self.build_scorer()
+
+    def build_scorer(self):
+        # Fuse scaling, projection and 1/sqrt(lambda) into one (m, a) matrix so that
+        # T^2 = ||x @ W - b||^2 on raw feature values, with b = mean @ W
+        self.W = np.ascontiguousarray(
+            self.P / np.sqrt(self.lamda) / self.scaler.scale_[:, None]
+        )
+        self.b = self.scaler.mean_ @ self.W
+        # Residual projector (I - P P^T) on scaled values, folded the same way:
+        # SPE = ||x @ R - c||^2
+        R = np.eye(self.m) - self.P @ self.P.T
+        self.R = np.ascontiguousarray(R / self.scaler.scale_[:, None])
+        self.c = self.scaler.mean_ @ self.R
+
+    def save(self, path, key=""):
+        """Write the fitted model (scaler, loadings, eigenvalues, thresholds, feature order) to a .npz."""
+        import os
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = path + ".tmp.npz"
+        np.savez(
+            tmp_path,
+            version=MODEL_FORMAT_VERSION,
+            key=key,
+            feature_names=np.array(self.feature_names),
+            mean=self.scaler.mean_,
+            scale=self.scaler.scale_,
+            P=self.P,
+            lamda=self.lamda,
+            lamda_res=self.lamda_res,
+            cov_z=self.cov_z,
+            n=self.n,
+            alpha=self.alpha,
+            thresholds=[self.t2_threshold, self.spe_threshold, self.phi_threshold],
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path, buffer_size=10000, monitor="t2"):
+        """Rebuild a fitted model from save(); no training data or refit needed."""
+        with np.load(path, allow_pickle=False) as f:
+            if int(f["version"]) != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported model format {int(f['version'])} in {path}")
+            model = cls(n_components=f["P"].shape[1], alpha=float(f["alpha"]),
+                        buffer_size=buffer_size, monitor=monitor)
+            model.feature_names = f["feature_names"].tolist()
+            model.scaler.mean_ = f["mean"]
+            model.scaler.scale_ = f["scale"]
+            model.scaler.var_ = f["scale"] ** 2
+            model.scaler.n_features_in_ = len(model.feature_names)
+            model.P = f["P"]
+            model.lamda = f["lamda"]
+            model.lamda_res = f["lamda_res"]
+            model.cov_z = f["cov_z"]
+            model.n = int(f["n"])
+            model.t2_threshold, model.spe_threshold, model.phi_threshold = f["thresholds"].tolist()
+        model.m, model.a = model.P.shape
+        model.data_buffer = RingBuffer(model.feature_names, buffer_size)
+        model.build_scorer()
+        return model
 
     def save_mean_and_std(self, filename):
         # ensure directory exists
@@ -46,7 +200,7 @@ class FaultDetectionModel:
         
 
     def set_t2_threshold(self):
-        assert hasattr(self.pca, "n_samples_"), "Model hasn't been trained"
+        assert hasattr(self, "P"), "Model hasn't been trained"
         from scipy.stats import f
 
         scaling_factor = (self.a * (self.n - 1) * (self.n + 1)) / (
@@ -56,17 +210,77 @@ class FaultDetectionModel:
             1 - self.alpha, self.a, self.n - self.a
         )
 
+    def set_spe_threshold(self):
+        # Jackson-Mudholkar control limit for Q/SPE
+        from scipy.stats import norm
+
+        theta1, theta2, theta3 = (np.sum(self.lamda_res**k) for k in (1, 2, 3))
+        if theta1 <= 0:
+            self.spe_threshold = np.inf  # every component retained, no residual space
+            return
+        h0 = 1 - 2 * theta1 * theta3 / (3 * theta2**2)
+        c_alpha = norm.ppf(1 - self.alpha)
+        self.spe_threshold = theta1 * (
+            c_alpha * np.sqrt(2 * theta2 * h0**2) / theta1
+            + 1
+            + theta2 * h0 * (h0 - 1) / theta1**2
+        ) ** (1 / h0)
+
+    def set_phi_threshold(self):
+        # Combined index phi = T^2 / T2_lim + SPE / SPE_lim, limit g * chi2(h) (Yue & Qin)
+        from scipy.stats import chi2
+
+        theta1, theta2 = np.sum(self.lamda_res), np.sum(self.lamda_res**2)
+        first = self.a / self.t2_threshold + theta1 / self.spe_threshold
+        second = self.a / self.t2_threshold**2 + theta2 / self.spe_threshold**2
+        g = second / first
+        h = first**2 / second
+        self.phi_threshold = g * chi2.ppf(1 - self.alpha, h)
+
+    def set_thresholds(self):
+        self.set_t2_threshold()
+        self.set_spe_threshold()
+        self.set_phi_threshold()
+
     def register_fault_callback(self, callback):
         assert callable(callback)
         self.fault_callbacks.append(callback)
 
+    def score(self, x):
+        """T^2 of raw feature values in feature_names order: a float for one row (m,), an array for a block (n, m)."""
+        t = np.asarray(x, dtype=float) @ self.W
+        t -= self.b
+        t2_stat = np.einsum("...i,...i->...", t, t)
+        return float(t2_stat) if t2_stat.ndim == 0 else t2_stat
+
+    def score_stats(self, x):
+        """(T^2, SPE, phi) of raw feature values; floats for one row (m,), arrays for a block (n, m)."""
+        x = np.asarray(x, dtype=float)
+        t2_stat = self.score(x)
+        r = x @ self.R
+        r -= self.c
+        spe = np.einsum("...i,...i->...", r, r)
+        spe = float(spe) if spe.ndim == 0 else spe
+        phi = t2_stat / self.t2_threshold + spe / self.spe_threshold
+        return t2_stat, spe, phi
+
+    def flag(self, t2_stat, spe, phi):
+        # anomaly decision for the configured monitoring statistic (scalars or arrays)
+        if self.monitor == "t2":
+            return t2_stat > self.t2_threshold
+        if self.monitor == "spe":
+            return spe > self.spe_threshold
+        if self.monitor == "phi":
+            return phi > self.phi_threshold
+        if self.monitor == "t2_or_spe":
+            return (t2_stat > self.t2_threshold) | (spe > self.spe_threshold)
+        raise ValueError(f"Unknown monitor statistic: {self.monitor}")
+
     def calculate_t2_stat(self, data_point):
         # Calculate T^2 statistic
         assert isinstance(data_point, pd.DataFrame)
-        x = data_point[self.feature_names]
-        z = self.scaler.transform(x)
-        t2_stat = z @ self.P @ np.diag(self.lamda**-1) @ self.P.T @ z.T
-        return t2_stat.item()
+        x = data_point[self.feature_names].to_numpy(dtype=float)
+        return float(self.score(x)[0])
 
     def is_anomaly(self, data_point):
         t2_stat = self.calculate_t2_stat(data_point)
@@ -74,9 +288,11 @@ class FaultDetectionModel:
         return anomaly, t2_stat
 
     def process_data_point(self, data_point):
-        anomaly, t2_stat = self.is_anomaly(data_point)
-        data_point[["t2_stat", "anomaly"]] = [t2_stat, anomaly]
-        self.data_buffer = pd.concat([self.data_buffer, data_point], ignore_index=True)
+        x = data_point[self.feature_names].to_numpy(dtype=float)[0]
+        t2_stat, spe, phi = self.score_stats(x)
+        anomaly = self.flag(t2_stat, spe, phi)
+        data_point[["t2_stat", "anomaly", "spe", "phi"]] = [t2_stat, anomaly, spe, phi]
+        self.data_buffer.append(x, t2_stat, anomaly)
 
         # if anomaly:
         #     for callback in self.fault_callbacks:
@@ -103,14 +319,55 @@ class FaultDetectionModel:
 
         return t2_stat, anomaly
 
+    def calculate_t2_batch(self, X):
+        # T^2 statistic for every row of X (n, m) in one pass
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names].to_numpy(dtype=float)
+        return self.score(np.atleast_2d(X))
+
+    def process_batch(self, data, with_stats=False):
+        """Vectorized process_data_point for a DataFrame of rows; returns (t2, anomaly) arrays,
+        or (t2, anomaly, spe, phi) with with_stats=True."""
+        x = data[self.feature_names]
+        X = x.to_numpy(dtype=float)
+        t2_stat, spe, phi = self.score_stats(np.atleast_2d(X))
+        anomaly = self.flag(t2_stat, spe, phi)
+        self.data_buffer.extend(X, t2_stat, anomaly)
+
+        # Same fault bookkeeping as process_data_point, row by row over the flags
+        for i, flag in enumerate(anomaly):
+            if flag:
+                if self.current_fault_id is None:
+                    self.current_fault_id = uuid.uuid4()
+                    self.post_fault_data_count = 0
+                else:
+                    self.post_fault_data_count += 1
+                    if self.post_fault_data_count == self.post_fault_threshold:
+                        for callback in self.fault_callbacks:
+                            callback(
+                                {
+                                    "data": x.iloc[[i]].assign(t2_stat=t2_stat[i], anomaly=True, spe=spe[i], phi=phi[i]),
+                                    "fault_id": self.current_fault_id,
+                                }
+                            )
+            elif self.current_fault_id is not None:
+                self.current_fault_id = None
+                self.post_fault_data_count = 0
+
+        if with_stats:
+            return t2_stat, anomaly, spe, phi
+        return t2_stat, anomaly
+
     def plot(self):
         import plotly.express as px
 
-        fig = px.line(self.data_buffer, y="t2_stat", title="T^2 Statistics Over Time")
+        _, t2, _ = self.data_buffer.window()
+        x0 = self.data_buffer.start
+        fig = px.line(x=np.arange(x0, x0 + len(t2)), y=t2, title="T^2 Statistics Over Time")
         fig.add_hline(y=self.t2_threshold)
 
         in_fault = False
-        for i, t2_stat in enumerate(self.data_buffer["t2_stat"]):
+        for i, t2_stat in enumerate(t2, start=x0):
             if t2_stat > self.t2_threshold and not in_fault:
                 start_fault = i
                 in_fault = True
@@ -138,7 +395,7 @@ class FaultDetectionModel:
                 type="rect",
                 x0=start_fault,
                 y0=0,
-                x1=len(self.data_buffer),
+                x1=self.data_buffer.count,
                 y1=1,
                 line=dict(width=0),
                 fillcolor="red",
@@ -153,19 +410,27 @@ class FaultDetectionModel:
 
     def t2_contrib(self, index):
         # Select the row by index rather than 'timestamp'
-        x = self.data_buffer.iloc[[index]][self.feature_names]
-        z = self.scaler.transform(x)[0]
-        # Precompute t as a vector
-        t = z.T @ self.P
-
-        # Vectorized calculation of c(j, i)
-        def calculate_c(j):
-            c_ji = (t / self.lamda) * self.P[j, :] * (z[j])  # - self.scaler.mean_[j])
-            return np.maximum(c_ji, 0)  # Ensures non-negativity
-
-        # Calculate C(j) for each j
-        C_list = np.array([calculate_c(j).sum() for j in range(len(z))])
-        return C_list
+        x = self.data_buffer.row(index)
+        return self.t2_contrib_batch(x[None, :])[0]
+
+    def t2_contrib_batch(self, X):
+        """T^2 contributions C(j) for every row of raw values X (n, m); returns an (n, m) array.
+
+        c(j, i) = t_i / lambda_i * P[j, i] * z_j, clipped at zero and summed over the
+        components i. Works on an (n, m, a) temporary, so pass very long inputs in chunks.
+        """
+        if isinstance(X, pd.DataFrame):
+            X = X[self.feature_names].to_numpy(dtype=float)
+        z = (np.atleast_2d(X) - self.scaler.mean_) / self.scaler.scale_
+        t = (z @ self.P) / self.lamda  # (n, a)
+        c = z[:, :, None] * self.P[None, :, :] * t[:, None, :]  # (n, m, a)
+        np.maximum(c, 0, out=c)  # Ensures non-negativity
+        return c.sum(axis=2)
+
+    def t2_contrib_window(self, n=None):
+        # contributions for the newest n buffered samples, oldest first
+        values, _, _ = self.data_buffer.window(n)
+        return self.t2_contrib_batch(values)
     
     # def plot_t2_contributions(self, start_index, end_index=None):
     #     import plotly.express as px
@@ -203,49 +468,208 @@ class FaultDetectionModel:
     #     return fig
 
 import os
+import copy
+from concurrent.futures import ProcessPoolExecutor
+
+_worker_model = None
+
+
+def _init_worker(model):
+    global _worker_model
+    _worker_model = model
+
+
+def _score_file_worker(file_path, output_path, chunksize):
+    return _worker_model.score_file(file_path, output_path, chunksize)
+
 
 class FaultDetectionModel(FaultDetectionModel):  # extend your current class
-    def process_files_in_folder(self, folder_path):
-        for filename in os.listdir(folder_path):
-            if filename.endswith(".csv"):  # Assuming files are in CSV format
-                file_path = os.path.join(folder_path, filename)
-                data = pd.read_csv(file_path)
-                time_column = data["time"]
-                #drop time column
-                data = data.drop(columns=["time"])
-                processed_data = []
-                self.data_buffer = pd.DataFrame()  # Reset the data buffer for each file        
-                #iterater over rows of data
-                
-                for index, row in data.iterrows():
-                    row_df = pd.DataFrame([row])  # Convert row to DataFrame for compatibility
-
-                    # Process the data point to calculate T² and anomaly status
-                    t2_stat, anomaly = self.process_data_point(row_df)
-
-                    # Calculate T² contributions for each feature
-                    t2_contributions = self.t2_contrib(index)
-                    contrib_dict = {f't2_{feature}': t2_contributions[i] for i, feature in enumerate(self.feature_names)}
-                    
-                    # Append the T² stat, anomaly status, and T² contributions
-                    processed_row = row_df.copy()
-                    processed_row["t2_stat"] = t2_stat
-                    processed_row["anomaly"] = anomaly
-                    for contrib_name, contrib_value in contrib_dict.items():
-                        processed_row[contrib_name] = contrib_value
-                    
-                    # Reorder columns to move 't2_stat' and 'anomaly' to the end
-                    reordered_columns = [col for col in processed_row.columns if col not in ["t2_stat", "anomaly"]] + ["anomaly", "t2_stat"]
-                    processed_row = processed_row[reordered_columns]
-                    
-                    processed_data.append(processed_row)
-
-                # Concatenate all processed rows and save to a new CSV
-                processed_df = pd.concat(processed_data, ignore_index=True)
-                #add time to the first column
+    def score_frame(self, data, chunksize=10000):
+        # Features, then T² contributions, then 'anomaly' and 't2_stat' at the end
+        X = data[self.feature_names].to_numpy(dtype=float)
+        t2_stat, spe, phi = self.score_stats(X)
+        # contributions go through an (n, m, a) temporary, so bound n by chunksize
+        contrib = np.concatenate(
+            [self.t2_contrib_batch(X[i:i + chunksize]) for i in range(0, max(len(X), 1), chunksize)]
+        )
+        contrib_df = pd.DataFrame(
+            contrib,
+            columns=[f"t2_{feature}" for feature in self.feature_names],
+            index=data.index,
+        )
+        processed_df = pd.concat([data, contrib_df], axis=1)
+        processed_df["anomaly"] = self.flag(t2_stat, spe, phi)
+        processed_df["t2_stat"] = t2_stat
+        return processed_df
+
+    def score_file(self, file_path, output_path, chunksize=10000):
+        """Score one CSV in chunks of `chunksize` rows, appending each chunk to output_path.
+
+        Stateless: the data buffer and fault callbacks are not touched. The output is
+        written to a temporary file and renamed into place once complete.
+        """
+        tmp_path = output_path + ".part"
+        rows = 0
+        with open(tmp_path, "w", newline="") as out:
+            for chunk in pd.read_csv(file_path, chunksize=chunksize):
+                time_column = chunk.pop("time")
+                processed_df = self.score_frame(chunk, chunksize)
                 processed_df.insert(0, "time", time_column)
-                output_filename = f"{filename.split('.')[0]}.csv"
-                processed_df.to_csv(os.path.join("./", output_filename), index=False)
+                processed_df.to_csv(out, index=False, header=rows == 0)
+                rows += len(chunk)
+        os.replace(tmp_path, output_path)
+        return output_path, rows
+
+    def process_files_in_folder(self, folder_path, output_dir="./", chunksize=None, max_workers=None):
+        """Score every CSV in folder_path and write <name>.csv to output_dir.
+
+        With the defaults each file is loaded whole and scored once with score_frame.
+        Passing chunksize and/or max_workers switches to streaming mode: files are read
+        and written in chunks by score_file, spread over max_workers processes (1 = in
+        this process). Either way the live data buffer and fault callbacks are untouched.
+        """
+        filenames = [f for f in sorted(os.listdir(folder_path)) if f.endswith(".csv")]  # Assuming files are in CSV format
+        jobs = [
+            (os.path.join(folder_path, f), os.path.join(output_dir, f"{f.split('.')[0]}.csv"))
+            for f in filenames
+        ]
+
+        if chunksize is not None or max_workers is not None:
+            chunksize = chunksize or 10000
+            if max_workers == 1 or len(jobs) <= 1:
+                return [self.score_file(src, dst, chunksize) for src, dst in jobs]
+            # ship a copy without the live buffer and callbacks (which may not pickle)
+            worker_model = copy.copy(self)
+            worker_model.data_buffer = None
+            worker_model.fault_callbacks = []
+            with ProcessPoolExecutor(
+                max_workers=max_workers, initializer=_init_worker, initargs=(worker_model,)
+            ) as pool:
+                futures = [pool.submit(_score_file_worker, src, dst, chunksize) for src, dst in jobs]
+                return [future.result() for future in futures]
+
+        results = []
+        for file_path, output_path in jobs:
+            data = pd.read_csv(file_path)
+            time_column = data["time"]
+            #drop time column
+            data = data.drop(columns=["time"])
+
+            # Calculate T², contributions and anomaly status for all rows at once
+            processed_df = self.score_frame(data).reset_index(drop=True)
+            #add time to the first column
+            processed_df.insert(0, "time", time_column)
+            processed_df.to_csv(output_path, index=False)
+            results.append((output_path, len(processed_df)))
+        return results
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class RecursivePCA:
+    """Exponential-forgetting PCA that follows slow drift using normal (non-anomalous) points.
+
+    update() folds one point into the running mean and covariance in O(m^2). Every
+    `refresh_every` accepted points, a worker thread rebuilds the eigendecomposition
+    and thresholds into a new FaultDetectionModel. take() hands that model over once
+    it is ready, so the caller can swap it in between requests without ever waiting.
+    """
+
+    def __init__(self, model, forgetting=0.999, refresh_every=50):
+        self.model = model
+        self.forgetting = forgetting
+        self.refresh_every = refresh_every
+        self.mean = model.scaler.mean_.copy()
+        self.cov = model.cov_z * np.outer(model.scaler.scale_, model.scaler.scale_)
+        self.accepted = 0
+        self.refreshes = 0
+        self.last_refresh = None
+        self.last_error = None
+        self._since_refresh = 0
+        self._future = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="recursive-pca")
+
+    def update(self, x):
+        lam = self.forgetting
+        self.mean *= lam
+        self.mean += (1 - lam) * np.asarray(x, dtype=float)
+        d = x - self.mean
+        self.cov *= lam
+        self.cov += (1 - lam) * np.outer(d, d)
+        self.accepted += 1
+        self._since_refresh += 1
+        if self._since_refresh >= self.refresh_every and self._future is None:
+            self._since_refresh = 0
+            self._future = self._executor.submit(self._rebuild, self.mean.copy(), self.cov.copy())
+
+    def update_batch(self, X):
+        for x in np.atleast_2d(X):
+            self.update(x)
+
+    def _rebuild(self, mean, cov):
+        # runs on the worker thread; only reads self.model
+        scale = np.sqrt(np.diag(cov))
+        corr = cov / np.outer(scale, scale)
+        eigvals, eigvecs = np.linalg.eigh(corr)
+        eigvals, eigvecs = eigvals[::-1], eigvecs[:, ::-1]
+
+        model = copy.copy(self.model)  # shares data_buffer and fault_callbacks
+        a = model.a
+        model.scaler = StandardScaler()
+        model.scaler.mean_ = mean
+        model.scaler.scale_ = scale
+        model.scaler.var_ = scale**2
+        model.scaler.n_features_in_ = len(mean)
+        model.P = eigvecs[:, :a]
+        model.lamda = eigvals[:a]
+        model.lamda_res = np.clip(eigvals[a:], 0, None)
+        model.cov_z = corr
+        model.set_thresholds()
+        model.build_scorer()
+        return model
+
+    def take(self):
+        """The refreshed model if a rebuild has finished, else None. Call from the thread that owns the live model."""
+        future = self._future
+        if future is None or not future.done():
+            return None
+        self._future = None
+        try:
+            model = future.result()
+        except Exception as e:
+            self.last_error = str(e)
+            return None
+        live = self.model
+        # carry over state that changed on the live model while the rebuild ran
+        model.current_fault_id = live.current_fault_id
+        model.post_fault_data_count = live.post_fault_data_count
+        model.monitor = live.monitor
+        if model.alpha != live.alpha:
+            model.alpha = live.alpha
+            model.set_thresholds()
+        self.model = model
+        self.refreshes += 1
+        self.last_refresh = time.time()
+        return model
+
+    def close(self):
+        # drop any rebuild in flight; the live model is unaffected
+        self._future = None
+        self._executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "forgetting": self.forgetting,
+            "refresh_every": self.refresh_every,
+            "accepted": self.accepted,
+            "refreshes": self.refreshes,
+            "rebuilding": self._future is not None,
+            "last_refresh": self.last_refresh,
+            "last_error": self.last_error,
+            "t2_threshold": float(self.model.t2_threshold),
+            "spe_threshold": float(self.model.spe_threshold),
+        }
 
 # Example usage:
 # Initialize the model and train it with a training dataset
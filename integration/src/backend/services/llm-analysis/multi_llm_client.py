@@ -5,17 +5,193 @@ Supports LMStudio, Google Gemini, and Claude API
 
 import json
 import requests
+import httpx
 import google.generativeai as genai
-from anthropic import Anthropic
-from openai import OpenAI
-from typing import Dict, List, Any, Optional
+from anthropic import Anthropic, AsyncAnthropic
+from openai import OpenAI, AsyncOpenAI
+from typing import Awaitable, Callable, Dict, List, Any, Optional
 import asyncio
+import datetime
+import itertools
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from llm_router import ProviderRouter
+from prompt_budget import PromptBudget
+
+try:
+    import h2  # noqa: F401  (lets httpx negotiate HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+class ProviderExecutor:
+    """Bounded thread pool for one provider's blocking SDK calls, with queueing metrics.
+
+    Each provider gets its own pool so a backlog on a slow model cannot starve the
+    others or the default loop executor used by the rest of the service.
+    """
+
+    def __init__(self, name: str, max_workers: int = 2, max_queue: int = 8):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"llm-{name}")
+        self._semaphore: Optional[asyncio.Semaphore] = None  # bounds native async calls, created on first use
+        self._lock = threading.Lock()
+        self._futures = set()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+
+    async def run(self, fn: Callable[[], Any]) -> Any:
+        """Run fn() on this provider's pool; raises if max_queue calls are already waiting"""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise RuntimeError(f"{self.name} queue full ({self.queued} waiting)")
+            self.queued += 1
+        submitted = time.time()
+
+        def call():
+            started = time.time()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self.wait_total += started - submitted
+                self.wait_max = max(self.wait_max, started - submitted)
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.run_total += time.time() - started
+
+        future = self._pool.submit(call)
+        self._futures.add(future)
+        future.add_done_callback(self._on_done)
+        try:
+            result = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()  # only succeeds if the call has not started yet
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        with self._lock:
+            self.completed += 1
+        return result
+
+    async def run_async(self, coro_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await coro_fn() on the event loop under the same concurrency limit and metrics as run()"""
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise RuntimeError(f"{self.name} queue full ({self.queued} waiting)")
+            self.queued += 1
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        submitted = time.time()
+        try:
+            await self._semaphore.acquire()
+        except asyncio.CancelledError:
+            with self._lock:
+                self.queued -= 1
+                self.cancelled += 1
+            raise
+        started = time.time()
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.wait_total += started - submitted
+            self.wait_max = max(self.wait_max, started - submitted)
+        try:
+            result = await coro_fn()
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+            raise
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            self._semaphore.release()
+            with self._lock:
+                self.running -= 1
+                self.run_total += time.time() - started
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def _on_done(self, future):
+        self._futures.discard(future)
+        if future.cancelled():
+            with self._lock:
+                self.queued -= 1
+                self.cancelled += 1
+
+    def cancel_pending(self) -> int:
+        """Cancel calls still waiting for a worker; calls already running finish in the background"""
+        return sum(1 for future in list(self._futures) if future.cancel())
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = self.completed + self.failed + self.running
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "rejected": self.rejected,
+                "wait_avg_s": round(self.wait_total / started, 3) if started else 0.0,
+                "wait_max_s": round(self.wait_max, 3),
+                "run_avg_s": round(self.run_total / max(1, self.completed + self.failed), 3),
+            }
+
+    def shutdown(self):
+        self.cancel_pending()
+        self._pool.shutdown(wait=False)
+
 
 class MultiLLMClient:
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.clients = {}
+        self.executors: Dict[str, ProviderExecutor] = {}  # per-provider thread pools for blocking SDK calls
+        self.async_transport = bool(config.get("async_transport", True))
+        self.async_clients = {}  # native async SDK clients, used instead of the thread pools when present
+        self.http_clients: Dict[str, httpx.AsyncClient] = {}  # keep-alive pool per provider host
+        self._inflight = set()  # provider tasks of running fan-outs
+        budget_config = config.get("prompt_budget", {})
+        self.prompt_budget = PromptBudget(
+            max_input_tokens=int(budget_config.get("max_input_tokens", 6000)),
+            min_features=int(budget_config.get("min_features", 3)),
+        )
+        routing_config = config.get("llm_routing", {})
+        self.router = ProviderRouter(
+            alpha=float(routing_config.get("ewma_alpha", 0.3)),
+            max_error_rate=float(routing_config.get("max_error_rate", 0.5)),
+            max_timeout_rate=float(routing_config.get("max_timeout_rate", 0.3)),
+            hedge_percentile=float(routing_config.get("hedge_percentile", 90)),
+            hedge_min_seconds=float(routing_config.get("hedge_min_seconds", 2.0)),
+            hedge_default_seconds=float(routing_config.get("hedge_default_seconds", 15.0)),
+            probe_after=float(routing_config.get("probe_after_seconds", 300)),
+        )
+        self._gemini_models: Dict[str, Any] = {}  # system message -> (model bound to it, expiry)
+        self.prompt_usage: Dict[str, Dict[str, int]] = {}  # provider-reported input / cached tokens
         self.enabled_models = []
         self.active_tasks = set()  # Track active LLM tasks
         self.stop_requested = False  # Global stop flag
@@ -30,6 +206,13 @@ class MultiLLMClient:
                     self.clients[model_name] = self._init_gemini(model_config)
                 elif model_name == "anthropic":
                     self.clients[model_name] = self._init_claude(model_config)
+                self.executors[model_name] = ProviderExecutor(
+                    model_name,
+                    max_workers=int(model_config.get("max_concurrency", 2)),
+                    max_queue=int(model_config.get("max_queue", 8)),
+                )
+                if self.async_transport:
+                    self._init_async(model_name, model_config)
 
         print(f"✅ Initialized LLM clients: {self.enabled_models}")
 
@@ -37,7 +220,36 @@ class MultiLLMClient:
         """Stop all active LLM tasks"""
         print("🛑 Stopping all LLM tasks...")
         self.stop_requested = True
-        return {"success": True, "message": f"Stopping {len(self.active_tasks)} active tasks"}
+        cancelled_calls = sum(executor.cancel_pending() for executor in self.executors.values())
+        inflight = list(self._inflight)
+        for task in inflight:
+            task.cancel()
+        return {
+            "success": True,
+            "message": f"Stopping {len(self.active_tasks)} active tasks",
+            "cancelled_provider_tasks": len(inflight),
+            "cancelled_queued_calls": cancelled_calls,
+        }
+
+    def provider_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queueing metrics of each provider's executor"""
+        return {name: executor.stats() for name, executor in self.executors.items()}
+
+    def prompt_stats(self) -> Dict[str, Any]:
+        """Local token budget counters and the input/cached tokens reported by each provider"""
+        return {"budget": self.prompt_budget.stats(), "providers": self.prompt_usage}
+
+    def _record_usage(self, model_name: str, input_tokens: Any, cached_tokens: Any, cache_write_tokens: Any = 0):
+        usage = self.prompt_usage.setdefault(
+            model_name, {"calls": 0, "input_tokens": 0, "cached_tokens": 0, "cache_write_tokens": 0}
+        )
+        usage["calls"] += 1
+        usage["input_tokens"] += int(input_tokens or 0)
+        usage["cached_tokens"] += int(cached_tokens or 0)
+        usage["cache_write_tokens"] += int(cache_write_tokens or 0)
+
+    def _prompt_caching(self, model_name: str) -> bool:
+        return bool(self.config["models"][model_name].get("prompt_caching", True))
     
     def _init_lmstudio(self, config: Dict[str, Any]) -> OpenAI:
         """Initialize LMStudio client"""
@@ -55,61 +267,344 @@ class MultiLLMClient:
         """Initialize Claude client"""
         return Anthropic(api_key=config["api_key"])
     
-    async def get_analysis_from_all_models(self, system_message: str, user_prompt: str) -> Dict[str, Dict[str, Any]]:
-        """Get fault analysis from all enabled models"""
+    def _http_client(self, model_name: str, config: Dict[str, Any]) -> httpx.AsyncClient:
+        """Shared keep-alive connection pool for one provider host"""
+        max_connections = int(config.get("max_connections", 10))
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60,
+            ),
+            timeout=httpx.Timeout(self._provider_timeout(model_name), connect=5.0),
+        )
+        self.http_clients[model_name] = client
+        return client
+
+    def _init_async(self, model_name: str, config: Dict[str, Any]):
+        """Initialize the native async client for a provider"""
+        if model_name == "lmstudio":
+            self.async_clients[model_name] = AsyncOpenAI(
+                base_url=config["base_url"],
+                api_key=config["api_key"],
+                http_client=self._http_client(model_name, config),
+            )
+        elif model_name == "anthropic":
+            self.async_clients[model_name] = AsyncAnthropic(
+                api_key=config["api_key"],
+                http_client=self._http_client(model_name, config),
+            )
+        elif model_name == "gemini" and hasattr(self.clients[model_name], "generate_content_async"):
+            # gRPC asyncio transport, which keeps its own long-lived channel
+            self.async_clients[model_name] = self.clients[model_name]
+
+    async def aclose(self):
+        """Close the provider connection pools"""
+        for client in self.http_clients.values():
+            await client.aclose()
+
+    async def _call(self, model_name: str, sync_fn: Callable[[], Any], async_fn: Callable[[], Awaitable[Any]]) -> Any:
+        """One provider request: on the event loop when an async client exists, else on the provider's thread pool"""
+        executor = self.executors[model_name]
+        if model_name in self.async_clients:
+            return await executor.run_async(async_fn)
+        return await executor.run(sync_fn)
+
+    def _provider_timeout(self, model_name: str) -> float:
+        """Overall time budget for one provider call (retries included)"""
+        model_config = self.config.get("models", {}).get(model_name, {})
+        return float(model_config.get("timeout_seconds", self.config.get("llm_timeout_seconds", 90)))
+
+    async def _query_model(self, model_name: str, system_message: str, user_prompt: str) -> str:
+        if model_name == "lmstudio":
+            return await self._query_lmstudio(system_message, user_prompt)
+        elif model_name == "gemini":
+            return await self._query_gemini(system_message, user_prompt)
+        elif model_name == "anthropic":
+            return await self._query_claude(system_message, user_prompt)
+        raise ValueError(f"Unknown model: {model_name}")
+
+    async def _stream_model(self, model_name: str, system_message: str, user_prompt: str,
+                            on_token: Callable[[str], Any]) -> str:
+        """Stream one provider's answer, calling on_token(text) per chunk; returns the full text.
+        Providers without a native async client answer in one piece through _query_model."""
+        if model_name not in self.async_clients:
+            response = await self._query_model(model_name, system_message, user_prompt)
+            on_token(response)
+            return response
+        if model_name == "lmstudio":
+            stream = self._stream_lmstudio(system_message, user_prompt)
+        elif model_name == "gemini":
+            stream = self._stream_gemini(system_message, user_prompt)
+        elif model_name == "anthropic":
+            stream = self._stream_claude(system_message, user_prompt)
+        else:
+            raise ValueError(f"Unknown model: {model_name}")
+
+        async def consume() -> str:
+            parts = []
+            try:
+                async for text in stream:
+                    if text:
+                        parts.append(text)
+                        on_token(text)
+            finally:
+                await stream.aclose()  # releases the provider connection on timeout or cancel
+            return "".join(parts)
+
+        return await self.executors[model_name].run_async(consume)
+
+    async def _timed_query(self, model_name: str, system_message: str, user_prompt: str,
+                           on_token: Optional[Callable[[str], Any]] = None) -> Dict[str, Any]:
+        """Query one provider under its timeout; always returns a result entry.
+        With on_token the answer is streamed, and on_token(text) is called per chunk."""
+        start_time = time.time()
+        print(f"🤖 Querying {model_name}...")
+        try:
+            if on_token is None:
+                query = self._query_model(model_name, system_message, user_prompt)
+            else:
+                query = self._stream_model(model_name, system_message, user_prompt, on_token)
+            response = await asyncio.wait_for(query, timeout=self._provider_timeout(model_name))
+            result = {
+                "response": response,
+                "response_time": round(time.time() - start_time, 2),
+                "status": "success"
+            }
+            print(f"✅ {model_name} completed in {result['response_time']}s")
+        except asyncio.TimeoutError:
+            result = {
+                "response": f"Error: timed out after {self._provider_timeout(model_name):.0f}s",
+                "response_time": round(time.time() - start_time, 2),
+                "status": "timeout"
+            }
+            print(f"⏰ {model_name} timed out")
+        except Exception as e:
+            result = {
+                "response": f"Error: {str(e)}",
+                "response_time": 0,
+                "status": "error"
+            }
+            print(f"❌ {model_name} failed: {str(e)}")
+        self.router.record(model_name, result["status"], result["response_time"])
+        return result
+
+    async def get_analysis_from_all_models(
+        self,
+        system_message: str,
+        user_prompt: str,
+        first_n: Optional[int] = None,
+        on_result: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get fault analysis from all enabled models, queried concurrently.
+
+        on_result(model_name, result) is called as each provider finishes. With first_n,
+        the remaining providers are cancelled once that many have answered successfully
+        and reported with status "skipped".
+        """
         if self.stop_requested:
             print("🛑 Analysis cancelled - stop requested")
             return {"cancelled": {"response": "Analysis cancelled by user", "status": "cancelled"}}
 
+        user_prompt = self.prompt_budget.fit(system_message, user_prompt)
         results = {}
         task_id = f"analysis_{int(time.time() * 1000)}"
         self.active_tasks.add(task_id)
 
+        async def run(model_name: str):
+            try:
+                return model_name, await self._timed_query(model_name, system_message, user_prompt)
+            except asyncio.CancelledError:
+                # stop_all_tasks() cancels provider tasks directly
+                return model_name, {"response": "Analysis cancelled by user", "response_time": 0, "status": "cancelled"}
+
+        tasks = [asyncio.ensure_future(run(model_name)) for model_name in self.enabled_models]
+        self._inflight.update(tasks)
+        successes = 0
         try:
-            for model_name in self.enabled_models:
+            for next_done in asyncio.as_completed(tasks):
+                model_name, result = await next_done
                 if self.stop_requested:
-                    print(f"🛑 Stopping {model_name} - stop requested")
+                    print(f"🛑 {model_name} cancelled after completion")
+                    break
+                results[model_name] = result
+                if on_result is not None:
+                    on_result(model_name, result)
+                successes += result["status"] == "success"
+                if first_n and successes >= first_n:
                     break
 
-                try:
-                    start_time = time.time()
-                    print(f"🤖 Querying {model_name}...")
+            # providers without a recorded answer after an early exit or a stop
+            for model_name, task in zip(self.enabled_models, tasks):
+                if model_name not in results:
+                    task.cancel()
+                    results[model_name] = {
+                        "response": "Skipped: enough answers received" if not self.stop_requested else "Analysis cancelled by user",
+                        "response_time": 0,
+                        "status": "skipped" if not self.stop_requested else "cancelled"
+                    }
+
+            # keep the configured model order for display
+            return {name: results[name] for name in self.enabled_models if name in results}
+        finally:
+            for task in tasks:
+                task.cancel()
+            self._inflight.difference_update(tasks)
+            self.active_tasks.discard(task_id)
+
+    async def route_analysis(
+        self,
+        system_message: str,
+        user_prompt: str,
+        on_result: Optional[Callable[[str, Dict[str, Any]], Any]] = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get one analysis from the fastest healthy provider, hedged by the next one.
 
-                    if model_name == "lmstudio":
-                        response = await self._query_lmstudio(system_message, user_prompt)
-                    elif model_name == "gemini":
-                        response = await self._query_gemini(system_message, user_prompt)
-                    elif model_name == "anthropic":
-                        response = await self._query_claude(system_message, user_prompt)
+        The router's best provider is queried first. If it has not answered within its
+        hedge delay (a percentile of its recent latencies), the next provider in rank
+        order is queried as well and the first successful answer wins; the other call is
+        cancelled. A failed call fails over to the next provider. Providers that were not
+        needed are reported with status "skipped".
+        """
+        if self.stop_requested:
+            print("🛑 Analysis cancelled - stop requested")
+            return {"cancelled": {"response": "Analysis cancelled by user", "status": "cancelled"}}
 
-                    if self.stop_requested:
-                        print(f"🛑 {model_name} cancelled after completion")
-                        break
+        user_prompt = self.prompt_budget.fit(system_message, user_prompt)
+        order = self.router.rank(self.enabled_models)
+        if not order:
+            return {}
+        self.router.routed += 1
+        results = {}
+        running: Dict[asyncio.Task, str] = {}
+        started: Dict[str, float] = {}
+        task_id = f"route_{int(time.time() * 1000)}"
+        self.active_tasks.add(task_id)
 
-                    end_time = time.time()
+        def start(model_name: str):
+            task = asyncio.ensure_future(self._timed_query(model_name, system_message, user_prompt))
+            running[task] = model_name
+            started[model_name] = time.time()
+            self._inflight.add(task)
 
-                    results[model_name] = {
-                        "response": response,
-                        "response_time": round(end_time - start_time, 2),
-                        "status": "success"
-                    }
-                    print(f"✅ {model_name} completed in {results[model_name]['response_time']}s")
+        start(order[0])
+        next_index = 1
+        hedged = False
+        winner = None
+        try:
+            while running and winner is None and not self.stop_requested:
+                hedge_timeout = None
+                if not hedged and next_index == 1 and next_index < len(order):
+                    hedge_timeout = self.router.hedge_delay(order[0])
+                done, _ = await asyncio.wait(running, timeout=hedge_timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # the primary is slower than it usually is: race the next provider against it
+                    hedged = True
+                    self.router.hedged += 1
+                    print(f"⏱️ {order[0]} over its {hedge_timeout:.1f}s hedge delay, also querying {order[next_index]}")
+                    start(order[next_index])
+                    next_index += 1
+                    continue
+                for task in done:
+                    model_name = running.pop(task)
+                    self._inflight.discard(task)
+                    if task.cancelled():
+                        result = {"response": "Analysis cancelled by user", "response_time": 0, "status": "cancelled"}
+                    else:
+                        result = task.result()
+                    results[model_name] = result
+                    if on_result is not None:
+                        on_result(model_name, result)
+                    if result["status"] == "success" and winner is None:
+                        winner = model_name
+                if winner is None and not running and next_index < len(order):
+                    start(order[next_index])  # fail over
+                    next_index += 1
 
-                except Exception as e:
+            if hedged and winner is not None and winner != order[0]:
+                self.router.hedge_wins += 1
+            for task, model_name in running.items():
+                task.cancel()
+                if winner is not None:
+                    self.router.record_slow(model_name, time.time() - started[model_name])
+                results[model_name] = {
+                    "response": f"Cancelled: {winner} answered first" if winner else "Analysis cancelled by user",
+                    "response_time": 0,
+                    "status": "skipped" if winner else "cancelled"
+                }
+            for model_name in order:
+                if model_name not in results:
                     results[model_name] = {
-                        "response": f"Error: {str(e)}",
+                        "response": f"Not queried: routed to {winner}" if winner else "Not queried",
                         "response_time": 0,
-                        "status": "error"
+                        "status": "skipped"
                     }
-                    print(f"❌ {model_name} failed: {str(e)}")
+            return {name: results[name] for name in self.enabled_models if name in results}
+        finally:
+            for task in running:
+                task.cancel()
+            self._inflight.difference_update(running)
+            self.active_tasks.discard(task_id)
+
+    async def stream_analysis_from_all_models(self, system_message: str, user_prompt: str):
+        """Query all enabled models concurrently and yield their answers as they stream in.
+
+        Yields {"event": "token", "model", "index", "content"} for every text chunk and
+        {"event": "result", "model", **result} once per provider, multiplexed in arrival
+        order. Closing the generator cancels the providers still running.
+        """
+        if self.stop_requested:
+            print("🛑 Analysis cancelled - stop requested")
+            yield {"event": "result", "model": "cancelled", "response": "Analysis cancelled by user",
+                   "response_time": 0, "status": "cancelled"}
+            return
+
+        user_prompt = self.prompt_budget.fit(system_message, user_prompt)
+        queue: asyncio.Queue = asyncio.Queue()
+        task_id = f"stream_{int(time.time() * 1000)}"
+        self.active_tasks.add(task_id)
+
+        async def run(model_name: str):
+            index = itertools.count()
+
+            def on_token(text: str):
+                queue.put_nowait({"event": "token", "model": model_name, "index": next(index), "content": text})
+
+            try:
+                result = await self._timed_query(model_name, system_message, user_prompt, on_token=on_token)
+            except asyncio.CancelledError:
+                result = {"response": "Analysis cancelled by user", "response_time": 0, "status": "cancelled"}
+            queue.put_nowait({"event": "result", "model": model_name, **result})
 
-            return results
+        def on_done(model_name: str, task: asyncio.Task):
+            # a task cancelled before it started never reaches run()'s handler
+            if task.cancelled():
+                queue.put_nowait({"event": "result", "model": model_name, "response": "Analysis cancelled by user",
+                                  "response_time": 0, "status": "cancelled"})
+
+        tasks = []
+        for model_name in self.enabled_models:
+            task = asyncio.ensure_future(run(model_name))
+            task.add_done_callback(lambda t, name=model_name: on_done(name, t))
+            tasks.append(task)
+        self._inflight.update(tasks)
+        try:
+            remaining = len(tasks)
+            while remaining:
+                event = await queue.get()
+                remaining -= event["event"] == "result"
+                yield event
         finally:
+            for task in tasks:
+                task.cancel()
+            self._inflight.difference_update(tasks)
             self.active_tasks.discard(task_id)
-    
+
     async def _query_lmstudio(self, system_message: str, user_prompt: str) -> str:
         """Query LMStudio with timeout and retry logic"""
         client = self.clients["lmstudio"]
+        async_client = self.async_clients.get("lmstudio")
 
         messages = [
             {"role": "system", "content": system_message},
@@ -124,18 +619,18 @@ class MultiLLMClient:
             try:
                 print(f"🤖 LMStudio attempt {attempt + 1}/{max_retries}")
 
-                # Run in thread pool with timeout
-                loop = asyncio.get_event_loop()
+                request = dict(
+                    model=self.config["models"]["lmstudio"]["model_name"],
+                    messages=messages,
+                    temperature=0.7,
+                    max_tokens=2000,
+                    timeout=timeout
+                )
                 response = await asyncio.wait_for(
-                    loop.run_in_executor(
-                        None,
-                        lambda: client.chat.completions.create(
-                            model=self.config["models"]["lmstudio"]["model_name"],
-                            messages=messages,
-                            temperature=0.7,
-                            max_tokens=2000,
-                            timeout=timeout
-                        )
+                    self._call(
+                        "lmstudio",
+                        lambda: client.chat.completions.create(**request),
+                        lambda: async_client.chat.completions.create(**request),
                     ),
                     timeout=timeout
                 )
@@ -154,49 +649,139 @@ class MultiLLMClient:
                     raise Exception(f"LMStudio failed after {max_retries} attempts: {str(e)}")
                 await asyncio.sleep(2)  # Wait before retry
     
+    async def _gemini_model(self, system_message: str) -> Any:
+        """Gemini model bound to system_message.
+
+        The static system message is uploaded once as CachedContent (renewed before its TTL
+        runs out) so calls only send the user prompt. When the API refuses the cache
+        (e.g. below its minimum size) it is passed as system_instruction instead.
+        """
+        model, expires = self._gemini_models.get(system_message, (None, 0.0))
+        if model is not None and time.time() < expires:
+            return model
+        model_config = self.config["models"]["gemini"]
+        ttl = float(model_config.get("cache_ttl_seconds", 3600))
+        model, expires = None, float("inf")
+        if self._prompt_caching("gemini") and hasattr(genai, "caching"):
+            try:
+                cached = await self.executors["gemini"].run(lambda: genai.caching.CachedContent.create(
+                    model=model_config["model_name"],
+                    system_instruction=system_message,
+                    ttl=datetime.timedelta(seconds=ttl),
+                ))
+                model = genai.GenerativeModel.from_cached_content(cached_content=cached)
+                expires = time.time() + ttl - 60
+            except Exception as e:
+                print(f"ℹ️ Gemini context cache unavailable, using system_instruction: {e}")
+        if model is None:
+            model = genai.GenerativeModel(model_config["model_name"], system_instruction=system_message)
+        self._gemini_models[system_message] = (model, expires)
+        return model
+
+    def _record_gemini_usage(self, response: Any):
+        usage = getattr(response, "usage_metadata", None)
+        if usage is not None:
+            self._record_usage("gemini", getattr(usage, "prompt_token_count", 0),
+                               getattr(usage, "cached_content_token_count", 0))
+
     async def _query_gemini(self, system_message: str, user_prompt: str) -> str:
         """Query Google Gemini"""
-        client = self.clients["gemini"]
-
-        # Combine system message and user prompt for Gemini
-        full_prompt = f"{system_message}\n\n{user_prompt}"
-
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.generate_content(
-                full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    temperature=0.7,
-                    max_output_tokens=2000,
-                )
-            )
+        model = await self._gemini_model(system_message)
+
+        generation_config = genai.types.GenerationConfig(
+            temperature=0.7,
+            max_output_tokens=2000,
+        )
+        response = await self._call(
+            "gemini",
+            lambda: model.generate_content(user_prompt, generation_config=generation_config),
+            lambda: model.generate_content_async(user_prompt, generation_config=generation_config),
         )
+        self._record_gemini_usage(response)
 
         return response.text
     
     async def _query_claude(self, system_message: str, user_prompt: str) -> str:
         """Query Claude"""
         client = self.clients["anthropic"]
+        async_client = self.async_clients.get("anthropic")
 
-        # Run in thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(
-            None,
-            lambda: client.messages.create(
-                model=self.config["models"]["anthropic"]["model_name"],
-                max_tokens=2000,
-                temperature=0.7,
-                system=system_message,
-                messages=[
-                    {"role": "user", "content": user_prompt}
-                ]
-            )
+        request = dict(
+            model=self.config["models"]["anthropic"]["model_name"],
+            max_tokens=2000,
+            temperature=0.7,
+            system=self._claude_system(system_message),
+            messages=[
+                {"role": "user", "content": user_prompt}
+            ]
+        )
+        response = await self._call(
+            "anthropic",
+            lambda: client.messages.create(**request),
+            lambda: async_client.messages.create(**request),
         )
+        self._record_claude_usage(response)
 
         return response.content[0].text
+
+    def _claude_system(self, system_message: str) -> Any:
+        """System prompt as a cache-control block, so repeated calls read it from Anthropic's prompt cache"""
+        if not self._prompt_caching("anthropic"):
+            return system_message
+        return [{"type": "text", "text": system_message, "cache_control": {"type": "ephemeral"}}]
+
+    def _record_claude_usage(self, message: Any):
+        usage = getattr(message, "usage", None)
+        if usage is not None:
+            cached = getattr(usage, "cache_read_input_tokens", 0) or 0
+            written = getattr(usage, "cache_creation_input_tokens", 0) or 0
+            # input_tokens excludes the cached and cache-writing parts of the prompt
+            self._record_usage("anthropic", (getattr(usage, "input_tokens", 0) or 0) + cached + written,
+                               cached, written)
     
+    async def _stream_lmstudio(self, system_message: str, user_prompt: str):
+        """Stream LMStudio tokens (no retries once streaming has started)"""
+        stream = await self.async_clients["lmstudio"].chat.completions.create(
+            model=self.config["models"]["lmstudio"]["model_name"],
+            messages=[
+                {"role": "system", "content": system_message},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.7,
+            max_tokens=2000,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+    async def _stream_gemini(self, system_message: str, user_prompt: str):
+        """Stream Gemini tokens"""
+        generation_config = genai.types.GenerationConfig(
+            temperature=0.7,
+            max_output_tokens=2000,
+        )
+        model = await self._gemini_model(system_message)
+        response = await model.generate_content_async(user_prompt, generation_config=generation_config, stream=True)
+        async for chunk in response:
+            yield chunk.text
+        self._record_gemini_usage(response)
+
+    async def _stream_claude(self, system_message: str, user_prompt: str):
+        """Stream Claude tokens"""
+        async with self.async_clients["anthropic"].messages.stream(
+            model=self.config["models"]["anthropic"]["model_name"],
+            max_tokens=2000,
+            temperature=0.7,
+            system=self._claude_system(system_message),
+            messages=[
+                {"role": "user", "content": user_prompt}
+            ]
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+            self._record_claude_usage(await stream.get_final_message())
+
     def format_comparative_results(self, results: Dict[str, Dict[str, Any]], feature_comparison: str) -> Dict[str, Any]:
         """Format results for comparative display"""
         
@@ -0,0 +1,80 @@
+"""
+Prompt compaction and input-token budgeting for provider calls
+The static instructions are compacted once; only the variable feature block is trimmed per call
+"""
+
+import re
+from typing import Any, Dict
+
+from llm_cache import parse_feature_lines
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # optional; falls back to a character estimate
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count of text (tiktoken cl100k when installed, else ~4 characters per token)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return (len(text) + 3) // 4
+
+
+def compact_prompt(text: str) -> str:
+    """Whitespace-only compaction: runs of spaces/tabs become one space, trailing spaces
+    and repeated blank lines are dropped. Line structure (lists, headings) is kept."""
+    lines = [re.sub(r"[ \t]+", " ", line).rstrip() for line in text.strip().splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines))
+
+
+class PromptBudget:
+    """Keeps system + user prompt under max_input_tokens by trimming the user prompt.
+
+    The lowest-ranked feature lines ("N. Feature: ... | z=...") are dropped first, keeping
+    at least `min_features`; if that is not enough the prompt is cut at a line boundary.
+    """
+
+    def __init__(self, max_input_tokens: int = 6000, min_features: int = 3):
+        self.max_input_tokens = max_input_tokens
+        self.min_features = min_features
+        self.calls = 0
+        self.trimmed = 0
+        self.input_tokens = 0
+        self._system_tokens: Dict[str, int] = {}
+
+    def system_tokens(self, system_message: str) -> int:
+        # the static system message is counted once
+        if system_message not in self._system_tokens:
+            self._system_tokens[system_message] = count_tokens(system_message)
+        return self._system_tokens[system_message]
+
+    def fit(self, system_message: str, user_prompt: str) -> str:
+        self.calls += 1
+        budget = self.max_input_tokens - self.system_tokens(system_message)
+        used = count_tokens(user_prompt)
+        if used > budget:
+            self.trimmed += 1
+            user_prompt = self._trim(user_prompt, budget)
+            used = count_tokens(user_prompt)
+        self.input_tokens += self.system_tokens(system_message) + used
+        return user_prompt
+
+    def _trim(self, user_prompt: str, budget: int) -> str:
+        lines = user_prompt.splitlines()
+        features = [i for i, line in enumerate(lines) if parse_feature_lines(line)]
+        while len(features) > self.min_features and count_tokens("\n".join(lines)) > budget:
+            del lines[features.pop()]
+        while len(lines) > 1 and count_tokens("\n".join(lines)) > budget:
+            lines.pop()
+        return "\n".join(lines)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_input_tokens": self.max_input_tokens,
+            "tokenizer": "tiktoken" if _ENCODING is not None else "chars/4",
+            "calls": self.calls,
+            "trimmed": self.trimmed,
+            "avg_input_tokens": round(self.input_tokens / self.calls) if self.calls else 0,
+        }
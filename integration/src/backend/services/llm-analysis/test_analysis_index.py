@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Test script for AnalysisIndex
+Checks the nearest-neighbour distance cutoff and the age limit on reused analyses
+"""
+
+import time
+
+from analysis_index import AnalysisIndex
+
+FEATURES = ["Reactor Pressure", "Reactor Temperature", "Stripper Level", "A Feed"]
+
+
+def comparison(**z):
+    lines = ["Top 6 Contributing Features (Fault vs Normal):"]
+    for i, (feature, value) in enumerate(z.items(), 1):
+        name = feature.replace("_", " ")
+        lines.append(f"{i}. {name}: Fault=1.000 | Normal=0.000 | Δ=1.000 (1.00%) | z={value:.2f}")
+    return "\n".join(lines)
+
+
+def record(text, id=1, age=0.0, status="success"):
+    return {"id": id, "time": time.time() - age, "feature_analysis": text,
+            "llm_analyses": {"gemini": {"status": status, "analysis": "diagnosis"}}}
+
+
+def test_distance_cutoff():
+    """Only analyses within max_distance (Euclidean over z-scores) are reused"""
+    index = AnalysisIndex(FEATURES, max_distance=1.0)
+    assert index.add(record(comparison(Reactor_Pressure=4.0, Reactor_Temperature=-3.0)))
+
+    near = index.nearest(comparison(Reactor_Pressure=4.5, Reactor_Temperature=-3.5))
+    print(f"near: {near[0]:.3f}")
+    assert near is not None and abs(near[0] - 2 ** 0.5 / 2) < 1e-9
+
+    far = index.nearest(comparison(Reactor_Pressure=4.0, Reactor_Temperature=-1.0))
+    print(f"far (distance 2.0): {far}")
+    assert far is None
+    assert index.nearest(comparison(Reactor_Pressure=4.0, Reactor_Temperature=-1.0), max_distance=2.5) is not None
+
+    # a different fault signature is nowhere near
+    assert index.nearest(comparison(Stripper_Level=4.0, A_Feed=-3.0)) is None
+    assert index.stats()["lookups"] == 4 and index.stats()["reuses"] == 2
+
+
+def test_closest_wins():
+    """nearest() returns the closest of several candidates"""
+    index = AnalysisIndex(FEATURES, max_distance=1.0)
+    index.add(record(comparison(Reactor_Pressure=4.0), id=1))
+    index.add(record(comparison(Reactor_Pressure=5.0), id=2))
+    distance, match = index.nearest(comparison(Reactor_Pressure=4.8))
+    assert match["id"] == 2 and abs(distance - 0.2) < 1e-9
+
+
+def test_max_age():
+    """Analyses older than max_age_seconds are not reused"""
+    index = AnalysisIndex(FEATURES, max_distance=1.0, max_age_seconds=3600)
+    index.add(record(comparison(Reactor_Pressure=4.0), id=1, age=7200))
+    assert index.nearest(comparison(Reactor_Pressure=4.0)) is None
+
+    index.add(record(comparison(Reactor_Pressure=4.5), id=2, age=60))
+    distance, match = index.nearest(comparison(Reactor_Pressure=4.0))
+    print(f"fresh match: id={match['id']} distance={distance:.2f}")
+    assert match["id"] == 2
+
+
+def test_only_successful_analyses_indexed():
+    """Records without a successful model or without z-scores are skipped"""
+    index = AnalysisIndex(FEATURES)
+    assert not index.add(record(comparison(Reactor_Pressure=4.0), status="error"))
+    assert not index.add(record("no feature lines here"))
+    assert len(index) == 0
+
+
+def test_capacity_overwrites_oldest():
+    """Past capacity the oldest slot is overwritten"""
+    index = AnalysisIndex(FEATURES, capacity=2)
+    for i, z in enumerate([1.0, 3.0, 5.0]):
+        index.add(record(comparison(Reactor_Pressure=z), id=i))
+    assert len(index) == 2
+    assert index.nearest(comparison(Reactor_Pressure=1.0), max_distance=0.5) is None
+
+
+if __name__ == '__main__':
+    print("🧪 Testing AnalysisIndex")
+    print("=" * 50)
+    test_distance_cutoff()
+    test_closest_wins()
+    test_max_age()
+    test_only_successful_analyses_indexed()
+    test_capacity_overwrites_oldest()
+    print("✅ AnalysisIndex tests passed")
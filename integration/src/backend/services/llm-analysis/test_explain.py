@@ -16,15 +16,109 @@ faults = ["Fault 1 A/C Feed Ratio, B Composition Constant (Stream 4) \\& Step",
 
 import sys
 import os
-
-#open a text file to write the results
-f = open("results.txt", "w")
+import asyncio
+import json
+import tempfile
 
 # Import EXPLAIN_PROMPT from app.py
 from prompts import EXPLAIN_PROMPT, EXPLAIN_ROOT, SYSTEM_MESSAGE
+from prompt_budget import compact_prompt
+from llm_cache import AnalysisCache
+import app
 from app import generate_feature_comparison, get_full_response
 import pandas as pd
 
+
+def check_explain_layout():
+    """/explain sends the instructions (PROMPT_SELECT) in the system message and only the
+    feature comparison as the user prompt, and returns the comparison with each model's analysis"""
+    sent = {}
+
+    async def fake_analysis(system_message, user_prompt, **kwargs):
+        sent.update(system_message=system_message, user_prompt=user_prompt)
+        return {name: {"response": "diagnosis", "response_time": 0.1, "status": "success"}
+                for name in app.multi_llm_client.enabled_models}
+
+    real_analysis, real_cache = app.multi_llm_client.get_analysis_from_all_models, app.llm_cache
+    app.multi_llm_client.get_analysis_from_all_models = fake_analysis
+    app.llm_cache = None
+    try:
+        request = app.ExplainationRequest(id="layout", file="fault1.csv",
+                                          data={"Reactor Pressure": [2705.0, 2790.0], "A Feed": [0.25, 0.1]})
+        response = asyncio.run(app.explain(request))
+    finally:
+        app.multi_llm_client.get_analysis_from_all_models, app.llm_cache = real_analysis, real_cache
+
+    comparison = generate_feature_comparison(request.data, request.file)
+    assert sent["system_message"] == app.ANALYSIS_SYSTEM_MESSAGE
+    assert sent["system_message"] == compact_prompt(f"{SYSTEM_MESSAGE}\n\n{app.PROMPT_SELECT}")
+    assert sent["user_prompt"] == comparison
+    assert compact_prompt(app.PROMPT_SELECT) not in sent["user_prompt"]
+
+    body = json.loads(response.body)
+    assert body["feature_analysis"] == comparison
+    assert set(body["llm_analyses"]) == set(app.multi_llm_client.enabled_models)
+    assert all(a["analysis"] == "diagnosis" for a in body["llm_analyses"].values())
+    print("✅ /explain prompt layout checked")
+
+
+def check_routed_result_not_served_to_explain():
+    """A routed live analysis (one real answer, the rest skipped) is cached under its own
+    dispatch mode, so an all-models /explain for the same fault still asks every model"""
+    data = {"Reactor Pressure": [2705.0, 2790.0], "A Feed": [0.25, 0.1]}
+    comparison = generate_feature_comparison(data, "fault1.csv")
+    first, *rest = app.multi_llm_client.enabled_models
+    asked = []
+
+    async def fake_route(system_message, user_prompt, on_result=None):
+        return {first: {"response": "routed diagnosis", "response_time": 0.1, "status": "success"},
+                **{name: {"response": "", "response_time": 0.0, "status": "skipped"} for name in rest}}
+
+    async def fake_analysis(system_message, user_prompt, **kwargs):
+        asked.append(user_prompt)
+        return {name: {"response": "diagnosis", "response_time": 0.1, "status": "success"}
+                for name in app.multi_llm_client.enabled_models}
+
+    saved = (app.multi_llm_client.route_analysis, app.multi_llm_client.get_analysis_from_all_models,
+             app.llm_cache, app.config.get("llm_routing"), app._history_file, app._history_md_file,
+             app._history_days_dir, app.analysis_index)
+    with tempfile.TemporaryDirectory() as tmp:
+        app.multi_llm_client.route_analysis = fake_route
+        app.multi_llm_client.get_analysis_from_all_models = fake_analysis
+        app.llm_cache = AnalysisCache(os.path.join(tmp, "llm_cache.json"))
+        app.config["llm_routing"] = {"enabled": True}
+        app._history_file = os.path.join(tmp, "history.jsonl")
+        app._history_md_file = os.path.join(tmp, "history.md")
+        app._history_days_dir = tmp
+        app.analysis_index = None
+        try:
+            live_key = app._cache_key(comparison, app._live_dispatch())
+            asyncio.run(app._run_llm_analysis("live prompt", comparison, 0.0, lambda **kw: None, live_key))
+            assert app.llm_cache.get(live_key) is not None
+            assert app._cache_key(comparison, "all") != live_key
+
+            request = app.ExplainationRequest(id="routed", file="fault1.csv", data=data)
+            body = json.loads(asyncio.run(app.explain(request)).body)
+        finally:
+            (app.multi_llm_client.route_analysis, app.multi_llm_client.get_analysis_from_all_models,
+             app.llm_cache, routing, app._history_file, app._history_md_file,
+             app._history_days_dir, app.analysis_index) = saved
+            if routing is None:
+                app.config.pop("llm_routing", None)
+            else:
+                app.config["llm_routing"] = routing
+
+    assert asked == [comparison] and not body.get("cached")
+    assert all(a["analysis"] == "diagnosis" for a in body["llm_analyses"].values())
+    print("✅ routed live result kept out of /explain")
+
+
+check_explain_layout()
+check_routed_result_not_served_to_explain()
+
+#open a text file to write the results
+f = open("results.txt", "w")
+
 all_prompt_types = ["prompt=root causes included,", "prompt=general reasoning,"]
 all_gpt_models = ["gpt-4o", "o1-preview"]
 
@@ -80,12 +174,14 @@ for i in range(3, 16):
             put your response in a subsubsection of a latex editor. you can start your response with 
             \\subsubsection{{Fault {i} {prompt_type} model={gpt_model}}}""" + "Use `\\\\` for new lines. Make sure to write `\\%` for percentages. Use `\\textbf` for bold characters. Use `\\begin{itemize} \\item ... \\end{itemize}` for bullet-point lists. Use `\\begin{enumerate} \\item ... \\end{enumerate}` for numbered lists. make sure the \\begin and the \\end do match. Do not use tables."
 
-            EXPLAIN_PROMPT_RESULT = f"{PROMPT_SELECT}\n{comparison_result}"
+            # Same layout as /explain: instructions with the system message, then the comparison
+            # (kept in one user turn since o1-preview takes no system role)
+            analysis_system_message = compact_prompt(f"{SYSTEM_MESSAGE}\n\n{PROMPT_SELECT}")
             emessages = [
                 {
                     "role": "user",
                     "content": [
-                        {"type": "text", "text": SYSTEM_MESSAGE + EXPLAIN_PROMPT_RESULT+latex_prompt},
+                        {"type": "text", "text": f"{analysis_system_message}\n\n{comparison_result}{latex_prompt}"},
                     ],
                 },
             ]
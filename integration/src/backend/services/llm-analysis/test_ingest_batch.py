@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the bulk ingest path (/ingest/batch)
+Checks the vectorized anomaly-run counter and that a batch scores like the same points sent one by one
+"""
+
+import asyncio
+import time
+from collections import deque
+
+import numpy as np
+
+import app
+from app import FEATURE_COLUMNS, _anomaly_runs
+
+
+def anomaly_runs_loop(flags, start):
+    """Reference: the per-point counter from /ingest"""
+    runs, count = [], start
+    for flag in flags:
+        count = count + 1 if flag else 0
+        runs.append(count)
+    return runs
+
+
+def test_anomaly_runs():
+    """_anomaly_runs matches the sequential counter for any flags and carried-over run"""
+    rng = np.random.default_rng(0)
+    for start in (0, 3):
+        for _ in range(50):
+            flags = rng.random(rng.integers(1, 30)) < 0.6
+            assert list(_anomaly_runs(flags, start)) == anomaly_runs_loop(flags, start)
+    assert list(_anomaly_runs(np.ones(4, dtype=bool), 2)) == [3, 4, 5, 6]
+    assert list(_anomaly_runs(np.zeros(3, dtype=bool), 7)) == [0, 0, 0]
+
+
+def reset_live_state(decimation):
+    app.decimation_N = decimation
+    app._recent_raw_rows = deque(maxlen=decimation)
+    app.live_buffer.clear()
+    app._consecutive_anomalies = 0
+    app._aggregated_count = 0
+    app.adaptive_pca = None  # keep the model fixed between the two runs
+    # keep the LLM trigger out of the comparison
+    app._last_llm_trigger_time = time.time()
+    app.llm_min_interval_seconds = 10 ** 9
+    app.feature_shift_min_interval_seconds = 10 ** 9
+
+
+def test_batch_matches_point_ingest():
+    """Decimation, T², anomaly flags and run counts agree with per-point /ingest"""
+    rng = np.random.default_rng(1)
+    scaler = app.pca_model.scaler
+    # normal operation, then a step fault on two features so later windows are flagged
+    rows = scaler.mean_ + rng.normal(size=(25, len(FEATURE_COLUMNS))) * scaler.scale_
+    rows[13:, :2] += 8 * scaler.scale_[:2]
+    points = [dict(zip(FEATURE_COLUMNS, map(float, r))) for r in rows]
+
+    reset_live_state(decimation=3)
+    single = [asyncio.run(app.ingest_live_point(app.IngestRequest(data_point=p))) for p in points]
+
+    reset_live_state(decimation=3)
+    # two batches, so the second continues a half-filled decimation window
+    first = asyncio.run(app.ingest_live_batch(app.IngestBatchRequest(data_points=points[:10])))
+    second = asyncio.run(app.ingest_live_batch(app.IngestBatchRequest(data_points=points[10:])))
+    batch = first["results"] + second["results"]
+    assert first["aggregated"] + second["aggregated"] == 25 // 3
+
+    for a, b in zip(single, batch):
+        assert ("t2_stat" in a) == ("t2_stat" in b)
+        if "t2_stat" in a:
+            assert np.isclose(a["t2_stat"], b["t2_stat"]) and np.isclose(a["spe"], b["spe"])
+            assert a["anomaly"] == b["anomaly"]
+            assert a["consecutive_anomalies"] == b["consecutive_anomalies"]
+            assert a["aggregated_index"] == b["aggregated_index"]
+        else:
+            assert a["have"] == b["have"]
+    flagged = sum(r.get("anomaly", False) for r in batch)
+    print(f"{sum('t2_stat' in r for r in batch)} aggregated points agree ({flagged} anomalous)")
+    assert flagged >= 2
+
+
+def test_batch_ignores_incomplete_points():
+    """Points missing features are reported as ignored, in place"""
+    reset_live_state(decimation=1)
+    point = dict(zip(FEATURE_COLUMNS, [0.0] * len(FEATURE_COLUMNS)))
+    out = asyncio.run(app.ingest_live_batch(app.IngestBatchRequest(data_points=[point, {"A Feed": 1.0}, point])))
+    statuses = [r.get("status") for r in out["results"]]
+    assert statuses[1] == "ignored" and "t2_stat" in out["results"][0] and "t2_stat" in out["results"][2]
+
+
+def test_trigger_kept_when_batch_ends_aggregating():
+    """The LLM trigger result stays on the last scored point when later points are still aggregating"""
+    reset_live_state(decimation=3)
+    point = dict(zip(FEATURE_COLUMNS, map(float, app.pca_model.scaler.mean_)))
+    triggered = {"status": "triggered", "job_id": "job-1"}
+
+    async def fake_trigger(is_anom):
+        return dict(triggered)
+
+    real_trigger = app._maybe_trigger_llm
+    app._maybe_trigger_llm = fake_trigger
+    try:
+        out = asyncio.run(app.ingest_live_batch(app.IngestBatchRequest(data_points=[point] * 4)))
+    finally:
+        app._maybe_trigger_llm = real_trigger
+
+    assert out["aggregated"] == 1 and out["results"][3]["aggregating"]
+    assert out["results"][2]["llm"] == triggered and out["llm"] == triggered
+
+
+if __name__ == '__main__':
+    print("🧪 Testing /ingest/batch")
+    print("=" * 50)
+    test_anomaly_runs()
+    test_batch_matches_point_ingest()
+    test_batch_ignores_incomplete_points()
+    test_trigger_kept_when_batch_ends_aggregating()
+    print("✅ Bulk ingest tests passed")
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test script for AnalysisCache
+Checks signature normalization, hits and misses, TTL expiry, LRU eviction and persistence
+"""
+
+import os
+import tempfile
+import time
+
+from llm_cache import AnalysisCache, parse_feature_lines
+
+MODELS = [["gemini", "gemini-test"]]
+
+
+def comparison(*features):
+    lines = ["Top 6 Contributing Features (Fault vs Normal):"]
+    for i, (name, z) in enumerate(features, 1):
+        lines.append(f"{i}. {name}: Fault=1.000 | Normal=0.000 | Δ=1.000 (1.00%) | z={z:.2f}")
+    return "\n".join(lines)
+
+
+def make_cache(tmp, **kwargs):
+    return AnalysisCache(os.path.join(tmp, "llm_cache.json"), **kwargs)
+
+
+def test_parse_feature_lines():
+    """Only numbered lines with a z-score are parsed"""
+    text = comparison(("Reactor Pressure", 4.2), ("A Feed", -1.5)) + "\n3. Purge Rate: Fault=1.000 | Normal=NA"
+    assert parse_feature_lines(text) == [("Reactor Pressure", 4.2), ("A Feed", -1.5)]
+
+
+def test_signature_normalization():
+    """Small value changes and a different ranking map to the same key; a new direction does not"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        base = cache.key(comparison(("Reactor Pressure", 4.2), ("A Feed", -1.5)), ["prompt", MODELS])
+        assert base == cache.key(comparison(("A Feed", -1.9), ("Reactor Pressure", 4.7)), ["prompt", MODELS])
+        assert base != cache.key(comparison(("Reactor Pressure", 4.2), ("A Feed", 1.5)), ["prompt", MODELS])
+        assert base != cache.key(comparison(("Reactor Pressure", 5.2), ("A Feed", -1.5)), ["prompt", MODELS])
+        assert base != cache.key(comparison(("Reactor Pressure", 4.2), ("A Feed", -1.5)), ["other prompt", MODELS])
+        assert base != cache.key(comparison(("Reactor Pressure", 4.2), ("A Feed", -1.5)), ["prompt", [["claude", "c"]]])
+        # |z| is capped, so extreme values share the top bucket
+        assert cache.key(comparison(("Reactor Pressure", 40.0)), ["p", MODELS]) == \
+            cache.key(comparison(("Reactor Pressure", 90.0)), ["p", MODELS])
+        assert cache.key("no feature lines", ["prompt", MODELS]) is None
+
+
+def test_hit_and_miss():
+    """get() misses until put(), then hits and counts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp)
+        key = cache.key(comparison(("Reactor Pressure", 4.2)), ["prompt", MODELS])
+        assert cache.get(key) is None
+        cache.put(key, {"summary": "valve stuck"})
+        entry = cache.get(key)
+        assert entry["value"] == {"summary": "valve stuck"} and entry["hits"] == 1
+        assert cache.get(None) is None
+        stats = cache.stats()
+        print(f"stats: {stats}")
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 2, 0.333)
+
+
+def test_ttl_expiry():
+    """Entries older than ttl_seconds are misses and are dropped on load"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, ttl_seconds=60)
+        fresh = cache.key(comparison(("Reactor Pressure", 4.2)), ["prompt", MODELS])
+        stale = cache.key(comparison(("A Feed", -3.0)), ["prompt", MODELS])
+        cache.put(fresh, {"summary": "fresh"})
+        cache.put(stale, {"summary": "stale"})
+        cache.entries[stale]["stored"] = time.time() - 120
+        cache.save()
+
+        reloaded = make_cache(tmp, ttl_seconds=60)
+        assert stale not in reloaded.entries and reloaded.get(fresh)["value"]["summary"] == "fresh"
+        assert cache.get(stale) is None and stale not in cache.entries
+
+
+def test_lru_eviction_and_persistence():
+    """Past max_entries the least recently used entry goes; entries survive a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = make_cache(tmp, max_entries=2)
+        keys = [cache.key(comparison((f"Feature {i}", 2.0)), ["prompt", MODELS]) for i in range(3)]
+        cache.put(keys[0], {"n": 0})
+        cache.put(keys[1], {"n": 1})
+        cache.get(keys[0])  # keys[1] is now least recently used
+        cache.put(keys[2], {"n": 2})
+        assert list(cache.entries) == [keys[0], keys[2]]
+
+        reloaded = make_cache(tmp, max_entries=2)
+        assert reloaded.get(keys[2])["value"] == {"n": 2} and reloaded.get(keys[1]) is None
+        reloaded.clear()
+        assert not make_cache(tmp).entries
+
+
+if __name__ == '__main__':
+    print("🧪 Testing AnalysisCache")
+    print("=" * 50)
+    test_parse_feature_lines()
+    test_signature_normalization()
+    test_hit_and_miss()
+    test_ttl_expiry()
+    test_lru_eviction_and_persistence()
+    print("✅ AnalysisCache tests passed")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test script for LLMJobQueue
+Checks non-blocking submission, the pending bound, progress events, errors and cancellation
+"""
+
+import asyncio
+
+from llm_jobs import LLMJobQueue
+
+
+async def wait_until(predicate, timeout=2.0):
+    for _ in range(int(timeout / 0.01)):
+        if predicate():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not reached")
+
+
+def test_submit_runs_in_background():
+    """submit() returns a queued record at once; the job runs later and reports progress"""
+    async def main():
+        queue = LLMJobQueue()
+        release = asyncio.Event()
+
+        async def run(report):
+            report(partial={"gemini": "first"})
+            await release.wait()
+            return {"summary": "done"}
+
+        job = queue.submit(run, kind="live_analysis")
+        assert job["status"] == "queued" and job["kind"] == "live_analysis" and "_run" not in job
+        await wait_until(lambda: queue.get(job["id"]).get("partial") is not None)
+        assert queue.get(job["id"])["status"] == "running"
+
+        release.set()
+        await wait_until(lambda: queue.get(job["id"])["status"] == "done")
+        assert queue.get(job["id"])["result"] == {"summary": "done"}
+        statuses = [e["status"] for e in queue.events_since(0) if e["id"] == job["id"]]
+        print(f"events: {statuses}")
+        assert statuses == ["queued", "running", "running", "done"]
+        assert queue.events_since(queue.last_seq()) == []
+        assert "result" not in queue.list()[0]
+
+    asyncio.run(main())
+
+
+def test_pending_bound():
+    """While max_pending jobs wait, further submissions are refused instead of piling up"""
+    async def main():
+        queue = LLMJobQueue(max_pending=2)
+        release = asyncio.Event()
+
+        async def run(report):
+            await release.wait()
+
+        first = queue.submit(run)
+        await wait_until(lambda: queue.get(first["id"])["status"] == "running")
+        assert queue.submit(run) is not None and queue.submit(run) is not None
+        assert queue.pending() == 2
+        assert queue.submit(run) is None  # busy: the caller retries on a later point
+
+        release.set()
+        await wait_until(lambda: queue.stats().get("done") == 3)
+        assert queue.submit(run) is not None
+
+    asyncio.run(main())
+
+
+def test_error_and_cancel():
+    """A failing job is marked error; cancel_all() stops running and queued jobs"""
+    async def main():
+        queue = LLMJobQueue(max_pending=4)
+
+        async def fail(report):
+            raise RuntimeError("provider down")
+
+        async def hang(report):
+            await asyncio.sleep(60)
+
+        failed = queue.submit(fail)
+        await wait_until(lambda: queue.get(failed["id"])["status"] == "error")
+        assert queue.get(failed["id"])["error"] == "provider down"
+
+        running, queued = queue.submit(hang), queue.submit(hang)
+        await wait_until(lambda: queue.get(running["id"])["status"] == "running")
+        assert queue.cancel_all() == 2
+        await wait_until(lambda: queue.get(running["id"])["status"] == "cancelled")
+        assert queue.get(queued["id"])["status"] == "cancelled"
+
+        # the worker survives cancellation of a job
+        async def ok(report):
+            return 1
+        job = queue.submit(ok)
+        await wait_until(lambda: queue.get(job["id"])["status"] == "done")
+
+    asyncio.run(main())
+
+
+def test_worker_shutdown():
+    """Cancelling the workers (server shutdown) stops them even while a job is running"""
+    async def main():
+        queue = LLMJobQueue()
+
+        async def hang(report):
+            await asyncio.sleep(60)
+
+        job = queue.submit(hang)
+        await wait_until(lambda: queue.get(job["id"])["status"] == "running")
+        for task in queue._tasks:
+            task.cancel()
+        await asyncio.wait_for(asyncio.gather(*queue._tasks, return_exceptions=True), timeout=1)
+        assert all(task.done() for task in queue._tasks)
+        assert queue.get(job["id"])["status"] == "cancelled"
+
+    asyncio.run(main())
+
+
+def test_keep_trims_old_jobs():
+    """Only the newest `keep` job records are retained"""
+    async def main():
+        queue = LLMJobQueue(max_pending=10, keep=3)
+
+        async def ok(report):
+            return None
+
+        ids = []
+        for _ in range(5):
+            ids.append(queue.submit(ok)["id"])
+            await wait_until(lambda: queue.get(ids[-1])["status"] == "done")
+        assert list(queue.jobs) == ids[-3:]
+
+    asyncio.run(main())
+
+
+if __name__ == '__main__':
+    print("🧪 Testing LLMJobQueue")
+    print("=" * 50)
+    test_submit_runs_in_background()
+    test_pending_bound()
+    test_error_and_cancel()
+    test_worker_shutdown()
+    test_keep_trims_old_jobs()
+    print("✅ LLMJobQueue tests passed")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for ProviderRouter and MultiLLMClient.route_analysis
+Checks EWMA ranking, health and probing, hedge delays, and hedging / failover with fake providers
+"""
+
+import asyncio
+import time
+
+from llm_router import ProviderRouter
+from test_multi_llm_client import PROMPT, SYSTEM, fake_providers, make_client
+
+
+def test_ewma_ranking():
+    """Unmeasured providers go first, then by EWMA latency; cancelled calls are ignored"""
+    router = ProviderRouter(alpha=0.5)
+    router.record("gemini", "success", 2.0)
+    router.record("lmstudio", "success", 4.0)
+    assert router.rank(["lmstudio", "gemini", "anthropic"]) == ["anthropic", "gemini", "lmstudio"]
+
+    router.record("gemini", "success", 8.0)  # 0.5 * 2 + 0.5 * 8
+    router.record("anthropic", "success", 3.0)
+    router.record("anthropic", "cancelled", 0.0)
+    router.record("anthropic", "skipped", 0.0)
+    assert router.providers["gemini"]["latency"] == 5.0 and router.providers["anthropic"]["calls"] == 1
+    print(f"ranking: {router.rank(['lmstudio', 'gemini', 'anthropic'])}")
+    assert router.rank(["lmstudio", "gemini", "anthropic"]) == ["anthropic", "lmstudio", "gemini"]
+
+
+def test_unhealthy_ranks_last_until_probe():
+    """A provider over its error or timeout rate ranks last until probe_after has passed"""
+    router = ProviderRouter(alpha=0.5, max_error_rate=0.5, max_timeout_rate=0.3, probe_after=60)
+    router.record("gemini", "success", 0.5)
+    router.record("lmstudio", "success", 3.0)
+    router.record("gemini", "error", 0.1)
+    router.record("gemini", "error", 0.1)  # error rate 0.75
+    assert not router.healthy("gemini")
+    assert router.rank(["gemini", "lmstudio"]) == ["lmstudio", "gemini"]
+
+    router.record("lmstudio", "timeout", 30.0)  # timeout rate 0.5
+    assert not router.healthy("lmstudio")
+
+    router.providers["gemini"]["last_call"] = time.time() - 120
+    assert router.healthy("gemini") and router.rank(["gemini", "lmstudio"]) == ["gemini", "lmstudio"]
+
+
+def test_hedge_delay():
+    """Default until min_samples successes, then the percentile, never below hedge_min_seconds"""
+    router = ProviderRouter(hedge_percentile=90, hedge_min_seconds=0.5, hedge_default_seconds=15.0, min_samples=5)
+    for latency in (1.0, 1.0, 1.0, 1.0):
+        router.record("gemini", "success", latency)
+    assert router.hedge_delay("gemini") == 15.0
+    router.record("gemini", "success", 3.0)
+    assert abs(router.hedge_delay("gemini") - 2.2) < 1e-9  # 90th percentile of [1, 1, 1, 1, 3]
+
+    for _ in range(5):
+        router.record("lmstudio", "success", 0.1)
+    assert router.hedge_delay("lmstudio") == 0.5
+    assert router.stats()["providers"]["gemini"]["hedge_delay_s"] == 2.2
+
+
+def test_record_slow():
+    """Losing a hedge after longer than the EWMA raises it; a shorter elapsed time does not"""
+    router = ProviderRouter(alpha=0.5)
+    router.record_slow("gemini", 10.0)
+    assert router.providers["gemini"]["latency"] is None  # nothing to compare against yet
+    router.record("gemini", "success", 1.0)
+    router.record_slow("gemini", 3.0)
+    assert router.providers["gemini"]["latency"] == 2.0
+    router.record_slow("gemini", 1.5)
+    assert router.providers["gemini"]["latency"] == 2.0 and router.providers["gemini"]["calls"] == 1
+
+
+def routing_client(**routing):
+    return make_client(llm_routing={"hedge_default_seconds": 0.1, "hedge_min_seconds": 0.05, **routing})
+
+
+def test_route_hedges_a_slow_primary():
+    """The best provider is hedged by the next one after its hedge delay; the faster answer wins"""
+    client = routing_client()
+    calls = fake_providers(client, {"lmstudio": (2.0, "local"), "gemini": (0.05, "gemini"),
+                                    "anthropic": (0.05, "claude")})
+    start = time.time()
+    results = asyncio.run(client.route_analysis(SYSTEM, PROMPT))
+    elapsed = time.time() - start
+    print(f"hedged route answered in {elapsed:.2f} s")
+    assert elapsed < 0.5 and calls == ["lmstudio", "gemini"]
+    assert results["gemini"]["status"] == "success" and results["gemini"]["response"] == "gemini"
+    assert results["lmstudio"]["status"] == results["anthropic"]["status"] == "skipped"
+    stats = client.router.stats()
+    assert (stats["routed"], stats["hedged"], stats["hedge_wins"]) == (1, 1, 1)
+    assert stats["providers"]["lmstudio"]["calls"] == 0  # the cancelled loser is not a sample
+
+
+def test_route_fails_over_on_error():
+    """A failing provider fails over to the next one without waiting for the hedge delay"""
+    client = routing_client(hedge_default_seconds=5.0)
+    calls = fake_providers(client, {"lmstudio": (0.02, RuntimeError("down")), "gemini": (0.02, "gemini"),
+                                    "anthropic": (0.02, "claude")})
+    reported = []
+    start = time.time()
+    results = asyncio.run(client.route_analysis(SYSTEM, PROMPT, on_result=lambda name, r: reported.append(name)))
+    assert time.time() - start < 0.5
+    assert calls == reported == ["lmstudio", "gemini"]
+    assert results["lmstudio"]["status"] == "error" and results["gemini"]["status"] == "success"
+    assert results["anthropic"]["status"] == "skipped"
+    assert client.router.stats()["hedged"] == 0 and client.router.providers["lmstudio"]["error_rate"] > 0
+
+
+def test_route_prefers_the_fastest_provider():
+    """With latency history the fastest healthy provider is queried alone"""
+    client = routing_client(hedge_default_seconds=5.0)
+    for name, latency in [("lmstudio", 3.0), ("gemini", 0.5), ("anthropic", 1.0)]:
+        client.router.record(name, "success", latency)
+    calls = fake_providers(client, {"lmstudio": (0.02, "local"), "gemini": (0.02, "gemini"),
+                                    "anthropic": (0.02, "claude")})
+    results = asyncio.run(client.route_analysis(SYSTEM, PROMPT))
+    assert calls == ["gemini"] and list(results) == ["lmstudio", "gemini", "anthropic"]
+    assert [r["status"] for r in results.values()] == ["skipped", "success", "skipped"]
+
+
+if __name__ == '__main__':
+    print("🧪 Testing ProviderRouter")
+    print("=" * 50)
+    test_ewma_ranking()
+    test_unhealthy_ranks_last_until_probe()
+    test_hedge_delay()
+    test_record_slow()
+    test_route_hedges_a_slow_primary()
+    test_route_fails_over_on_error()
+    test_route_prefers_the_fastest_provider()
+    print("✅ ProviderRouter tests passed")
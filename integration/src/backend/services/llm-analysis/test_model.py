@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Test script for FaultDetectionModel
+Checks the fast scoring paths against the textbook PCA formulas
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from model import MODEL_FORMAT_VERSION, FaultDetectionModel, RecursivePCA, RingBuffer, training_key
+
+FEATURES = [f"x{i}" for i in range(8)]
+
+
+def training_data(n=500, seed=0):
+    """Correlated synthetic data (3 latent factors + noise) with non-unit scales and offsets"""
+    rng = np.random.default_rng(seed)
+    latent = rng.normal(size=(n, 3))
+    mixing = np.random.default_rng(0).normal(size=(3, len(FEATURES)))  # same process for every seed
+    X = latent @ mixing + 0.3 * rng.normal(size=(n, len(FEATURES)))
+    return pd.DataFrame(X * np.arange(1, 9) + 100 * np.arange(8), columns=FEATURES)
+
+
+def fitted_model(**kwargs):
+    # fit() writes backend/stats/features_mean_std.csv relative to the working directory
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            model = FaultDetectionModel(**kwargs)
+            model.fit(training_data())
+        finally:
+            os.chdir(cwd)
+    return model
+
+
+def naive_t2(model, X):
+    """T^2 = z P diag(1/lambda) P^T z^T on scaled values, one row at a time"""
+    out = []
+    for x in np.atleast_2d(X):
+        z = (x - model.scaler.mean_) / model.scaler.scale_
+        out.append(z @ model.P @ np.diag(model.lamda ** -1) @ model.P.T @ z)
+    return np.array(out)
+
+
+def test_t2_matches_formula():
+    """score(), calculate_t2_stat() and calculate_t2_batch() equal the unfused formula"""
+    model = fitted_model()
+    X = training_data(n=50, seed=1).to_numpy() + np.linspace(0, 20, 50)[:, None]
+    expected = naive_t2(model, X)
+
+    assert np.allclose(model.score(X), expected, rtol=1e-9)
+    assert np.allclose(model.calculate_t2_batch(pd.DataFrame(X, columns=FEATURES)), expected, rtol=1e-9)
+    assert np.isclose(model.score(X[7]), expected[7], rtol=1e-9) and isinstance(model.score(X[7]), float)
+    assert np.isclose(model.calculate_t2_stat(pd.DataFrame(X[:1], columns=FEATURES)), expected[0], rtol=1e-9)
+    print(f"T² max rel. error: {np.max(np.abs(model.score(X) - expected) / expected):.2e}")
+
+
+def test_process_data_point_flags():
+    """process_data_point returns the same T² and flag as the batch path"""
+    model = fitted_model()
+    X = training_data(n=20, seed=2).to_numpy(copy=True)
+    X[10:] += 40 * np.arange(1, 9)  # push the second half out of control
+    t2_batch = model.score(X)
+    for x, t2_expected in zip(X, t2_batch):
+        t2_stat, anomaly = model.process_data_point(pd.DataFrame([x], columns=FEATURES))
+        assert np.isclose(t2_stat, t2_expected) and anomaly == (t2_expected > model.t2_threshold)
+    assert model.score(X[10:]).min() > model.t2_threshold
+
+
+def naive_t2_contrib(model, x):
+    """Per-feature loop of the original t2_contrib"""
+    z = (x - model.scaler.mean_) / model.scaler.scale_
+    t = z.T @ model.P
+    return np.array([np.maximum((t / model.lamda) * model.P[j, :] * z[j], 0).sum() for j in range(len(z))])
+
+
+def test_t2_contrib_matches_loop():
+    """t2_contrib_batch, t2_contrib and t2_contrib_window equal the per-feature loop"""
+    model = fitted_model()
+    X = training_data(n=12, seed=4).to_numpy()
+    expected = np.array([naive_t2_contrib(model, x) for x in X])
+
+    assert np.allclose(model.t2_contrib_batch(X), expected, rtol=1e-9)
+    model.process_batch(pd.DataFrame(X, columns=FEATURES))
+    assert np.allclose(model.t2_contrib(-1), expected[-1], rtol=1e-9)
+    assert np.allclose(model.t2_contrib_window(5), expected[-5:], rtol=1e-9)
+    assert (model.t2_contrib_batch(X) >= 0).all()
+
+
+def test_spe_and_phi_match_formula():
+    """SPE = ||z (I - P P^T)||^2 and phi = T^2/T2_lim + SPE/SPE_lim"""
+    model = fitted_model()
+    X = training_data(n=30, seed=5).to_numpy()
+    Z = (X - model.scaler.mean_) / model.scaler.scale_
+    residual = Z - Z @ model.P @ model.P.T
+    spe_expected = (residual ** 2).sum(axis=1)
+
+    t2_stat, spe, phi = model.score_stats(X)
+    assert np.allclose(spe, spe_expected, rtol=1e-9, atol=1e-12)
+    assert np.allclose(phi, t2_stat / model.t2_threshold + spe / model.spe_threshold)
+    assert isinstance(model.score_stats(X[0])[1], float)
+
+
+def test_thresholds():
+    """Control limits hold roughly alpha false alarms on fresh normal data"""
+    model = fitted_model(alpha=0.01)
+    assert model.t2_threshold > 0 and model.spe_threshold > 0 and model.phi_threshold > 0
+    X = training_data(n=5000, seed=6).to_numpy()
+    t2_stat, spe, phi = model.score_stats(X)
+    rates = {name: float(np.mean(stat > limit)) for name, stat, limit in
+             [("t2", t2_stat, model.t2_threshold), ("spe", spe, model.spe_threshold), ("phi", phi, model.phi_threshold)]}
+    print(f"false alarm rates at alpha=0.01: {rates}")
+    assert all(rate < 0.05 for rate in rates.values())
+
+    # a looser alpha gives lower T² and SPE limits (phi is relative to them, so not compared)
+    loose = fitted_model(alpha=0.1)
+    assert loose.t2_threshold < model.t2_threshold and loose.spe_threshold < model.spe_threshold
+
+    # with every component kept there is no residual space
+    full = fitted_model(n_components=len(FEATURES))
+    assert np.isinf(full.spe_threshold)
+    assert np.allclose(full.score_stats(X[:5])[1], 0, atol=1e-9)
+
+
+def test_monitor_statistic():
+    """The monitor option picks which statistic raises the anomaly flag"""
+    model = fitted_model()
+    t2_stat = np.array([0.0, 2 * model.t2_threshold, 0.0])
+    spe = np.array([0.0, 0.0, 2 * model.spe_threshold])
+    phi = t2_stat / model.t2_threshold + spe / model.spe_threshold
+    for monitor, expected in [("t2", [False, True, False]), ("spe", [False, False, True]),
+                              ("phi", [False, phi[1] > model.phi_threshold, phi[2] > model.phi_threshold]),
+                              ("t2_or_spe", [False, True, True])]:
+        model.monitor = monitor
+        assert list(model.flag(t2_stat, spe, phi)) == expected
+
+
+def test_process_files_in_folder():
+    """Whole-file and streaming modes write the same scores and leave the live state alone"""
+    model = fitted_model()
+    faults = []
+    model.register_fault_callback(faults.append)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "in")
+        os.makedirs(src)
+        for k in range(3):
+            df = training_data(n=60, seed=10 + k)
+            df.iloc[30:] += 40 * np.arange(1, 9)  # fault half-way through
+            df.insert(0, "time", np.arange(60))
+            df.to_csv(os.path.join(src, f"fault{k}.csv"), index=False)
+
+        outputs = {}
+        for mode, kwargs in [("whole", {}), ("chunked", {"chunksize": 7, "max_workers": 1}),
+                             ("pool", {"chunksize": 25, "max_workers": 2})]:
+            out = os.path.join(tmp, mode)
+            os.makedirs(out)
+            results = model.process_files_in_folder(src, out, **kwargs)
+            assert [rows for _, rows in results] == [60, 60, 60]
+            outputs[mode] = [pd.read_csv(path) for path, _ in results]
+
+    for whole, chunked, pool in zip(*outputs.values()):
+        assert list(whole.columns[:1]) == ["time"] and "t2_stat" in whole.columns and "anomaly" in whole.columns
+        pd.testing.assert_frame_equal(whole, chunked)
+        pd.testing.assert_frame_equal(whole, pool)
+        assert np.allclose(whole["t2_stat"], model.score(whole[FEATURES].to_numpy()))
+        assert whole["anomaly"].iloc[30:].all()
+    assert len(model.data_buffer) == 0 and faults == []
+
+
+def test_score_frame_chunks_contributions():
+    """Contributions computed chunk by chunk match a single pass over the frame"""
+    model = fitted_model()
+    df = training_data(n=23, seed=4)
+    contrib = model.t2_contrib_batch(df[FEATURES].to_numpy())
+    for chunksize in (1, 5, 23, 100):
+        scored = model.score_frame(df, chunksize=chunksize)
+        assert np.allclose(scored[[f"t2_{f}" for f in FEATURES]].to_numpy(), contrib)
+    assert len(model.score_frame(df.iloc[:0])) == 0
+
+
+def test_save_and_load():
+    """A saved model loads without refitting and scores identically"""
+    model = fitted_model(alpha=0.05)
+    X = training_data(n=20, seed=7).to_numpy()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = model.save(os.path.join(tmp, "models", "pca_test.npz"), key="test")
+        loaded = FaultDetectionModel.load(path, buffer_size=32, monitor="spe")
+
+        assert loaded.feature_names == model.feature_names and loaded.a == model.a
+        assert (loaded.t2_threshold, loaded.spe_threshold, loaded.phi_threshold) == \
+            (model.t2_threshold, model.spe_threshold, model.phi_threshold)
+        for a, b in zip(loaded.score_stats(X), model.score_stats(X)):
+            assert np.allclose(a, b, rtol=1e-12)
+        assert loaded.monitor == "spe" and loaded.data_buffer.capacity == 32
+
+        # artifacts of another format version are refused
+        with np.load(path) as f:
+            fields = dict(f)
+        fields["version"] = MODEL_FORMAT_VERSION + 1
+        np.savez(os.path.join(tmp, "old.npz"), **fields)
+        try:
+            FaultDetectionModel.load(os.path.join(tmp, "old.npz"))
+            assert False, "ValueError expected"
+        except ValueError:
+            pass
+
+
+def test_training_key():
+    """The artifact key changes with the training data, the feature order and the fit parameters"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fault0.csv")
+        training_data(n=50).to_csv(path, index=False)
+        key = training_key(path, FEATURES, n_components=0.9, alpha=0.01)
+        assert key == training_key(path, FEATURES, alpha=0.01, n_components=0.9)
+        assert key != training_key(path, FEATURES[::-1], n_components=0.9, alpha=0.01)
+        assert key != training_key(path, FEATURES, n_components=0.9, alpha=0.05)
+        training_data(n=51).to_csv(path, index=False)
+        assert key != training_key(path, FEATURES, n_components=0.9, alpha=0.01)
+
+
+def test_ring_buffer():
+    """The ring buffer keeps the newest `capacity` samples with absolute indices"""
+    buf = RingBuffer(["a", "b"], capacity=4)
+    for i in range(3):
+        buf.append([i, -i], float(i), i % 2 == 1)
+    assert len(buf) == 3 and buf.start == 0
+    assert list(buf.row(-1)) == [2, -2]
+
+    buf.extend(np.array([[i, -i] for i in range(3, 9)]), np.arange(3, 9, dtype=float), np.arange(3, 9) % 2 == 1)
+    values, t2_stat, anomaly = buf.window()
+    print(f"after 9 samples: start={buf.start} t2={t2_stat.tolist()}")
+    assert len(buf) == 4 and buf.start == 5
+    assert list(t2_stat) == [5, 6, 7, 8] and list(values[:, 0]) == [5, 6, 7, 8]
+    assert list(anomaly) == [True, False, True, False]
+    assert list(buf.window(2)[1]) == [7, 8]
+    assert list(buf.row(6)) == [6, -6]
+    for index in (4, 9):
+        try:
+            buf.row(index)
+            assert False, "IndexError expected"
+        except IndexError:
+            pass
+
+    # an extend longer than the capacity keeps only its tail
+    buf.extend(np.zeros((10, 2)) + np.arange(10)[:, None], np.arange(10, dtype=float), np.zeros(10, dtype=bool))
+    assert list(buf.window()[1]) == [6, 7, 8, 9] and buf.count == 19
+
+    buf.clear()
+    assert len(buf) == 0 and buf.window()[0].shape == (0, 2)
+
+
+def test_data_buffer_bounded():
+    """process_data_point and process_batch record into a buffer of buffer_size samples"""
+    model = fitted_model(buffer_size=16)
+    X = training_data(n=40, seed=3)
+    model.process_batch(X.iloc[:30])
+    for i in range(30, 40):
+        model.process_data_point(X.iloc[[i]].copy())
+    values, t2_stat, _ = model.data_buffer.window()
+    assert len(model.data_buffer) == 16 and model.data_buffer.count == 40
+    assert np.allclose(values, X.to_numpy()[-16:])
+    assert np.allclose(t2_stat, model.score(X.to_numpy()[-16:]))
+
+
+def wait_for_refresh(rpca, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        model = rpca.take()
+        if model is not None:
+            return model
+        time.sleep(0.01)
+    raise AssertionError("no refreshed model")
+
+
+def test_recursive_pca_update():
+    """update() is an exponentially weighted mean and covariance"""
+    model = fitted_model()
+    rpca = RecursivePCA(model, forgetting=0.9, refresh_every=10 ** 6)
+    mean = model.scaler.mean_.copy()
+    cov = model.cov_z * np.outer(model.scaler.scale_, model.scaler.scale_)
+    for x in training_data(n=25, seed=8).to_numpy():
+        rpca.update(x)
+        mean = 0.9 * mean + 0.1 * x
+        cov = 0.9 * cov + 0.1 * np.outer(x - mean, x - mean)
+    assert np.allclose(rpca.mean, mean) and np.allclose(rpca.cov, cov)
+    assert rpca.accepted == 25 and rpca.take() is None
+    rpca.close()
+
+
+def test_recursive_pca_follows_drift():
+    """A refreshed model re-centres on drifted normal data; the live model is untouched until take()"""
+    model = fitted_model()
+    model.monitor = "t2_or_spe"
+    rpca = RecursivePCA(model, forgetting=0.98, refresh_every=400)
+    drift = 3 * model.scaler.scale_
+    X = training_data(n=400, seed=9).to_numpy() + drift
+    before = float(np.mean(model.score(X[-100:]) > model.t2_threshold))
+    mean_before = model.scaler.mean_.copy()
+
+    rpca.update_batch(X)
+    refreshed = wait_for_refresh(rpca)
+    after = float(np.mean(refreshed.score(X[-100:]) > refreshed.t2_threshold))
+    print(f"T² alarm rate on drifted normal data: {before:.2f} -> {after:.2f}")
+    assert after < 0.1 < before
+    assert np.array_equal(model.scaler.mean_, mean_before)
+    assert refreshed is rpca.model and refreshed is not model
+    assert refreshed.monitor == "t2_or_spe" and refreshed.a == model.a
+    assert refreshed.data_buffer is model.data_buffer
+    assert rpca.stats()["refreshes"] == 1 and not rpca.stats()["rebuilding"]
+    rpca.close()
+
+
+if __name__ == '__main__':
+    print("🧪 Testing FaultDetectionModel")
+    print("=" * 50)
+    test_t2_matches_formula()
+    test_process_data_point_flags()
+    test_t2_contrib_matches_loop()
+    test_spe_and_phi_match_formula()
+    test_thresholds()
+    test_monitor_statistic()
+    test_process_files_in_folder()
+    test_score_frame_chunks_contributions()
+    test_save_and_load()
+    test_training_key()
+    test_ring_buffer()
+    test_data_buffer_bounded()
+    test_recursive_pca_update()
+    test_recursive_pca_follows_drift()
+    print("✅ FaultDetectionModel tests passed")
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Test script for MultiLLMClient
+Checks the concurrent provider fan-out, the per-provider executors (sync and native async)
+and token streaming with fake providers, without network calls
+"""
+
+import asyncio
+import time
+
+from multi_llm_client import MultiLLMClient, ProviderExecutor
+
+SYSTEM = "You are a process engineer."
+PROMPT = "1. Reactor Pressure: Fault=2790.000 | Normal=2705.000 | Δ=85.000 (3.14%) | z=4.20"
+
+
+def make_client(timeout_seconds=5.0, **extra):
+    config = {
+        "models": {
+            "lmstudio": {"enabled": True, "base_url": "http://localhost:1234/v1", "api_key": "lm-studio",
+                         "model_name": "local", "timeout_seconds": timeout_seconds},
+            "gemini": {"enabled": True, "api_key": "test", "model_name": "gemini-test",
+                       "timeout_seconds": timeout_seconds},
+            "anthropic": {"enabled": True, "api_key": "test", "model_name": "claude-test",
+                          "timeout_seconds": timeout_seconds},
+        },
+        **extra,
+    }
+    return MultiLLMClient(config)
+
+
+def fake_providers(client, behaviour):
+    """Replace the provider calls: behaviour[name] = (delay seconds, answer or exception)"""
+    calls = []
+
+    async def query(model_name, system_message, user_prompt):
+        calls.append(model_name)
+        delay, answer = behaviour[model_name]
+        await asyncio.sleep(delay)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    client._query_model = query
+    return calls
+
+
+def test_fan_out_is_concurrent():
+    """All providers are queried at once: the wall time is the slowest call, not the sum"""
+    client = make_client()
+    fake_providers(client, {"lmstudio": (0.3, "local"), "gemini": (0.3, "gemini"), "anthropic": (0.3, "claude")})
+    reported = []
+    start = time.time()
+    results = asyncio.run(client.get_analysis_from_all_models(
+        SYSTEM, PROMPT, on_result=lambda name, result: reported.append(name)))
+    elapsed = time.time() - start
+    print(f"3 x 0.3 s providers answered in {elapsed:.2f} s")
+    assert elapsed < 0.6
+    assert list(results) == ["lmstudio", "gemini", "anthropic"]  # configured order
+    assert all(r["status"] == "success" for r in results.values())
+    assert sorted(reported) == sorted(results)
+
+
+def test_timeout_and_error_are_per_provider():
+    """A slow or failing provider does not hold up or break the others"""
+    client = make_client(timeout_seconds=0.3)
+    fake_providers(client, {"lmstudio": (5.0, "late"), "gemini": (0.05, RuntimeError("quota")),
+                            "anthropic": (0.05, "claude")})
+    start = time.time()
+    results = asyncio.run(client.get_analysis_from_all_models(SYSTEM, PROMPT))
+    assert time.time() - start < 1.0
+    assert results["lmstudio"]["status"] == "timeout"
+    assert results["gemini"]["status"] == "error" and "quota" in results["gemini"]["response"]
+    assert results["anthropic"]["status"] == "success" and results["anthropic"]["response"] == "claude"
+
+
+def test_first_n_skips_the_rest():
+    """With first_n the remaining providers are cancelled once enough have answered"""
+    client = make_client()
+    fake_providers(client, {"lmstudio": (2.0, "local"), "gemini": (0.05, "gemini"), "anthropic": (2.0, "claude")})
+    start = time.time()
+    results = asyncio.run(client.get_analysis_from_all_models(SYSTEM, PROMPT, first_n=1))
+    assert time.time() - start < 1.0
+    assert results["gemini"]["status"] == "success"
+    assert results["lmstudio"]["status"] == results["anthropic"]["status"] == "skipped"
+
+
+def test_stop_cancels_inflight_providers():
+    """stop_all_tasks() cancels the provider calls of a running fan-out"""
+    client = make_client()
+    fake_providers(client, {"lmstudio": (5.0, "x"), "gemini": (5.0, "y"), "anthropic": (5.0, "z")})
+
+    async def main():
+        analysis = asyncio.ensure_future(client.get_analysis_from_all_models(SYSTEM, PROMPT))
+        await asyncio.sleep(0.1)
+        stopped = client.stop_all_tasks()
+        return stopped, await asyncio.wait_for(analysis, timeout=1.0)
+
+    stopped, results = asyncio.run(main())
+    assert stopped["cancelled_provider_tasks"] == 3
+    assert all(r["status"] == "cancelled" for r in results.values())
+
+
+def test_executor_bounds_blocking_calls():
+    """A provider pool runs at most max_workers blocking calls and refuses calls past max_queue"""
+    async def main():
+        executor = ProviderExecutor("slow", max_workers=2, max_queue=3)
+        start = time.time()
+        calls = [asyncio.ensure_future(executor.run(lambda: time.sleep(0.2) or "ok")) for _ in range(2)]
+        await asyncio.sleep(0.05)  # both workers busy
+        calls += [asyncio.ensure_future(executor.run(lambda: time.sleep(0.2) or "ok")) for _ in range(4)]
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        elapsed = time.time() - start
+        stats = executor.stats()
+        executor.shutdown()
+        return results, elapsed, stats
+
+    results, elapsed, stats = asyncio.run(main())
+    rejected = [r for r in results if isinstance(r, RuntimeError)]
+    print(f"6 calls on 2 workers / 3 queue slots: {len(rejected)} rejected, {elapsed:.2f} s")
+    assert len(rejected) == 1 and results.count("ok") == 5
+    assert 0.55 < elapsed < 1.0  # three waves of at most two calls
+    assert stats["completed"] == 5 and stats["rejected"] == 1 and stats["queued"] == stats["running"] == 0
+    assert stats["wait_max_s"] > 0.2
+
+
+def test_executors_are_isolated():
+    """A backlog on one provider does not delay another provider's calls"""
+    async def main():
+        slow = ProviderExecutor("slow", max_workers=1, max_queue=8)
+        fast = ProviderExecutor("fast", max_workers=1, max_queue=8)
+        backlog = [asyncio.ensure_future(slow.run(lambda: time.sleep(0.3))) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        start = time.time()
+        await fast.run(lambda: None)
+        fast_latency = time.time() - start
+        cancelled = slow.cancel_pending()
+        await asyncio.gather(*backlog, return_exceptions=True)
+        stats = slow.stats()
+        slow.shutdown()
+        fast.shutdown()
+        return fast_latency, cancelled, stats
+
+    fast_latency, cancelled, stats = asyncio.run(main())
+    assert fast_latency < 0.1
+    assert cancelled == 2 and stats["cancelled"] == 2 and stats["completed"] == 1 and stats["queued"] == 0
+
+
+def test_native_async_calls_share_the_bound():
+    """run_async() keeps native async calls on the loop under the same max_workers limit"""
+    async def main():
+        executor = ProviderExecutor("async", max_workers=2, max_queue=8)
+        active, peak = 0, 0
+
+        async def call():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.1)
+            active -= 1
+            return "ok"
+
+        start = time.time()
+        results = await asyncio.gather(*(executor.run_async(call) for _ in range(4)))
+        elapsed = time.time() - start
+
+        slow = asyncio.ensure_future(executor.run_async(lambda: asyncio.sleep(5)))
+        await asyncio.sleep(0.01)
+        slow.cancel()
+        await asyncio.gather(slow, return_exceptions=True)
+        return results, peak, elapsed, executor.stats()
+
+    results, peak, elapsed, stats = asyncio.run(main())
+    assert results == ["ok"] * 4 and peak == 2 and 0.18 < elapsed < 0.5
+    assert stats["completed"] == 4 and stats["cancelled"] == 1 and stats["running"] == stats["queued"] == 0
+
+
+def test_call_prefers_the_async_client():
+    """_call() awaits the native async client when there is one, else uses the thread pool"""
+    client = make_client()
+
+    async def main():
+        used = []
+        client.async_clients["lmstudio"] = object()
+        client.async_clients.pop("gemini", None)
+
+        async def async_fn():
+            used.append("async")
+            return "async"
+
+        def sync_fn():
+            used.append("sync")
+            return "sync"
+
+        first = await client._call("lmstudio", sync_fn, async_fn)
+        second = await client._call("gemini", sync_fn, async_fn)
+        await client.aclose()
+        return first, second, used
+
+    first, second, used = asyncio.run(main())
+    assert (first, second) == ("async", "sync") and used == ["async", "sync"]
+    assert client.provider_stats()["lmstudio"]["completed"] == 1
+    assert client.provider_stats()["gemini"]["completed"] == 1
+
+
+def fake_streams(client, chunks, delay=0.05):
+    """Replace the provider streams: chunks[name] = list of text pieces, one every `delay` seconds"""
+    cancelled = []
+
+    async def stream(model_name, system_message, user_prompt, on_token):
+        try:
+            for piece in chunks[model_name]:
+                await asyncio.sleep(delay)
+                on_token(piece)
+            return "".join(chunks[model_name])
+        except asyncio.CancelledError:
+            cancelled.append(model_name)
+            raise
+
+    client._stream_model = stream
+    return cancelled
+
+
+def test_stream_multiplexes_tokens():
+    """Tokens of all providers arrive interleaved, in order per provider, then one result each"""
+    client = make_client()
+    fake_streams(client, {"lmstudio": ["a", "b", "c"], "gemini": ["x", "y"], "anthropic": ["1"]})
+
+    async def main():
+        return [event async for event in client.stream_analysis_from_all_models(SYSTEM, PROMPT)]
+
+    events = asyncio.run(main())
+    tokens = [e for e in events if e["event"] == "token"]
+    results = {e["model"]: e for e in events if e["event"] == "result"}
+    print(f"{len(tokens)} tokens, order: {[e['model'][0] for e in tokens]}")
+    assert {e["model"] for e in tokens[:3]} == {"lmstudio", "gemini", "anthropic"}  # interleaved
+    for name, text in [("lmstudio", "abc"), ("gemini", "xy"), ("anthropic", "1")]:
+        mine = [e for e in tokens if e["model"] == name]
+        assert [e["index"] for e in mine] == list(range(len(mine)))
+        assert "".join(e["content"] for e in mine) == text
+        assert results[name]["status"] == "success" and results[name]["response"] == text
+    assert events[-1]["event"] == "result"
+
+
+def test_closing_the_stream_cancels_providers():
+    """A client that disconnects (generator closed) cancels the providers still streaming"""
+    client = make_client()
+    cancelled = fake_streams(client, {"lmstudio": ["a"] * 50, "gemini": ["x"] * 50, "anthropic": ["1"] * 50})
+
+    async def main():
+        stream = client.stream_analysis_from_all_models(SYSTEM, PROMPT)
+        async for event in stream:
+            if event["event"] == "token":
+                break
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        return len(client._inflight)
+
+    inflight = asyncio.run(main())
+    assert sorted(cancelled) == ["anthropic", "gemini", "lmstudio"] and inflight == 0
+
+
+if __name__ == '__main__':
+    print("🧪 Testing MultiLLMClient")
+    print("=" * 50)
+    test_fan_out_is_concurrent()
+    test_timeout_and_error_are_per_provider()
+    test_first_n_skips_the_rest()
+    test_stop_cancels_inflight_providers()
+    test_executor_bounds_blocking_calls()
+    test_executors_are_isolated()
+    test_native_async_calls_share_the_bound()
+    test_call_prefers_the_async_client()
+    test_stream_multiplexes_tokens()
+    test_closing_the_stream_cancels_providers()
+    print("✅ MultiLLMClient tests passed")
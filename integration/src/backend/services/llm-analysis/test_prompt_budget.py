@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test script for prompt_budget
+Checks whitespace compaction and that PromptBudget trims the lowest-ranked features first
+"""
+
+from prompt_budget import PromptBudget, compact_prompt, count_tokens
+from prompts import EXPLAIN_PROMPT, SYSTEM_MESSAGE
+
+HEADER = "Top 6 Contributing Features (Fault vs Normal):"
+
+
+def comparison(n):
+    lines = [HEADER]
+    for i in range(1, n + 1):
+        lines.append(f"{i}. Feature {i}: Fault={100 + i:.3f} | Normal=100.000 | Δ={i:.3f} ({i:.2f}%) | z={10 - i:.2f}")
+    return "\n".join(lines)
+
+
+def test_compact_prompt():
+    """Runs of spaces and blank lines collapse; line structure is kept"""
+    text = "  Heading  \n\n\n\n- item   one\t\there  \n- item two\n\n"
+    assert compact_prompt(text) == "Heading\n\n- item one here\n- item two"
+    compacted = compact_prompt(f"{SYSTEM_MESSAGE}\n\n{EXPLAIN_PROMPT}")
+    assert compacted == compact_prompt(compacted)  # idempotent
+    assert compacted.count("\n") > 5
+    print(f"system prompt: {count_tokens(SYSTEM_MESSAGE + EXPLAIN_PROMPT)} -> {count_tokens(compacted)} tokens")
+
+
+def test_prompt_within_budget_is_untouched():
+    budget = PromptBudget(max_input_tokens=10000)
+    prompt = comparison(6)
+    assert budget.fit("system", prompt) == prompt
+    assert budget.stats()["calls"] == 1 and budget.stats()["trimmed"] == 0
+
+
+def test_trims_lowest_ranked_features_first():
+    """Over budget, feature lines are dropped from the bottom, keeping min_features and the header"""
+    system = "system " * 50
+    prompt = comparison(6)
+    budget_tokens = count_tokens(system) + count_tokens(comparison(4)) + 1
+    budget = PromptBudget(max_input_tokens=budget_tokens, min_features=3)
+    trimmed = budget.fit(system, prompt)
+    print(f"{count_tokens(prompt)} -> {count_tokens(trimmed)} tokens")
+    assert trimmed == comparison(4)
+    assert count_tokens(system) + count_tokens(trimmed) <= budget_tokens
+    assert budget.stats()["trimmed"] == 1
+
+    # min_features is kept even if that is still over budget; then lines are cut from the end
+    tight = PromptBudget(max_input_tokens=count_tokens(system) + count_tokens(HEADER) + 2, min_features=3)
+    cut = tight.fit(system, prompt)
+    assert cut.startswith(HEADER) and cut.count("\n") < 3
+
+
+def test_stats():
+    budget = PromptBudget(max_input_tokens=6000)
+    for _ in range(3):
+        budget.fit("system message", comparison(6))
+    stats = budget.stats()
+    assert stats["calls"] == 3 and stats["max_input_tokens"] == 6000
+    assert stats["avg_input_tokens"] == count_tokens("system message") + count_tokens(comparison(6))
+    assert stats["tokenizer"] in ("tiktoken", "chars/4")
+
+
+if __name__ == '__main__':
+    print("🧪 Testing prompt_budget")
+    print("=" * 50)
+    test_compact_prompt()
+    test_prompt_within_budget_is_untouched()
+    test_trims_lowest_ranked_features_first()
+    test_stats()
+    print("✅ prompt_budget tests passed")
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Test script for IngestSender
+Checks the queue policies and that a partially failed post re-sends only the unsent points,
+keeping the ones the policy prefers when the queue is full
+"""
+
+import time
+
+from unified_tep_control_panel import IngestSender
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None):
+        self.status_code = status_code
+        self.payload = payload or {}
+        self.text = str(self.payload)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Records received points; raises once on the point whose 'id' is in fail_ids
+    and answers 422 for points whose 'id' is in reject_ids"""
+
+    def __init__(self, batch_status=404, fail_ids=(), reject_ids=()):
+        self.batch_status = batch_status
+        self.fail_ids = set(fail_ids)
+        self.reject_ids = set(reject_ids)
+        self.received = []
+        self.batch_posts = 0
+
+    def post(self, url, json=None, timeout=None):
+        if url.endswith('/batch'):
+            self.batch_posts += 1
+            if self.reject_ids & {p['id'] for p in json['data_points']}:
+                return FakeResponse(422)
+            if self.batch_status != 200:
+                return FakeResponse(self.batch_status)
+            self.received.extend(p['id'] for p in json['data_points'])
+            return FakeResponse(200, {'results': [{'id': p['id']} for p in json['data_points']]})
+        point = json['data_point']
+        if point['id'] in self.reject_ids:
+            return FakeResponse(422)
+        if point['id'] in self.fail_ids:
+            self.fail_ids.discard(point['id'])
+            raise ConnectionError("backend went away")
+        self.received.append(point['id'])
+        return FakeResponse(200, {'id': point['id']})
+
+
+def make_sender(session, **kwargs):
+    sender = IngestSender(**kwargs)
+    sender.session = session
+    return sender
+
+
+def test_drop_policies():
+    """A full queue drops the oldest or the newest point and never merges points"""
+    for policy, expected in (('drop_oldest', [1, 2]), ('drop_newest', [0, 1])):
+        sender = make_sender(FakeSession(), max_queue=2, policy=policy)
+        sender._ensure_thread = lambda: None  # keep the points queued
+        for i in range(3):
+            sender.submit({'id': i})
+        print(f"{policy}: {list(sender.queue)}")
+        assert [p['id'] for p in sender.queue] == expected
+        assert sender.stats()['dropped_points'] == 1
+
+    try:
+        IngestSender(policy='coalesce')
+        assert False, "coalesce should no longer be accepted"
+    except ValueError:
+        pass
+
+
+def test_post_reports_partial_progress():
+    """The per-point fallback stops at the first failure and reports what was received"""
+    session = FakeSession(fail_ids={2})
+    sender = make_sender(session)
+    sent, results, error = sender._post([{'id': i} for i in range(4)])
+    print(f"sent={sent} error={error!r}")
+    assert sent == 2 and [r['id'] for r in results] == [0, 1]
+    assert error is not None
+    assert sender.batch_supported is False
+
+
+def test_partial_failure_requeues_unsent_tail():
+    """After a failure on point k the backend still receives every point exactly once"""
+    session = FakeSession(fail_ids={2})
+    seen = []
+    sender = make_sender(session, max_batch=4, on_result=lambda info, dt: seen.append(info))
+    for i in range(4):
+        sender.submit({'id': i})
+
+    deadline = time.time() + 5
+    while sender.sent_points < 4 and time.time() < deadline:
+        time.sleep(0.05)
+
+    print(f"received: {session.received}")
+    assert session.received == [0, 1, 2, 3]
+    assert sender.stats()['failed_batches'] == 1
+    assert [info['id'] for info in seen if 'id' in info] == [0, 1, 2, 3]
+
+
+def test_requeue_respects_policy_when_full():
+    """Unsent points that no longer fit are trimmed by the policy and counted as dropped"""
+    for policy, expected in (('drop_oldest', [2, 3, 10]), ('drop_newest', [0, 1, 10])):
+        sender = make_sender(FakeSession(), max_queue=3, policy=policy)
+        sender._ensure_thread = lambda: None
+        sender.submit({'id': 10})
+        sender._requeue([{'id': i} for i in range(4)])
+        print(f"{policy}: {[p['id'] for p in sender.queue]}")
+        assert [p['id'] for p in sender.queue] == expected
+        assert sender.stats()['dropped_points'] == 2
+
+    sender = make_sender(FakeSession(), max_queue=2)
+    sender._ensure_thread = lambda: None
+    sender.submit({'id': 10})
+    sender.submit({'id': 11})
+    sender._requeue([{'id': 0}])
+    assert [p['id'] for p in sender.queue] == [10, 11] and sender.dropped == 1
+
+
+def test_rejected_batch_is_not_retried():
+    """A 4xx on /ingest/batch falls back to per-point posts; only the bad point fails"""
+    session = FakeSession(batch_status=200, reject_ids={1})
+    sender = make_sender(session)
+    sent, results, error = sender._post([{'id': i} for i in range(3)])
+    print(f"received: {session.received} results: {results}")
+    assert (sent, error) == (3, None)
+    assert session.received == [0, 2] and results[1]['status'] == 'http_error'
+    assert sender.batch_supported
+
+
+def test_server_errors_retry_then_drop():
+    """5xx batches are requeued, but at most max_retries times in a row"""
+    session = FakeSession(batch_status=503)
+    sender = make_sender(session, max_retries=2)
+    sent, _, error = sender._post([{'id': 0}, {'id': 1}])
+    assert sent == 0 and error is not None and sender.batch_supported
+
+    sender.queue.extend({'id': i} for i in range(2))  # one batch of two
+    sender._ensure_thread()
+    deadline = time.time() + 10  # backoff 0.5 s, then 1 s
+    while sender.dropped < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    print(f"batch posts: {session.batch_posts} stats: {sender.stats()}")
+    assert session.batch_posts == 1 + 3  # the direct call, then the first try and two retries
+    assert sender.stats()['dropped_points'] == 2 and not sender.queue
+
+
+def test_batch_endpoint():
+    """Backends with /ingest/batch get one request per batch"""
+    session = FakeSession(batch_status=200)
+    sender = make_sender(session)
+    sent, results, error = sender._post([{'id': i} for i in range(3)])
+    assert (sent, error) == (3, None)
+    assert session.received == [0, 1, 2] and sender.batch_supported
+
+
+if __name__ == '__main__':
+    print("🧪 Testing IngestSender")
+    print("=" * 50)
+    test_drop_policies()
+    test_post_reports_partial_progress()
+    test_partial_failure_requeues_unsent_tail()
+    test_requeue_respects_policy_when_full()
+    test_rejected_batch_is_not_retried()
+    test_server_errors_retry_then_drop()
+    test_batch_endpoint()
+    print("✅ IngestSender tests passed")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for PlantClock
+Checks deadline scheduling, catch-up batches, accelerated plant time and clock slip when the loop falls far behind
+"""
+
+import time
+
+from unified_tep_control_panel import PlantClock
+
+
+def behind(clock, seconds):
+    """Pretend the schedule started `seconds` ago"""
+    clock.anchor = time.monotonic() - seconds
+
+
+def test_on_schedule():
+    """A loop that keeps up simulates one sample per deadline"""
+    clock = PlantClock(interval=60)
+    assert clock.due() == 1
+    clock.record(1, 0.01)
+    assert abs(clock.next_deadline() - clock.anchor - 60) < 1e-6
+    assert clock.plant_seconds == PlantClock.SAMPLE_SECONDS
+
+
+def test_catch_up_batch():
+    """Overdue samples are simulated together, up to max_batch"""
+    clock = PlantClock(interval=10, max_batch=10)
+    behind(clock, 45)  # deadlines at 0, 10, 20, 30, 40 have passed
+    n = clock.due()
+    print(f"overdue after 45 s at 10 s/sample: {n}")
+    assert n == 5
+    clock.record(n, 0.05)
+    assert clock.stats()['catch_up_batches'] == 1
+    assert clock.next_deadline() > time.monotonic()
+
+
+def test_accelerated_points_count_plant_time():
+    """Points covering several plant samples advance plant time and the mode by that stride"""
+    clock = PlantClock(interval=18)
+    clock.record(2, 0.01, plant_samples=20)
+    assert abs(clock.next_deadline() - clock.anchor - 36) < 1e-6  # deadlines still count points
+    assert clock.samples == 20 and clock.plant_seconds == 20 * PlantClock.SAMPLE_SECONDS
+    stats = clock.stats()
+    print(f"mode={stats['mode']} samples_per_point={stats['samples_per_point']}")
+    assert stats['mode'] == '100x' and stats['samples_per_point'] == 10
+
+
+def test_slip_beyond_max_batch():
+    """Deadlines older than max_batch samples are skipped instead of piling up"""
+    clock = PlantClock(interval=1, max_batch=10)
+    behind(clock, 100.5)
+    n = clock.due()
+    print(f"due={n} skipped={clock.skipped}")
+    assert n == 10 and clock.skipped == 91
+    clock.record(n, 0.1)
+    assert clock.samples == 10
+    assert clock.due() == 1  # caught up: the next deadline is the current one
+
+
+def test_speed_change_restarts_schedule():
+    """set_interval re-anchors so a speed change does not create a backlog"""
+    clock = PlantClock(interval=180)
+    behind(clock, 1000)
+    clock.set_interval(1)
+    assert clock.due() == 1
+    clock.set_interval(-5)
+    assert clock.interval == 0 and clock.due() == 1
+
+
+def test_wait_stops_when_not_running():
+    """wait() returns False as soon as running() turns False"""
+    clock = PlantClock(interval=60)
+    clock.record(1, 0.0)
+    start = time.monotonic()
+    assert clock.wait(lambda: False) is False
+    assert time.monotonic() - start < 0.1
+
+    clock = PlantClock(interval=0.05)
+    clock.record(1, 0.0)
+    assert clock.wait(lambda: True) is True
+
+
+def test_reset():
+    """reset() clears counters and re-anchors"""
+    clock = PlantClock(interval=1)
+    behind(clock, 50)
+    clock.record(clock.due(), 0.1)
+    clock.reset()
+    assert (clock.samples, clock.skipped, clock.batches, clock.scheduled) == (0, 0, 0, 0)
+    assert clock.due() == 1
+
+
+if __name__ == '__main__':
+    print("🧪 Testing PlantClock")
+    print("=" * 50)
+    test_on_schedule()
+    test_catch_up_batch()
+    test_accelerated_points_count_plant_time()
+    test_slip_beyond_max_batch()
+    test_speed_change_restarts_schedule()
+    test_wait_stops_when_not_running()
+    test_reset()
+    print("✅ PlantClock tests passed")
@@ -46,6 +46,276 @@ def resolve_venv_python():
 def resolve_npm_cmd():
     return 'npm.cmd' if sys.platform.startswith('win') else 'npm'
 
+
+class PlantClock:
+    """Deadline scheduler that maps wall-clock time onto the virtual plant clock.
+
+    Point n is due at ``anchor + n * interval`` on the monotonic clock, so the
+    period does not drift with the step duration. ``interval`` is the wall time
+    per published point, which covers one or more 3-minute plant samples (see
+    ``record``): 180 s per single-sample point is real time, 180/N is N×
+    accelerated and 0 runs as fast as possible. When the loop falls behind, up
+    to ``max_batch`` overdue points are simulated in one call; older deadlines
+    are skipped (the plant clock slips) instead of piling up.
+    """
+
+    SAMPLE_SECONDS = 180  # plant time per TEP sample
+
+    def __init__(self, interval=180, max_batch=10):
+        self.interval = float(interval)
+        self.max_batch = max_batch
+        self.reset()
+
+    def reset(self):
+        self.anchor = time.monotonic()
+        self.scheduled = 0  # deadlines consumed since anchor
+        self.samples = 0  # plant samples simulated, i.e. plant time / 180 s
+        self.samples_per_point = 1  # plant samples per published point in the last call
+        self.skipped = 0
+        self.batches = 0
+        self.lateness = deque(maxlen=200)  # seconds past the deadline at step start
+        self.durations = deque(maxlen=200)  # seconds per simulated call
+
+    def set_interval(self, interval):
+        """Change speed; the new schedule starts now."""
+        interval = max(0.0, float(interval))
+        if interval != self.interval:
+            self.interval = interval
+            self.anchor = time.monotonic()
+            self.scheduled = 0
+
+    @property
+    def plant_seconds(self):
+        return self.samples * self.SAMPLE_SECONDS
+
+    def next_deadline(self):
+        return self.anchor + self.scheduled * self.interval
+
+    def wait(self, running, interval=None):
+        """Sleep until the next sample is due. Returns False if `running()` turns False.
+        `interval`, if given, is polled so speed changes apply while waiting."""
+        while running():
+            if interval is not None:
+                self.set_interval(interval())
+            remaining = self.next_deadline() - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, 0.5))
+        return False
+
+    def due(self):
+        """Number of samples to simulate now (at least 1, at most max_batch)."""
+        now = time.monotonic()
+        self.lateness.append(max(0.0, now - self.next_deadline()))
+        if self.interval <= 0:
+            return 1
+        overdue = int((now - self.anchor) // self.interval) + 1 - self.scheduled
+        if overdue > self.max_batch:
+            self.skipped += overdue - self.max_batch
+            self.scheduled += overdue - self.max_batch
+            overdue = self.max_batch
+        return max(1, overdue)
+
+    def record(self, n_points, duration, plant_samples=None):
+        """Account for `n_points` published points covering `plant_samples` plant samples
+        (default one each)."""
+        if plant_samples is None:
+            plant_samples = n_points
+        self.scheduled += n_points
+        self.samples += plant_samples
+        if n_points > 0:
+            self.samples_per_point = plant_samples / n_points
+        if n_points > 1:
+            self.batches += 1
+        self.durations.append(duration)
+
+    def stats(self):
+        lateness = np.array(self.lateness) if self.lateness else np.zeros(1)
+        durations = np.array(self.durations) if self.durations else np.zeros(1)
+        lag = time.monotonic() - self.next_deadline() if self.interval > 0 else 0.0
+        return {
+            'mode': 'as_fast_as_possible' if self.interval <= 0 else f'{self.SAMPLE_SECONDS * self.samples_per_point / self.interval:g}x',
+            'interval_seconds': self.interval,
+            'plant_seconds': self.plant_seconds,
+            'samples': self.samples,
+            'samples_per_point': self.samples_per_point,
+            'skipped_samples': self.skipped,
+            'catch_up_batches': self.batches,
+            'lag_seconds': round(max(0.0, lag), 3),
+            'lateness_ms_mean': round(float(lateness.mean()) * 1000, 2),
+            'jitter_ms': round(float(lateness.std()) * 1000, 2),
+            'step_ms_mean': round(float(durations.mean()) * 1000, 2),
+            'step_ms_max': round(float(durations.max()) * 1000, 2),
+        }
+
+class IngestSender:
+    """Background sender for /ingest so a slow backend never stalls the simulator.
+
+    Points go into a bounded queue and a worker thread posts them in batches
+    (POST /ingest/batch, falling back to one /ingest call per point on older
+    backends) over a pooled keep-alive session. When the queue is full the
+    policy decides what gives: 'drop_oldest' or 'drop_newest'. Points are
+    never merged, since the backend scores every point as a plant sample.
+    After a transport error or a 5xx the points the backend has not
+    acknowledged are queued again, up to `max_retries` times in a row before
+    they are dropped, so delivery is at-least-once: a batch whose response was
+    lost (e.g. a read timeout after the backend scored it) is sent again.
+    Any other 4xx on /ingest/batch is final; the batch is then posted point by
+    point so only the rejected points end up as 'http_error' results.
+    """
+
+    POLICIES = ('drop_oldest', 'drop_newest')
+
+    def __init__(self, url="http://localhost:8000/ingest", max_queue=256, max_batch=20,
+                 policy='drop_oldest', timeout=(3.05, 60), on_result=None, max_retries=5):
+        if policy not in self.POLICIES:
+            raise ValueError(f"policy must be one of {self.POLICIES}")
+        self.url = url
+        self.batch_url = url.rstrip('/') + '/batch'
+        self.max_queue = max_queue
+        self.max_batch = max_batch
+        self.policy = policy
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retries = 0  # consecutive failed posts of the points at the head of the queue
+        self.on_result = on_result  # called with (info, seconds) per point
+        self.batch_supported = True
+
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.queue = deque()
+        self.cond = threading.Condition()
+        self.thread = None
+        self.sent_points = 0
+        self.sent_batches = 0
+        self.failed_batches = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.latency_ms = deque(maxlen=100)
+
+    def submit(self, point):
+        """Queue one mapped point; never blocks."""
+        with self.cond:
+            if len(self.queue) >= self.max_queue:
+                if self.policy == 'drop_newest':
+                    self.dropped += 1
+                    return False
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(point)
+            self.max_depth = max(self.max_depth, len(self.queue))
+            self.cond.notify()
+        self._ensure_thread()
+        return True
+
+    def _ensure_thread(self):
+        if self.thread is None or not self.thread.is_alive():
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+
+    def _run(self):
+        backoff = 0.5
+        while True:
+            with self.cond:
+                while not self.queue:
+                    self.cond.wait()
+                batch = [self.queue.popleft() for _ in range(min(self.max_batch, len(self.queue)))]
+
+            start = time.time()
+            sent, results, error = self._post(batch)
+            dt = time.time() - start
+            if sent:
+                self.latency_ms.append(dt * 1000)
+                self.sent_points += sent
+                self.sent_batches += 1
+                if self.on_result:
+                    for info in results:
+                        self.on_result(info, dt)
+
+            if error is None:
+                backoff = 0.5
+                self.retries = 0
+                continue
+
+            self.failed_batches += 1
+            self.retries += 1
+            if self.retries > self.max_retries:
+                # give up on these points so they cannot block the sender
+                with self.cond:
+                    self.dropped += len(batch) - sent
+                self.retries = 0
+            else:
+                self._requeue(batch[sent:])
+            if self.on_result:
+                self.on_result({"error": str(error)}, dt)
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 10)
+
+    def _requeue(self, unsent):
+        """Put unsent points back in front of the queue, within its bound.
+
+        If they do not all fit, the policy picks which of them survive:
+        'drop_oldest' keeps the newest, 'drop_newest' the oldest.
+        """
+        with self.cond:
+            room = max(0, self.max_queue - len(self.queue))
+            if room < len(unsent):
+                self.dropped += len(unsent) - room
+                unsent = unsent[:room] if self.policy == 'drop_newest' else unsent[len(unsent) - room:]
+            self.queue.extendleft(reversed(unsent))
+
+    def _post(self, batch):
+        """Post a batch; returns (points the backend received, their results, error or None)."""
+        if self.batch_supported and len(batch) > 1:
+            try:
+                r = self.session.post(self.batch_url, json={"data_points": batch}, timeout=self.timeout)
+            except Exception as e:
+                return 0, [], e
+            if r.status_code in (404, 405):
+                self.batch_supported = False
+            elif r.status_code >= 500:
+                return 0, [], RuntimeError(f"HTTP {r.status_code} from {self.batch_url}")
+            elif r.status_code < 400:
+                try:
+                    return len(batch), r.json().get('results', []), None
+                except Exception:
+                    return len(batch), [{"raw": r.text[:160]}], None
+            # other 4xx: a point was rejected; post one by one so the rest still go through
+        results = []
+        for point in batch:
+            try:
+                r = self.session.post(self.url, json={"data_point": point}, timeout=self.timeout)
+            except Exception as e:
+                return len(results), results, e
+            if r.status_code != 200:
+                results.append({"status": "http_error", "code": r.status_code, "raw": r.text[:160]})
+                continue
+            try:
+                results.append(r.json())
+            except Exception:
+                results.append({"raw": r.text[:160]})
+        return len(results), results, None
+
+    def stats(self):
+        latency = list(self.latency_ms)
+        return {
+            'queue_depth': len(self.queue),
+            'max_queue_depth': self.max_depth,
+            'queue_limit': self.max_queue,
+            'policy': self.policy,
+            'sent_points': self.sent_points,
+            'sent_batches': self.sent_batches,
+            'failed_batches': self.failed_batches,
+            'dropped_points': self.dropped,
+            'batch_endpoint': self.batch_supported,
+            'send_ms_last': round(latency[-1], 1) if latency else None,
+            'send_ms_mean': round(sum(latency) / len(latency), 1) if latency else None,
+        }
+
+
 class TEPDataBridge:
     """Bridge between dynamic TEP simulation and FaultExplainer."""
 
@@ -60,25 +330,30 @@ class TEPDataBridge:
         # Rather than simulating a single step repeatedly (which yields a constant output)
         from collections import deque as _deque
         self.idv_history = _deque(maxlen=1200)  # ~1 day of 3-min steps
+        # Resumable simulator: advances one sample per step instead of re-running idv_history
+        self.tep_stepper = None
+        self.operating_mode = 'mode1'  # Key of the steady-state checkpoint used on (re)start
 
         # Data queues with proper timing
         self.raw_data_queue = deque(maxlen=1000)  # Every 3 minutes (raw TEP)
         self.pca_data_queue = deque(maxlen=500)   # Every 6 minutes (half speed)
         self.llm_data_queue = deque(maxlen=250)   # Every 12 minutes (quarter speed)
 
-        # Timing control
+        # Timing control (plant seconds, see PlantClock)
         self.last_pca_time = 0
         self.last_llm_time = 0
         self.pca_interval = 6 * 60  # 6 minutes in seconds
         self.llm_interval = 12 * 60  # 12 minutes in seconds
         # Simulation step interval (default: real-time 3 minutes)
         self.step_interval_seconds = 180
-        self.speed_mode = 'real'  # 'demo' or 'real'
+        self.speed_mode = 'real'  # 'demo', 'real', 'accelerated' or 'fast'
+        # Virtual plant clock: deadlines per sample, catch-up batching when behind
+        self.plant_clock = PlantClock(self.step_interval_seconds)
         self.current_preset = None  # 'demo' or 'real'
 
         # NEW: True simulation acceleration
         self.simulation_speed_factor = 1.0  # 1.0 = normal, 5.0 = 5x faster
-        self.use_accelerated_simulation = True  # Use TEMAIN_ACCELERATED when available
+        self.use_accelerated_simulation = True  # Advance the stepper speed_factor samples per published point
 
         # Process management
         self.processes = {}
@@ -92,6 +367,8 @@ class TEPDataBridge:
         # Diagnostics
         self.last_error = ""
         self.last_ingest_info = {}
+        # Non-blocking /ingest client (bounded queue, batched posts)
+        self.ingest_sender = IngestSender(on_result=self.record_ingest_result)
 
         print("✅ TEP Data Bridge initialized")
         print("✅ Timing: TEP(3min) → Anomaly Detection(6min) → LLM(12min)")
@@ -110,6 +387,26 @@ class TEPDataBridge:
         except Exception as e:
             print(f"❌ tep2py setup failed: {e}")
             self.tep2py = None
+    def get_tep_stepper(self):
+        """Return the resumable tep2py simulator, creating it on first use.
+        Returns None when the compiled temain_mod predates the stepping API."""
+        if self.tep_stepper is None and self.tep2py is not None:
+            try:
+                self.tep_stepper = self.tep2py.tep2py_stepper()
+                self.tep_stepper.warm_start(self.operating_mode)
+                print("✅ Resumable TEP stepper ready (constant cost per step)")
+            except Exception as e:
+                print(f"⚠️ TEP stepper unavailable, re-simulating history each step: {e}")
+                self.tep_stepper = False
+        return self.tep_stepper or None
+
+    def reset_tep_stepper(self):
+        """Return the resumable simulator to the steady-state checkpoint for the operating mode."""
+        if self.tep_stepper:
+            from_checkpoint = self.tep_stepper.warm_start(self.operating_mode)
+            print(f"🏭 TEP state reset to {self.operating_mode} steady state "
+                  f"({'checkpoint' if from_checkpoint else 'warm-up run, checkpoint saved'})")
+
     def map_to_faultexplainer_features(self, data_point):
         """Map XMEAS_* keys to FaultExplainer friendly feature names required by /ingest."""
         xmeas_to_name = {
@@ -125,45 +422,43 @@ class TEPDataBridge:
             row[name] = float(data_point.get(f'XMEAS_{i}', 0.0))
         return row
 
-    def send_to_ingest(self, data_point, url="http://localhost:8000/ingest"):
-        """Post a single mapped point to FaultExplainer /ingest and record heartbeat.
-        Logs backend response to detect ignored vs aggregating vs accepted events.
-        """
-        start = time.time()
+    def send_to_ingest(self, data_point):
+        """Queue a mapped point for FaultExplainer /ingest; the post happens in the background."""
         try:
             mapped = self.map_to_faultexplainer_features(data_point)
-            import requests
-            r = requests.post(url, json={"data_point": mapped}, timeout=60)
-            self.last_ingest_at = time.time()
-            self.last_ingest_ok = (r.status_code == 200)
-            if not self.last_ingest_ok:
-                print(f"⚠️ /ingest HTTP {r.status_code}: {r.text[:160]}")
-                return
-            dt = self.last_ingest_at - start
-            try:
-                info = r.json()
-            except Exception:
-                info = {"raw": r.text[:160]}
-            status = info.get('status')
-            if status == 'ignored':
-                reason = info.get('reason','')
-                present = info.get('present')
-                print(f"⚠️ /ingest ignored in {dt:.2f}s reason={reason} present={len(present) if present else 0}")
-                return
-            if info.get('aggregating'):
-                have = info.get('have')
-                need = info.get('need')
-                print(f"⏳ /ingest aggregating in {dt:.2f}s (have={have}, need={need})")
-                return
-            # Accepted point with t2/anomaly
-            print(f"✅ /ingest OK in {dt:.2f}s (t2={info.get('t2_stat','-')}, anomaly={info.get('anomaly')}, idx={info.get('aggregated_index')})")
-            if info.get('llm', {}).get('status') == 'triggered':
-                print("🤖 LLM triggered (live)")
+            self.ingest_sender.submit(mapped)
         except Exception as e:
-            self.last_ingest_ok = False
-            self.last_ingest_info = {"error": str(e)}
-            print(f"❌ Failed to POST /ingest: {e}")
+            self.last_error = f"ingest queue: {e}"
+            print(f"❌ Failed to queue /ingest point: {e}")
 
+    def record_ingest_result(self, info, dt):
+        """Record heartbeat and log the backend response (ignored vs aggregating vs accepted)."""
+        self.last_ingest_at = time.time()
+        if 'error' in info:
+            self.last_ingest_ok = False
+            self.last_ingest_info = info
+            print(f"❌ Failed to POST /ingest: {info['error']}")
+            return
+        if info.get('status') == 'http_error':
+            self.last_ingest_ok = False
+            print(f"⚠️ /ingest HTTP {info.get('code')}: {info.get('raw', '')}")
+            return
+        self.last_ingest_ok = True
+        status = info.get('status')
+        if status == 'ignored':
+            reason = info.get('reason','')
+            present = info.get('present')
+            print(f"⚠️ /ingest ignored in {dt:.2f}s reason={reason} present={len(present) if present else 0}")
+            return
+        if info.get('aggregating'):
+            have = info.get('have')
+            need = info.get('need')
+            print(f"⏳ /ingest aggregating in {dt:.2f}s (have={have}, need={need})")
+            return
+        # Accepted point with t2/anomaly
+        print(f"✅ /ingest OK in {dt:.2f}s (t2={info.get('t2_stat','-')}, anomaly={info.get('anomaly')}, idx={info.get('aggregated_index')})")
+        if info.get('llm', {}).get('status') == 'triggered':
+            print("🤖 LLM triggered (live)")
 
     def set_idv(self, idv_num, value):
         """Set IDV value (1-20, range 0.0-1.0)."""
@@ -173,83 +468,98 @@ class TEPDataBridge:
             return True
         return False
 
+    def plant_samples_per_point(self):
+        """3-minute plant samples simulated per published point (the true acceleration factor)."""
+        if self.use_accelerated_simulation and self.simulation_speed_factor > 1.0:
+            return max(1, int(round(self.simulation_speed_factor)))
+        return 1
+
     def run_tep_simulation_step(self):
-        """Run one TEP simulation step (3 minutes) with optional acceleration."""
+        """Run one TEP simulation step (3 minutes, or N× that with simulation acceleration)."""
         try:
             if not self.tep2py:
                 return None
 
-            # Append current IDV to history and build matrix up to 'now'
             self.idv_history.append(self.idv_values.copy())
-            import numpy as _np2
-            idv_matrix = _np2.array(list(self.idv_history)).reshape(-1, 20)
-
-            # NEW: Try to use accelerated simulation if available
-            if self.use_accelerated_simulation and self.simulation_speed_factor > 1.0:
-                try:
-                    # Use direct temain_mod call with acceleration
-                    import temain_mod
-                    npts = 60 * 3 * idv_matrix.shape[0]  # Same calculation as tep2py
-                    nx = idv_matrix.shape[0]
-
-                    print(f"🚀 Using TEMAIN_ACCELERATED with {self.simulation_speed_factor}x speed")
-                    result = temain_mod.temain_accelerated(npts, nx, idv_matrix, 0, self.simulation_speed_factor)
-
-                    # Convert to tep2py-like format
-                    import pandas as pd
-                    names = (
-                        ["XMEAS({:})".format(i) for i in range(1,41+1)]
-                        + ["XMV({:})".format(i) for i in range(1,11+1)]
-                    )
-                    datetime_index = _np2.arange(0, 3*nx, 3, dtype='datetime64[m]')
-                    process_data = pd.DataFrame(result, columns=names, index=datetime_index)
 
-                    # Create mock tep_sim object
-                    class MockTepSim:
-                        def __init__(self, data):
-                            self.process_data = data
-
-                    tep_sim = MockTepSim(process_data)
-                    print(f"✅ Accelerated simulation completed ({self.simulation_speed_factor}x faster)")
-
-                except Exception as e:
-                    print(f"⚠️ Accelerated simulation failed, falling back to normal: {e}")
-                    # Fall back to normal simulation
-                    tep_sim = self.tep2py.tep2py(idv_matrix)
-                    tep_sim.simulate()
+            # Advance the persistent plant state (constant cost per plant sample); with
+            # acceleration the stepper covers N samples and only the last one is published
+            stepper = self.get_tep_stepper()
+            if stepper:
+                latest = stepper.advance(self.plant_samples_per_point(), self.idv_values)[-1]
             else:
-                # Use normal tep2py simulation
-                tep_sim = self.tep2py.tep2py(idv_matrix)
-                tep_sim.simulate()
-
-            if hasattr(tep_sim, 'process_data'):
-                # Get latest data point
-                latest = tep_sim.process_data.iloc[-1]
+                # Builds without the stepping API: re-simulate the IDV history (raw array, no DataFrame)
+                import numpy as _np2
+                idv_matrix = _np2.array(list(self.idv_history)).reshape(-1, 20)
+                latest = self.tep2py.tep2py(idv_matrix).simulate(raw=True)[-1]
+
+            # Create data point from the latest sample (XMEAS_1..41, XMV_1..11)
+            data_point = {
+                'timestamp': time.time(),
+                'step': self.current_step,
+                'idv_values': self.idv_values.copy(),
+            }
+            data_point.update(self.tep2py.sample_dict(latest))
+            return data_point
 
-                # Extract XMEAS and XMV
-                xmeas_cols = [col for col in tep_sim.process_data.columns if 'XMEAS' in col]
-                xmv_cols = [col for col in tep_sim.process_data.columns if 'XMV' in col]
+        except Exception as e:
+            print(f"❌ TEP simulation step failed: {e}")
+            return None
 
-                # Create data point
+    def run_tep_simulation_batch(self, n_samples):
+        """Run n_samples TEP steps in one go (scheduler catch-up); returns the data points in order."""
+        stepper = self.get_tep_stepper()
+        if n_samples > 1 and stepper:
+            stride = self.plant_samples_per_point()
+            rows = stepper.advance(n_samples * stride, self.idv_values)[stride - 1::stride]
+            data_points = []
+            for i, row in enumerate(rows):
+                self.idv_history.append(self.idv_values.copy())
                 data_point = {
                     'timestamp': time.time(),
-                    'step': self.current_step,
+                    'step': self.current_step + i,
                     'idv_values': self.idv_values.copy(),
                 }
+                data_point.update(self.tep2py.sample_dict(row))
+                data_points.append(data_point)
+            return data_points
+
+        data_points = []
+        for i in range(n_samples):
+            data_point = self.run_tep_simulation_step()
+            if data_point:
+                data_point['step'] = self.current_step + i
+                data_points.append(data_point)
+        return data_points
+
+    def publish_data_point(self, data_point, plant_time=None):
+        """Queue, save and forward one sample; PCA/LLM cadence follows the plant clock.
+        `plant_time` is the plant seconds at this point (default: the clock's plant_seconds)."""
+        # Add to raw data queue
+        self.raw_data_queue.append(data_point)
+
+        # Save for FaultExplainer
+        if self.save_data_for_faultexplainer(data_point):
+            pass
 
-                # Add XMEAS data
-                for i, col in enumerate(xmeas_cols):
-                    data_point[f'XMEAS_{i+1}'] = latest[col]
+        # Also send to live /ingest for real-time PCA+LLM (queued, non-blocking)
+        self.send_to_ingest(data_point)
 
-                # Add XMV data
-                for i, col in enumerate(xmv_cols):
-                    data_point[f'XMV_{i+1}'] = latest[col]
+        # Check if time for PCA analysis (every 6 plant minutes)
+        if plant_time is None:
+            plant_time = self.plant_clock.plant_seconds
+        if plant_time - self.last_pca_time >= self.pca_interval:
+            self.pca_data_queue.append(data_point)
+            self.last_pca_time = plant_time
+            print(f"📊 PCA data point added (step {self.current_step})")
 
-                return data_point
+            # Check if time for LLM analysis (every 12 plant minutes)
+            if plant_time - self.last_llm_time >= self.llm_interval:
+                self.llm_data_queue.append(data_point)
+                self.last_llm_time = plant_time
+                print(f"🤖 LLM data point added (step {self.current_step})")
 
-        except Exception as e:
-            print(f"❌ TEP simulation step failed: {e}")
-            return None
+        self.current_step += 1
 
     def save_data_for_faultexplainer(self, data_point):
         """Save data in FaultExplainer format."""
@@ -304,66 +614,66 @@ class TEPDataBridge:
 
 
     def simulation_loop(self):
-        """Main simulation loop with proper timing and heartbeats."""
+        """Main simulation loop: deadline-scheduled steps on the virtual plant clock."""
         print("🚀 Starting TEP simulation loop")
+        clock = self.plant_clock
+        clock.set_interval(self.step_interval_seconds)
+        clock.reset()
 
         while self.tep_running:
             try:
+                # Wait for the next deadline (demo, real-time, N× or as fast as possible)
+                if not clock.wait(lambda: self.tep_running, lambda: self.step_interval_seconds):
+                    break
+
                 loop_start = time.time()
                 self.last_loop_at = loop_start
-                print(f"⏱️ Step {self.current_step} start (interval={self.step_interval_seconds}s, mode={self.speed_mode})")
-
-                # Run TEP simulation step (every 3 minutes)
-                data_point = self.run_tep_simulation_step()
-
-                if data_point:
-                    # Add to raw data queue
-                    self.raw_data_queue.append(data_point)
-
-                    # Save for FaultExplainer
-                    if self.save_data_for_faultexplainer(data_point):
-                        pass
+                n_samples = clock.due()
+                print(f"⏱️ Step {self.current_step} start (interval={self.step_interval_seconds}s, mode={self.speed_mode}, samples={n_samples})")
 
-                    # Also send to live /ingest for real-time PCA+LLM
-                    print("➡️ Posting /ingest...")
-                    self.send_to_ingest(data_point)
+                # Run TEP simulation (one 3-minute sample, or a catch-up batch when behind)
+                # each point covers `stride` plant samples when the simulation is accelerated
+                stride = self.plant_samples_per_point()
+                plant_start = clock.plant_seconds
+                started = time.monotonic()
+                data_points = self.run_tep_simulation_batch(n_samples)
+                clock.record(n_samples, time.monotonic() - started, n_samples * stride)
 
-                    # Check if time for PCA analysis (every 6 minutes)
-                    current_time = time.time()
-                    if current_time - self.last_pca_time >= self.pca_interval:
-                        self.pca_data_queue.append(data_point)
-                        self.last_pca_time = current_time
-                        print(f"📊 PCA data point added (step {self.current_step})")
-
-                        # Check if time for LLM analysis (every 12 minutes)
-                        if current_time - self.last_llm_time >= self.llm_interval:
-                            self.llm_data_queue.append(data_point)
-                            self.last_llm_time = current_time
-                            print(f"🤖 LLM data point added (step {self.current_step})")
-
-                    self.current_step += 1
-
-                # Wait for next step (demo or real-time)
-                print("💤 Sleeping for next step...")
-                time.sleep(self.step_interval_seconds)
+                for i, data_point in enumerate(data_points, 1):
+                    self.publish_data_point(data_point, plant_start + i * stride * PlantClock.SAMPLE_SECONDS)
 
             except Exception as e:
                 self.last_error = f"loop: {e}"
                 print(f"❌ Simulation loop error: {e}")
                 time.sleep(10)
+                clock.set_interval(self.step_interval_seconds)
+                clock.reset()
 
         print("🛑 TEP simulation loop stopped")
 
+    def join_simulation_thread(self, timeout=15):
+        """Wait for a stopped simulation loop to exit (it polls tep_running at least every 0.5 s).
+        Returns False if it is still running after `timeout` seconds."""
+        thread = getattr(self, 'simulation_thread', None)
+        if thread is None or thread is threading.current_thread():
+            return True
+        thread.join(timeout)
+        return not thread.is_alive()
+
     def start_tep_simulation(self):
         """Start TEP simulation."""
         if self.tep_running:
             return False, "TEP simulation already running"
+        # A loop stopped just before may still be finishing its step
+        if not self.join_simulation_thread():
+            return False, "Previous TEP simulation loop has not stopped yet"
 
         # Reset rolling state at (re)start
         try:
             self.idv_history.clear()
         except Exception:
             pass
+        self.reset_tep_stepper()
         self.tep_running = True
         self.simulation_thread = threading.Thread(target=self.simulation_loop, daemon=True)
         self.simulation_thread.start()
@@ -372,11 +682,11 @@ class TEPDataBridge:
     def restart_tep_simulation(self):
         """Restart TEP simulation safely: stop thread, reset counters and queues, start again."""
         try:
-            # Stop if running
-            if self.tep_running:
-                self.tep_running = False
-                # Allow thread to exit
-                time.sleep(min(2, self.step_interval_seconds))
+            # Stop the loop and wait for it to exit, so two loops never step the same
+            # simulator or share the plant clock
+            self.tep_running = False
+            if not self.join_simulation_thread():
+                return False, "Failed to restart TEP: simulation loop did not stop"
             # Reset state
             self.current_step = 0
             self.raw_data_queue.clear()
@@ -386,6 +696,8 @@ class TEPDataBridge:
                 self.idv_history.clear()
             except Exception:
                 pass
+            self.reset_tep_stepper()
+            self.plant_clock.reset()
             self.last_pca_time = 0
             self.last_llm_time = 0
             self.last_loop_at = 0
@@ -621,6 +933,7 @@ class TEPDataBridge:
             'current_step': self.current_step,
             'step_interval_seconds': self.step_interval_seconds,
             'speed_mode': self.speed_mode,
+            'scheduler': self.plant_clock.stats(),
             'current_preset': self.current_preset,
             'raw_data_points': len(self.raw_data_queue),
             'pca_data_points': len(self.pca_data_queue),
@@ -631,6 +944,7 @@ class TEPDataBridge:
             'csv_rows': getattr(self, 'csv_rows', 0),
             'csv_bytes': getattr(self, 'csv_bytes', 0),
             'last_ingest_info': getattr(self, 'last_ingest_info', {}),
+            'ingest_sender': self.ingest_sender.stats(),
             'last_error': getattr(self, 'last_error', ''),
             'backend_aggregated_count': backend_agg,
             'backend_live_buffer': backend_buf,
@@ -702,6 +1016,18 @@ class UnifiedControlPanel:
                     seconds = getattr(self.bridge, 'step_interval_seconds', 1) or 1
                 seconds = max(1, min(10, int(seconds)))
                 self.bridge.step_interval_seconds = seconds
+            elif mode == 'accelerated':
+                # N× real time: one 3-minute sample every 180/N seconds
+                try:
+                    factor = max(1.0, min(3600.0, float(data.get('factor', 10))))
+                except Exception:
+                    factor = 10.0
+                self.bridge.speed_mode = 'accelerated'
+                self.bridge.step_interval_seconds = 180 / factor
+            elif mode == 'fast':
+                # As fast as possible: no waiting between samples
+                self.bridge.speed_mode = 'fast'
+                self.bridge.step_interval_seconds = 0
             else:
                 self.bridge.step_interval_seconds = 180
                 self.bridge.speed_mode = 'real'
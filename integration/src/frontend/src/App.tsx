@@ -486,7 +486,8 @@ export default function App() {
     };
 
     try {
-      const response = await fetch("http://localhost:8000/explain", {
+      // Streamed variant of /explain: tokens of every model are relayed as they arrive
+      const response = await fetch("http://localhost:8000/explain/stream", {
         method: "POST",
         headers: {
           "Content-Type": "application/json",
@@ -494,18 +495,64 @@ export default function App() {
         body: JSON.stringify(payload),
       });
 
-      if (response.ok) {
-        const comparativeData = await response.json();
-        console.log("✅ Received comparative analysis:", comparativeData);
-
-        setComparativeResults(comparativeData);
-
-        // Note: Removed automatic addition to conversation to avoid cluttering Assistant page
-        // Users can view results in the Multi-LLM Analysis tab and Unified Console
-      } else {
+      if (!response.ok || !response.body) {
         console.error("❌ Error response from server:", response.status);
         throw new Error(`Server error: ${response.status}`);
       }
+
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = "";
+      const handleEvent = (event: string, data: any) => {
+        if (event === "start") {
+          const llm_analyses: Record<string, any> = {};
+          for (const model of data.models) {
+            llm_analyses[model] = { analysis: "", response_time: 0, status: "streaming" };
+          }
+          setComparativeResults({
+            timestamp: new Date().toLocaleString(),
+            feature_analysis: data.feature_analysis,
+            llm_analyses,
+            performance_summary: {},
+          });
+          setIsAnalyzing(false);
+        } else if (event === "token" || event === "result") {
+          setComparativeResults((prev: any) => {
+            if (!prev) return prev;
+            const current = prev.llm_analyses[data.model] ?? { analysis: "", response_time: 0, status: "streaming" };
+            const updated = event === "token"
+              ? { ...current, analysis: current.analysis + data.content }
+              : { analysis: data.response, response_time: data.response_time, status: data.status };
+            return { ...prev, llm_analyses: { ...prev.llm_analyses, [data.model]: updated } };
+          });
+        } else if (event === "analysis") {
+          console.log("✅ Received comparative analysis:", data);
+          setComparativeResults(data);
+        } else if (event === "error") {
+          throw new Error(data.error);
+        }
+      };
+
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) >= 0) {
+          const message = buffer.slice(0, boundary);
+          buffer = buffer.slice(boundary + 2);
+          let event = "message";
+          let data = "";
+          for (const line of message.split("\n")) {
+            if (line.startsWith("event: ")) event = line.slice(7);
+            else if (line.startsWith("data: ")) data += line.slice(6);
+          }
+          if (data) handleEvent(event, JSON.parse(data));
+        }
+      }
+
+      // Note: Removed automatic addition to conversation to avoid cluttering Assistant page
+      // Users can view results in the Multi-LLM Analysis tab and Unified Console
     } catch (error) {
       console.error("❌ Error sending fault to backend:", error);
 
@@ -66,9 +66,9 @@ const ModelCard: React.FC<{ modelName: string; analysis: LLMAnalysis; performanc
         </Group>
         <Group>
           <Badge
-            color={analysis.status === "success" ? "green" : "red"}
+            color={analysis.status === "success" ? "green" : analysis.status === "streaming" ? "blue" : "red"}
             variant="light"
-            leftSection={analysis.status === "success" ? <IconCheck size={12} /> : <IconAlertCircle size={12} />}
+            leftSection={analysis.status === "success" ? <IconCheck size={12} /> : analysis.status === "streaming" ? <IconClock size={12} /> : <IconAlertCircle size={12} />}
           >
             {analysis.status}
           </Badge>
@@ -80,7 +80,7 @@ const ModelCard: React.FC<{ modelName: string; analysis: LLMAnalysis; performanc
         </Group>
       </Group>
 
-      {analysis.status === "success" ? (
+      {analysis.status === "success" || analysis.status === "streaming" ? (
         <div
           dangerouslySetInnerHTML={{
             __html: marked.parse(analysis.analysis),
@@ -268,7 +268,7 @@ C
 C
 C  Local Variables
 C
-      INTEGER I, NN, NPTS, TEST, TEST1, TEST3, TEST4
+      INTEGER I, NN, NPTS, TEST3, TEST4
       DOUBLE PRECISION TIME, YY(50), YP(50)
 C
 C  New local variables from subroutine
@@ -292,6 +292,112 @@ C
       CALL TEINIT(NN,TIME,YY,YP)
       K = 1
 C
+C  Set Controller Parameters, Initial Valve Positions and
+C  Disturbance Flags
+C
+      CALL CTRLINIT
+C
+C  Simulation Loop
+C
+      DO 1000 I = 1, NPTS
+      CALL CTRLSTEP(I)
+      IF (VERBOSE.EQ.1) THEN
+        TEST3=MOD(I,5000)
+        IF (TEST3.EQ.0) THEN
+          PRINT *, 'Simulation time (in seconds) = ', I, XMEAS(7)
+        ENDIF
+      ENDIF
+C
+      TEST4=MOD(I,180)
+      IF (TEST4.EQ.0) THEN
+        IDV(:) = IDATA(K,:)
+        XDATA(K,1:41) = XMEAS(:)
+        XDATA(K,42:52) = XMV(1:11)
+        K = K + 1
+      ENDIF
+C
+      CALL INTGTR(NN,TIME,DELTAT,YY,YP)
+C
+      CALL CONSHAND
+C
+ 1000 CONTINUE
+      IF (VERBOSE.EQ.1) THEN
+        PRINT *, 'Simulation is done.'
+      ENDIF
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE CTRLINIT
+C **********************************************************************
+C     SETS THE CONTROLLER PARAMETERS, THE INITIAL VALVE POSITIONS AND
+C     TURNS ALL DISTURBANCE FLAGS OFF
+C **********************************************************************
+C
+C  MEASUREMENT AND VALVE COMMON BLOCK
+C
+      DOUBLE PRECISION XMEAS, XMV
+      COMMON/PV/ XMEAS(41), XMV(12)
+C
+C   DISTURBANCE VECTOR COMMON BLOCK
+C
+      INTEGER IDV
+      COMMON/DVEC/ IDV(20)
+C
+C   CONTROLLER COMMON BLOCK
+C
+C      DOUBLE PRECISION SETPT, GAIN, TAUI, ERROLD, DELTAT
+C      COMMON/CTRL/ SETPT, GAIN, TAUI, ERROLD, DELTAT
+       DOUBLE PRECISION SETPT, DELTAT
+       COMMON/CTRLALL/ SETPT(20), DELTAT
+       INTEGER FLAG
+       COMMON/FLAG6/ FLAG
+C
+      DOUBLE PRECISION GAIN1, ERROLD1
+      COMMON/CTRL1/ GAIN1, ERROLD1
+      DOUBLE PRECISION GAIN2, ERROLD2
+      COMMON/CTRL2/ GAIN2, ERROLD2
+      DOUBLE PRECISION GAIN3, ERROLD3
+      COMMON/CTRL3/ GAIN3, ERROLD3
+      DOUBLE PRECISION  GAIN4, ERROLD4
+      COMMON/CTRL4/ GAIN4, ERROLD4
+      DOUBLE PRECISION GAIN5, TAUI5, ERROLD5
+      COMMON/CTRL5/ GAIN5, TAUI5, ERROLD5
+      DOUBLE PRECISION GAIN6, ERROLD6
+      COMMON/CTRL6/ GAIN6, ERROLD6
+      DOUBLE PRECISION GAIN7, ERROLD7
+      COMMON/CTRL7/  GAIN7, ERROLD7
+      DOUBLE PRECISION GAIN8, ERROLD8
+      COMMON/CTRL8/ GAIN8, ERROLD8
+      DOUBLE PRECISION GAIN9, ERROLD9
+      COMMON/CTRL9/ GAIN9, ERROLD9
+      DOUBLE PRECISION GAIN10, TAUI10, ERROLD10
+      COMMON/CTRL10/ GAIN10, TAUI10, ERROLD10
+      DOUBLE PRECISION GAIN11, TAUI11, ERROLD11
+      COMMON/CTRL11/ GAIN11, TAUI11, ERROLD11
+      DOUBLE PRECISION GAIN13, TAUI13, ERROLD13
+      COMMON/CTRL13/ GAIN13, TAUI13, ERROLD13
+      DOUBLE PRECISION GAIN14, TAUI14, ERROLD14
+      COMMON/CTRL14/ GAIN14, TAUI14, ERROLD14
+      DOUBLE PRECISION GAIN15, TAUI15, ERROLD15
+      COMMON/CTRL15/ GAIN15, TAUI15, ERROLD15
+      DOUBLE PRECISION GAIN16, TAUI16, ERROLD16
+      COMMON/CTRL16/ GAIN16, TAUI16, ERROLD16
+      DOUBLE PRECISION GAIN17, TAUI17, ERROLD17
+      COMMON/CTRL17/ GAIN17, TAUI17, ERROLD17
+      DOUBLE PRECISION GAIN18, TAUI18, ERROLD18
+      COMMON/CTRL18/ GAIN18, TAUI18, ERROLD18
+      DOUBLE PRECISION GAIN19, TAUI19, ERROLD19
+      COMMON/CTRL19/ GAIN19, TAUI19, ERROLD19
+      DOUBLE PRECISION GAIN20, TAUI20, ERROLD20
+      COMMON/CTRL20/ GAIN20, TAUI20, ERROLD20
+      DOUBLE PRECISION GAIN22, TAUI22, ERROLD22
+      COMMON/CTRL22/ GAIN22, TAUI22, ERROLD22
+C
+      INTEGER I
+C
 C  Set Controller Parameters
 C  Make a Stripper Level Set Point Change of +15%
 C
@@ -395,9 +501,19 @@ C
           IDV(I) = 0
  100  CONTINUE
 C
-C  Simulation Loop
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE CTRLSTEP(I)
+C **********************************************************************
+C     CALLS THE DISCRETE CONTROLLERS DUE AT INTEGRATION STEP I
+C     (FAST LOOPS EVERY 3 S, COMPOSITION LOOPS EVERY 360 S AND 900 S)
+C **********************************************************************
+C
+      INTEGER I, TEST, TEST1
 C
-      DO 1000 I = 1, NPTS
       TEST=MOD(I,3)
       IF (TEST.EQ.0) THEN
         CALL CONTRL1
@@ -424,29 +540,341 @@ C
       ENDIF
       TEST1=MOD(I,900)
       IF (TEST1.EQ.0) CALL CONTRL20
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_INIT
+C ****************************************************************************
+*     INITIALIZES THE PERSISTENT SIMULATOR STATE SO THAT THE PROCESS CAN BE
+*     ADVANCED INCREMENTALLY WITH TEMAIN_ADVANCE INSTEAD OF RE-SIMULATING
+*     THE WHOLE DISTURBANCE HISTORY FROM TEINIT ON EVERY CALL
+C ****************************************************************************
+C
+      DOUBLE PRECISION SETPT, DELTAT
+      COMMON/CTRLALL/ SETPT(20), DELTAT
+      INTEGER FLAG
+      COMMON/FLAG6/ FLAG
+C
+C   PERSISTENT INTEGRATOR STATE (STEPPING API)
+C
+      DOUBLE PRECISION TSTIME, TSYY, TSYP
+      INTEGER TSSTEP
+      COMMON/TESTEP/ TSTIME, TSYY(50), TSYP(50), TSSTEP
+C
+      INTEGER NN
+C
+      NN = 50
+      DELTAT = 1. / 3600.
+C
+      CALL TEINIT(NN,TSTIME,TSYY,TSYP)
+      TSSTEP = 0
+      FLAG = 0
+C
+      CALL CTRLINIT
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_ADVANCE(NX, IDATA, XDATA, VERBOSE)
+C ****************************************************************************
+*     ADVANCES THE PERSISTENT SIMULATOR STATE BY NX SAMPLES (3 MIN EACH)
+*     AND RETURNS THE SAMPLED PROCESS MEASUREMENTS AND MANIPULATED VARIABLES.
+*     CALLING TEMAIN_ADVANCE REPEATEDLY AFTER TEMAIN_INIT GIVES THE SAME
+*     RESULT AS ONE TEMAIN CALL OVER THE CONCATENATED IDATA ROWS.
+*     NX    = NUMBER OF SAMPLES TO ADVANCE (3 MIN = 1 POINT)
+*     IDATA = DISTURBANCES TIME-SERIES MATRIX (NX, 20)
+*     XDATA = PROCESS MEASUREMENTS AND MANIPULATED VARIABLES MATRIX (NX, 52)
+*     VERBOSE  = VERBOSE FLAG (0 = VERBOSE, 1 = NO VERBOSE)
+C ****************************************************************************
+C
+      DOUBLE PRECISION XMEAS, XMV
+      COMMON/PV/ XMEAS(41), XMV(12)
+      INTEGER IDV
+      COMMON/DVEC/ IDV(20)
+      DOUBLE PRECISION SETPT, DELTAT
+      COMMON/CTRLALL/ SETPT(20), DELTAT
+C
+C   PERSISTENT INTEGRATOR STATE (STEPPING API)
+C
+      DOUBLE PRECISION TSTIME, TSYY, TSYP
+      INTEGER TSSTEP
+      COMMON/TESTEP/ TSTIME, TSYY(50), TSYP(50), TSSTEP
+C
+C   INTEGRATOR SELECTION (SEE TEMAIN_SETINTEGRATOR)
+C
+      INTEGER IMETH, NRKACC
+      COMMON/TEINTG/ IMETH, NRKACC
+C
+      INTEGER J, K, NN, NX, VERBOSE
+      INTEGER IDATA(NX, 20)
+      DOUBLE PRECISION XDATA(NX, 52)
+C
+      NN = 50
+C
+      J = 0
+ 900  IF (J.GE.180*NX) GOTO 1000
+      J = J + 1
+      TSSTEP = TSSTEP + 1
+      CALL CTRLSTEP(TSSTEP)
       IF (VERBOSE.EQ.1) THEN
-        TEST3=MOD(I,5000)
-        IF (TEST3.EQ.0) THEN
-          PRINT *, 'Simulation time (in seconds) = ', I, XMEAS(7)
+        IF (MOD(TSSTEP,5000).EQ.0) THEN
+          PRINT *, 'Simulation time (in seconds) = ', TSSTEP, XMEAS(7)
         ENDIF
       ENDIF
 C
-      TEST4=MOD(I,180)
-      IF (TEST4.EQ.0) THEN
+      IF (MOD(J,180).EQ.0) THEN
+        K = J / 180
         IDV(:) = IDATA(K,:)
         XDATA(K,1:41) = XMEAS(:)
         XDATA(K,42:52) = XMV(1:11)
-        K = K + 1
       ENDIF
 C
-      CALL INTGTR(NN,TIME,DELTAT,YY,YP)
+C   THE CONTROLLERS ONLY ACT ON MULTIPLES OF 3 S, SO WITH A HIGHER ORDER
+C   INTEGRATOR THE WHOLE 3 S INTERVAL IS COVERED BY ONE STEP
+C
+      IF (IMETH.NE.0 .AND. MOD(TSSTEP,3).EQ.0 .AND.
+     .    MOD(J,3).EQ.0 .AND. J+2.LE.180*NX) THEN
+        CALL INTGRK(NN,TSTIME,3.D0*DELTAT,TSYY)
+        TSSTEP = TSSTEP + 2
+        J = J + 2
+      ELSE
+        CALL INTGTR(NN,TSTIME,DELTAT,TSYY,TSYP)
+      ENDIF
 C
       CALL CONSHAND
 C
+      GOTO 900
  1000 CONTINUE
-      IF (VERBOSE.EQ.1) THEN
-        PRINT *, 'Simulation is done.'
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_ENSEMBLE(K, NX, IDATA, SEEDS, XDATA, VERBOSE)
+C ****************************************************************************
+*     RUNS K INDEPENDENT SIMULATIONS (ENSEMBLE MEMBERS) IN ONE CALL.
+*     EACH MEMBER STARTS FROM TEINIT WITH ITS OWN RANDOM SEED AND ITS OWN
+*     DISTURBANCES TIME-SERIES.  THE PERSISTENT STEPPING STATE IS REUSED
+*     AS SCRATCH, SO CALL TEMAIN_INIT OR TEMAIN_RESTORE BEFORE STEPPING
+*     AGAIN.
+*     K     = NUMBER OF ENSEMBLE MEMBERS
+*     NX    = NUMBER OF DATA POINTS COMPUTED PER MEMBER (3 MIN = 1 POINT)
+*     IDATA = DISTURBANCES TIME-SERIES TENSOR (K, NX, 20)
+*     SEEDS = RANDOM SEED PER MEMBER (K), 0 KEEPS THE TEINIT SEED
+*     XDATA = PROCESS MEASUREMENTS AND MANIPULATED VARIABLES (K, NX, 52)
+*     VERBOSE  = VERBOSE FLAG (0 = VERBOSE, 1 = NO VERBOSE)
+C ****************************************************************************
+C
+      DOUBLE PRECISION G
+      COMMON/RANDSD/ G
+C
+      INTEGER K, NX, VERBOSE, M
+      INTEGER IDATA(K, NX, 20)
+      DOUBLE PRECISION SEEDS(K), XDATA(K, NX, 52)
+C
+      DO 100 M = 1, K
+        CALL TEMAIN_INIT
+        IF (SEEDS(M).GT.0.D0) G = SEEDS(M)
+        CALL TEMAIN_ADVANCE(NX, IDATA(M,:,:), XDATA(M,:,:), VERBOSE)
+ 100  CONTINUE
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_STATESIZE(NS)
+C **********************************************************************
+C     RETURNS THE LENGTH OF THE STATE VECTOR USED BY TEMAIN_SNAPSHOT
+C     AND TEMAIN_RESTORE
+C **********************************************************************
+C
+      INTEGER NS, NSTATE
+      PARAMETER (NSTATE = 986)
+C
+      NS = NSTATE
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_SNAPSHOT(NS, STATE)
+C **********************************************************************
+C     COPIES THE COMPLETE SIMULATOR STATE (INTEGRATOR, MEASUREMENTS,
+C     CONTROLLERS, PROCESS BLOCKS, RANDOM WALKS AND RANDOM SEED) INTO
+C     STATE.  NS MUST EQUAL THE VALUE RETURNED BY TEMAIN_STATESIZE.
+C **********************************************************************
+C
+      INTEGER NS, NSTATE
+      PARAMETER (NSTATE = 986)
+      DOUBLE PRECISION STATE(NS)
+C
+      IF (NS.NE.NSTATE) THEN
+        PRINT *, 'TEMAIN_SNAPSHOT: STATE SIZE MUST BE ', NSTATE
+        RETURN
+      ENDIF
+      CALL TEXFER(STATE, 0)
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_RESTORE(NS, STATE)
+C **********************************************************************
+C     RESTORES THE COMPLETE SIMULATOR STATE FROM A VECTOR PRODUCED BY
+C     TEMAIN_SNAPSHOT.  TEINIT IS CALLED FIRST SO THAT THE PHYSICAL
+C     CONSTANTS ARE SET EVEN IN A FRESHLY LOADED MODULE.
+C **********************************************************************
+C
+      INTEGER NS, NN, NSTATE
+      PARAMETER (NSTATE = 986)
+      DOUBLE PRECISION STATE(NS), TIME, YY(50), YP(50)
+C
+      IF (NS.NE.NSTATE) THEN
+        PRINT *, 'TEMAIN_RESTORE: STATE SIZE MUST BE ', NSTATE
+        RETURN
       ENDIF
+      NN = 50
+      CALL TEINIT(NN,TIME,YY,YP)
+      CALL TEXFER(STATE, 1)
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEXFER(STATE, IDIR)
+C **********************************************************************
+C     COPIES THE SIMULATOR COMMON BLOCKS INTO STATE (IDIR = 0) OR BACK
+C     FROM STATE (IDIR = 1).  THE BLOCKS ARE ADDRESSED AS FLAT ARRAYS;
+C     /CONST/ HOLDS ONLY PHYSICAL CONSTANTS AND IS NOT COPIED.
+C **********************************************************************
+C
+      DOUBLE PRECISION STATE(*)
+      INTEGER IDIR, IPOS
+C
+      DOUBLE PRECISION STP(101), PVA(53), CTA(21)
+      INTEGER ISTP(1), IDVA(20), IFLG(1)
+      COMMON/TESTEP/ STP, ISTP
+      COMMON/PV/ PVA
+      COMMON/DVEC/ IDVA
+      COMMON/CTRLALL/ CTA
+      COMMON/FLAG6/ IFLG
+C
+      DOUBLE PRECISION C1(2), C2(2), C3(2), C4(2), C5(3), C6(2),
+     .C7(2), C8(2), C9(2), C10(3), C11(3), C13(3), C14(3), C15(3),
+     .C16(3), C17(3), C18(3), C19(3), C20(3), C22(3)
+      COMMON/CTRL1/ C1
+      COMMON/CTRL2/ C2
+      COMMON/CTRL3/ C3
+      COMMON/CTRL4/ C4
+      COMMON/CTRL5/ C5
+      COMMON/CTRL6/ C6
+      COMMON/CTRL7/ C7
+      COMMON/CTRL8/ C8
+      COMMON/CTRL9/ C9
+      COMMON/CTRL10/ C10
+      COMMON/CTRL11/ C11
+      COMMON/CTRL13/ C13
+      COMMON/CTRL14/ C14
+      COMMON/CTRL15/ C15
+      COMMON/CTRL16/ C16
+      COMMON/CTRL17/ C17
+      COMMON/CTRL18/ C18
+      COMMON/CTRL19/ C19
+      COMMON/CTRL20/ C20
+      COMMON/CTRL22/ C22
+C
+      DOUBLE PRECISION TPRD(580), WLKD(132), GA(1)
+      INTEGER IVSTA(12), IWLK(12)
+      COMMON/TEPROC/ TPRD, IVSTA
+      COMMON/WLK/ WLKD, IWLK
+      COMMON/RANDSD/ GA
+C
+      IPOS = 0
+      CALL XFERI(1, ISTP, STATE, IPOS, IDIR)
+      CALL XFERD(101, STP, STATE, IPOS, IDIR)
+      CALL XFERD(53, PVA, STATE, IPOS, IDIR)
+      CALL XFERI(20, IDVA, STATE, IPOS, IDIR)
+      CALL XFERD(21, CTA, STATE, IPOS, IDIR)
+      CALL XFERI(1, IFLG, STATE, IPOS, IDIR)
+      CALL XFERD(2, C1, STATE, IPOS, IDIR)
+      CALL XFERD(2, C2, STATE, IPOS, IDIR)
+      CALL XFERD(2, C3, STATE, IPOS, IDIR)
+      CALL XFERD(2, C4, STATE, IPOS, IDIR)
+      CALL XFERD(3, C5, STATE, IPOS, IDIR)
+      CALL XFERD(2, C6, STATE, IPOS, IDIR)
+      CALL XFERD(2, C7, STATE, IPOS, IDIR)
+      CALL XFERD(2, C8, STATE, IPOS, IDIR)
+      CALL XFERD(2, C9, STATE, IPOS, IDIR)
+      CALL XFERD(3, C10, STATE, IPOS, IDIR)
+      CALL XFERD(3, C11, STATE, IPOS, IDIR)
+      CALL XFERD(3, C13, STATE, IPOS, IDIR)
+      CALL XFERD(3, C14, STATE, IPOS, IDIR)
+      CALL XFERD(3, C15, STATE, IPOS, IDIR)
+      CALL XFERD(3, C16, STATE, IPOS, IDIR)
+      CALL XFERD(3, C17, STATE, IPOS, IDIR)
+      CALL XFERD(3, C18, STATE, IPOS, IDIR)
+      CALL XFERD(3, C19, STATE, IPOS, IDIR)
+      CALL XFERD(3, C20, STATE, IPOS, IDIR)
+      CALL XFERD(3, C22, STATE, IPOS, IDIR)
+      CALL XFERD(580, TPRD, STATE, IPOS, IDIR)
+      CALL XFERI(12, IVSTA, STATE, IPOS, IDIR)
+      CALL XFERD(132, WLKD, STATE, IPOS, IDIR)
+      CALL XFERI(12, IWLK, STATE, IPOS, IDIR)
+      CALL XFERD(1, GA, STATE, IPOS, IDIR)
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE XFERD(N, A, STATE, IPOS, IDIR)
+C **********************************************************************
+C     COPIES N DOUBLE PRECISION VALUES BETWEEN A AND STATE(IPOS+1:)
+C **********************************************************************
+C
+      INTEGER N, IPOS, IDIR, I
+      DOUBLE PRECISION A(N), STATE(*)
+C
+      DO 100 I = 1, N
+        IF (IDIR.EQ.0) THEN
+          STATE(IPOS+I) = A(I)
+        ELSE
+          A(I) = STATE(IPOS+I)
+        ENDIF
+ 100  CONTINUE
+      IPOS = IPOS + N
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE XFERI(N, IA, STATE, IPOS, IDIR)
+C **********************************************************************
+C     COPIES N INTEGER VALUES BETWEEN IA AND STATE(IPOS+1:)
+C **********************************************************************
+C
+      INTEGER N, IPOS, IDIR, I, IA(N)
+      DOUBLE PRECISION STATE(*)
+C
+      DO 100 I = 1, N
+        IF (IDIR.EQ.0) THEN
+          STATE(IPOS+I) = DBLE(IA(I))
+        ELSE
+          IA(I) = NINT(STATE(IPOS+I))
+        ENDIF
+ 100  CONTINUE
+      IPOS = IPOS + N
 C
       RETURN
       END
@@ -1376,6 +1804,159 @@ C
       END
 C
 C=============================================================================
+C
+      SUBROUTINE INTGRK(NN,TIME,H,YY)
+C **********************************************************************
+C  Runge-Kutta Integration Algorithm
+C     ADVANCES YY OVER ONE CONTROLLER INTERVAL H (= 3 DELTAT) WITH THE
+C     METHOD SELECTED IN /TEINTG/:
+C       IMETH = 1  RALSTON RK2      (2 TEFUNC CALLS PER INTERVAL)
+C       IMETH = 2  RK4, 3/8 RULE    (4 TEFUNC CALLS PER INTERVAL)
+C     BOTH METHODS HAVE A STAGE AT TIME + 2H/3, WHICH IS WHERE EULER
+C     COMPUTES THE MEASUREMENTS READ BY THE NEXT CONTROLLER CALL.  ONLY
+C     THAT STAGE KEEPS THE SIDE EFFECTS OF TEFUNC (MEASUREMENT NOISE,
+C     ANALYZER SAMPLING, RANDOM WALKS, STICKY VALVES); FOR THE OTHER
+C     STAGES THE COMMON BLOCKS ARE RESTORED AFTER THE CALL.
+C **********************************************************************
+C
+      INTEGER IMETH, NRKACC
+      COMMON/TEINTG/ IMETH, NRKACC
+      DOUBLE PRECISION SETPT, DELTAT
+      COMMON/CTRLALL/ SETPT(20), DELTAT
+C
+      INTEGER I, NN, NSTATE
+      PARAMETER (NSTATE = 986)
+      DOUBLE PRECISION TIME, H, YY(NN), T0
+      DOUBLE PRECISION YT(50), YP1(50), YP2(50), YP3(50), YP4(50)
+      DOUBLE PRECISION STATE(NSTATE)
+C
+      T0 = TIME
+C
+      CALL TEXFER(STATE,0)
+      CALL TEFUNC(NN,T0,YY,YP1)
+      CALL TEXFER(STATE,1)
+C
+      IF (IMETH.EQ.2) THEN
+C
+        DO 100 I = 1, NN
+          YT(I) = YY(I) + H*YP1(I)/3.D0
+ 100    CONTINUE
+        CALL TEFUNC(NN,T0+H/3.D0,YT,YP2)
+        CALL TEXFER(STATE,1)
+C
+        DO 110 I = 1, NN
+          YT(I) = YY(I) + H*(YP2(I) - YP1(I)/3.D0)
+ 110    CONTINUE
+        CALL TEFUNC(NN,T0+2.D0*H/3.D0,YT,YP3)
+        CALL TEXFER(STATE,0)
+C
+        DO 120 I = 1, NN
+          YT(I) = YY(I) + H*(YP1(I) - YP2(I) + YP3(I))
+ 120    CONTINUE
+        CALL TEFUNC(NN,T0+H,YT,YP4)
+        CALL TEXFER(STATE,1)
+C
+        DO 130 I = 1, NN
+          YY(I) = YY(I) + H*(YP1(I) + 3.D0*YP2(I)
+     .          + 3.D0*YP3(I) + YP4(I))/8.D0
+ 130    CONTINUE
+        NRKACC = NRKACC + 1
+C
+      ELSE
+C
+        DO 200 I = 1, NN
+          YT(I) = YY(I) + 2.D0*H*YP1(I)/3.D0
+ 200    CONTINUE
+        CALL TEFUNC(NN,T0+2.D0*H/3.D0,YT,YP2)
+C
+        DO 230 I = 1, NN
+          YY(I) = YY(I) + H*(YP1(I) + 3.D0*YP2(I))/4.D0
+ 230    CONTINUE
+        NRKACC = NRKACC + 1
+C
+      ENDIF
+C
+      TIME = T0 + H
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_SETINTEGRATOR(METHOD)
+C **********************************************************************
+C     SELECTS THE INTEGRATOR USED BY TEMAIN_ADVANCE AND TEMAIN_ENSEMBLE
+C     (TEMAIN ALWAYS USES EULER) AND RESETS THE STEP COUNTER.
+C       METHOD = 0 EULER, 1 RK2, 2 RK4
+C **********************************************************************
+C
+      INTEGER IMETH, NRKACC
+      COMMON/TEINTG/ IMETH, NRKACC
+C
+      INTEGER METHOD
+C
+      IMETH = METHOD
+      NRKACC = 0
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_INTEGRATORSTATS(NACC)
+C **********************************************************************
+C     RETURNS THE NUMBER OF 3 S INTERVALS INTEGRATED WITH ONE RUNGE-KUTTA
+C     STEP (NACC)
+C **********************************************************************
+C
+      INTEGER IMETH, NRKACC
+      COMMON/TEINTG/ IMETH, NRKACC
+C
+      INTEGER NACC
+C
+      NACC = NRKACC
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      SUBROUTINE TEMAIN_NOISEOFF
+C **********************************************************************
+C     ZEROES THE MEASUREMENT NOISE SET BY TEINIT (XNS IN /TEPROC/) UNTIL
+C     THE NEXT TEMAIN_INIT, SO THAT RUNS WITH DIFFERENT INTEGRATORS CAN BE
+C     COMPARED WITHOUT THEIR DIFFERENT RANDOM NUMBER SEQUENCES
+C **********************************************************************
+C
+      DOUBLE PRECISION TPRD(580)
+      INTEGER IVSTA(12)
+      COMMON/TEPROC/ TPRD, IVSTA
+C
+      INTEGER I
+C
+C   XNS(41) IS FOLLOWED BY TGAS, TPROD AND VST(12) AT THE END OF /TEPROC/
+C
+      DO 100 I = 526, 566
+        TPRD(I) = 0.D0
+ 100  CONTINUE
+C
+      RETURN
+      END
+C
+C=============================================================================
+C
+      BLOCK DATA TEINTD
+C **********************************************************************
+C     DEFAULT INTEGRATOR: EULER
+C **********************************************************************
+C
+      INTEGER IMETH, NRKACC
+      COMMON/TEINTG/ IMETH, NRKACC
+      DATA IMETH, NRKACC /0, 0/
+C
+      END
+C
+C=============================================================================
 C
       SUBROUTINE CONSHAND
 C **********************************************************************
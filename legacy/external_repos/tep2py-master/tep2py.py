@@ -32,10 +32,36 @@ XDATA = temain_mod.temain(NPTS, NX, IDATA, VERBOSE)
 """
 
 # modules
+import os
+import time
 import numpy as np
 import pandas as pd
 import temain_mod
 
+# steady-state checkpoints written by tep2py_stepper.warm_start
+CHECKPOINT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'checkpoints')
+# bump when the state vector of TEMAIN_SNAPSHOT changes (COMMON blocks, order or meaning)
+CHECKPOINT_VERSION = 2
+
+# static column metadata of the (NX, 52) XDATA array
+COLUMNS = tuple(
+    ["XMEAS({:})".format(i) for i in range(1,41+1)]
+    + ["XMV({:})".format(i) for i in range(1,11+1)]
+    )
+XMEAS = slice(0, 41)
+XMV = slice(41, 52)
+
+# keys of one sample as exchanged by the live control panels, in column order
+SAMPLE_KEYS = tuple(
+    ["XMEAS_{:}".format(i) for i in range(1,41+1)]
+    + ["XMV_{:}".format(i) for i in range(1,11+1)]
+    )
+
+
+def sample_dict(row):
+    """Map one XDATA row (52,) to {'XMEAS_1': ..., 'XMV_11': ...} without pandas."""
+    return dict(zip(SAMPLE_KEYS, np.asarray(row, dtype=np.float64).tolist()))
+
 
 class tep2py():
 
@@ -53,17 +79,20 @@ class tep2py():
         self._build_disturbance_table()
 
 
-    def simulate(self):
+    def simulate(self, raw=False):
         """
         Parameters
         ----------
         IDATA : 2d-array
         MATRIX OF DISTURBANCES TIME-SERIES (NX, 20)
+        raw : bool
+        IF True, RETURN XDATA AS A FORTRAN-ORDERED FLOAT64 ARRAY (columns in `COLUMNS`)
 
         Returns
         -------
-        XDATA : DataFrame
+        XDATA : 2d-array (raw=True)
         MATRIX OF PROCESS MEASUREMENTS AND MANIPULATED VARIABLES (NX, 52)
+        The DataFrame version is built on first access of `process_data`.
         """
         idata = self.disturbance_matrix
 
@@ -95,18 +124,24 @@ class tep2py():
                 xdata = self._generate_realistic_tep_data(idata)
                 print(f"⚠️  Using realistic TEP-like data as fallback")
 
-        # column names
-        names = ( 
-                ["XMEAS({:})".format(i) for i in range(1,41+1)] 
-                + ["XMV({:})".format(i) for i in range(1,11+1)] 
-                )
-        # index
-        datetime = np.arange(0, 3*idata.shape[0] , 3, dtype='datetime64[m]')  
+        # f2py already returns Fortran-ordered float64, so this is a view
+        self.xdata = np.asfortranarray(xdata, dtype=np.float64)
+        self._process_data = None
+
+        if raw:
+            return self.xdata
 
-        # data as DataFrame
-        xdata = pd.DataFrame(xdata, columns=names, index=datetime)
+    @property
+    def process_data(self):
+        """XDATA as a DataFrame with a datetime64 index, built lazily from `xdata`."""
+        if self._process_data is None:
+            # index
+            datetime = np.arange(0, 3*self.xdata.shape[0] , 3, dtype='datetime64[m]')
 
-        self.process_data = xdata
+            # data as DataFrame
+            self._process_data = pd.DataFrame(self.xdata, columns=list(COLUMNS), index=datetime)
+
+        return self._process_data
 
     def _generate_realistic_tep_data(self, idata):
         """Generate realistic TEP-like data when Fortran simulation fails."""
@@ -317,6 +352,273 @@ class tep2py():
         self.info_disturbance = table
 
 
+class tep2py_stepper():
+    """
+    Resumable TEP simulation that keeps the plant state between calls.
+
+    Each call to `advance` continues from where the previous one stopped,
+    so stepping a live plant costs the same no matter how long it has been
+    running. Advancing in several calls gives the same data as one
+    `temain` call over the concatenated disturbance rows.
+
+    Parameters
+    ----------
+    verbose : bool
+        Print the simulator progress messages.
+    noise : bool
+        Keep the measurement noise (False switches it off, see TEMAIN_NOISEOFF).
+    """
+
+    def __init__(self, verbose=False, noise=True):
+        self.verbose = int(bool(verbose))
+        self.noise = bool(noise)
+        self.state_size = int(temain_mod.temain_statesize())
+        self.init()
+
+    def init(self):
+        """Reset the simulator to the TEINIT initial condition."""
+        temain_mod.temain_init()
+        if not self.noise:
+            temain_mod.temain_noiseoff()
+        self.n_samples = 0
+
+    def advance(self, n_samples, idv_rows):
+        """
+        Parameters
+        ----------
+        n_samples : int
+            NUMBER OF 3-MIN SAMPLES TO SIMULATE
+        idv_rows : array-like
+            DISTURBANCES FOR EACH SAMPLE (n_samples, 20), OR A SINGLE ROW (20,)
+            HELD CONSTANT OVER ALL SAMPLES
+
+        Returns
+        -------
+        XDATA : 2d-array
+        MATRIX OF PROCESS MEASUREMENTS AND MANIPULATED VARIABLES (n_samples, 52)
+        """
+        idata = np.asarray(idv_rows)
+        if idata.ndim == 1:
+            idata = np.tile(idata, (n_samples, 1))
+        if idata.shape != (n_samples, 20):
+            raise ValueError('Matrix of disturbances do not have the appropriate dimension.'
+                'It must be shape==(n_samples, 20)')
+
+        xdata = temain_mod.temain_advance(n_samples, idata, self.verbose)
+        self.n_samples += n_samples
+        return xdata
+
+    def snapshot(self):
+        """Return a copy of the complete simulator state as a 1d-array."""
+        return temain_mod.temain_snapshot(self.state_size)
+
+    def restore(self, state):
+        """Restore a state previously returned by `snapshot`."""
+        state = np.asarray(state, dtype=np.float64)
+        if state.shape != (self.state_size,):
+            raise ValueError('State vector must have shape ({},)'.format(self.state_size))
+        temain_mod.temain_restore(state)
+        # first entry of the state vector is the 1-s integration step counter
+        self.n_samples = int(state[0]) // 180
+
+    def save_checkpoint(self, path, mode='mode1'):
+        """Write the current simulator state to a compact binary file (.npz)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez(path, state=self.snapshot(), mode=mode, version=CHECKPOINT_VERSION,
+                 state_size=self.state_size, integrator=_integrator, noise=self.noise)
+
+    def load_checkpoint(self, path):
+        """
+        Restore the simulator state from a file written by `save_checkpoint`.
+
+        Returns
+        -------
+        bool
+            False if the file is missing, was written by an incompatible build
+            (checkpoint version or state size) or under another integrator or
+            noise setting.
+        """
+        if not os.path.exists(path):
+            return False
+        try:
+            with np.load(path) as ckpt:
+                if (int(ckpt['version']) != CHECKPOINT_VERSION
+                        or int(ckpt['state_size']) != self.state_size
+                        or str(ckpt['integrator']) != _integrator
+                        or bool(ckpt['noise']) != self.noise):
+                    return False
+                state = ckpt['state']
+        except (OSError, KeyError, ValueError):
+            return False
+        self.restore(state)
+        return True
+
+    def warm_start(self, mode='mode1', warmup_samples=25, checkpoint_dir=None):
+        """
+        Put the simulator in steady state for `mode`.
+
+        Loads the checkpoint for `mode` if one exists; otherwise runs
+        `warmup_samples` fault-free samples from TEINIT once and saves the
+        result, so later warm starts take milliseconds. Checkpoints are kept
+        per integrator (see `set_integrator`) and noise setting, because the
+        state reached during the warm-up depends on both.
+
+        Returns
+        -------
+        bool
+            True if the state came from an existing checkpoint.
+        """
+        path = os.path.join(checkpoint_dir or CHECKPOINT_DIR, 'tep_{}_{}{}.npz'.format(
+            mode, _integrator, '' if self.noise else '_nonoise'))
+        if self.load_checkpoint(path):
+            return True
+
+        self.init()
+        self.advance(warmup_samples, np.zeros(20))
+        self.save_checkpoint(path, mode=mode)
+        return False
+
+
+def simulate_ensemble(idata, seeds=None, verbose=False, method=None):
+    """
+    Run K independent scenarios in a single TEMAIN_ENSEMBLE call.
+
+    Every member starts from TEINIT, so each result equals a separate
+    `tep2py(idata[k]).simulate()` run with the same seed, without the
+    per-scenario Python and DataFrame overhead. This shares the Fortran
+    state with `tep2py_stepper`: re-initialise or restore a stepper after
+    running an ensemble.
+
+    Parameters
+    ----------
+    idata : 3d-array
+        DISTURBANCES TIME-SERIES TENSOR (K, NX, 20)
+    seeds : array-like, optional
+        RANDOM SEED PER MEMBER (K,). 0 or None keeps the TEINIT seed.
+    verbose : bool
+        Print the simulator progress messages.
+    method : str, optional
+        Integrator to use (see `set_integrator`). None keeps the current one.
+
+    Returns
+    -------
+    XDATA : 3d-array
+        PROCESS MEASUREMENTS AND MANIPULATED VARIABLES (K, NX, 52)
+    """
+    idata = np.asarray(idata)
+    if idata.ndim != 3 or idata.shape[2] != 20:
+        raise ValueError('Tensor of disturbances do not have the appropriate dimension.'
+            'It must be shape==(K, NX, 20)')
+
+    if seeds is None:
+        seeds = np.zeros(idata.shape[0])
+    seeds = np.asarray(seeds, dtype=np.float64)
+    if seeds.shape != (idata.shape[0],):
+        raise ValueError('One seed per ensemble member is required.')
+
+    if method is not None:
+        set_integrator(method)
+
+    return temain_mod.temain_ensemble(idata, seeds, int(bool(verbose)))
+
+
+# integrators available to TEMAIN_ADVANCE / TEMAIN_ENSEMBLE
+INTEGRATORS = {'euler': 0, 'rk2': 1, 'rk4': 2}
+
+_integrator = 'euler'
+
+
+def set_integrator(method='euler'):
+    """
+    Select the integrator used by `tep2py_stepper` and `simulate_ensemble`.
+
+    Euler integrates every 1 s. The other methods cover each 3 s controller
+    interval with one Runge-Kutta step, so the controllers keep their
+    3 s / 360 s / 900 s schedule:
+
+    - 'rk2' : Ralston RK2, 2 model evaluations per 3 s (~1.5x faster)
+    - 'rk4' : RK4 (3/8 rule), 4 model evaluations per 3 s (~0.9x, i.e.
+              slower than Euler; only useful for its accuracy)
+
+    There is no adaptive method: a step can never be longer than the 3 s
+    controller interval, so step-size control could only shrink steps.
+
+    The setting lives in the Fortran module, so it applies to the whole
+    process. `tep2py.simulate` always uses Euler. Check a method against
+    Euler with `validate_integrator` before using it for datasets.
+    """
+    global _integrator
+    if method not in INTEGRATORS:
+        raise ValueError('Unknown integrator {!r}. Choose one of {}'.format(
+            method, ', '.join(INTEGRATORS)))
+
+    temain_mod.temain_setintegrator(INTEGRATORS[method])
+    _integrator = method
+
+
+def integrator_stats():
+    """Return the number of Runge-Kutta intervals since `set_integrator`."""
+    return int(temain_mod.temain_integratorstats())
+
+
+def validate_integrator(idata, method='rk2', tol=1e-2):
+    """
+    Compare an integrator against Euler on the disturbances `idata`.
+
+    Both runs start from TEINIT with the measurement noise switched off,
+    because the integrators draw different random number sequences; random
+    variation disturbances (IDV 8-12, 13, 16-20) are therefore not
+    comparable. The error of each variable is scaled by its range in the
+    Euler run. This shares the Fortran state with `tep2py_stepper`.
+
+    Parameters
+    ----------
+    idata : 2d-array
+        MATRIX OF DISTURBANCES TIME-SERIES (NX, 20)
+    method : str
+        Integrator to validate (see `set_integrator`).
+    tol : float
+        Largest accepted scaled error.
+
+    Returns
+    -------
+    dict
+        'passed', 'max_error', 'errors' (52,), 'speedup' and 'rk_steps'.
+    """
+    idata = np.asarray(idata)
+    if idata.ndim != 2 or idata.shape[1] != 20:
+        raise ValueError('Matrix of disturbances do not have the appropriate dimension.'
+            'It must be shape[1]==20')
+
+    previous = _integrator
+    runs = {}
+    try:
+        for name in ('euler', method):
+            set_integrator(name)
+            temain_mod.temain_init()
+            temain_mod.temain_noiseoff()
+            start = time.perf_counter()
+            xdata = temain_mod.temain_advance(idata.shape[0], idata, 0)
+            runs[name] = (xdata, time.perf_counter() - start, integrator_stats())
+    finally:
+        set_integrator(previous)
+
+    reference, t_euler, _ = runs['euler']
+    xdata, t_method, rk_steps = runs[method]
+    scale = np.ptp(reference, axis=0) + 1e-3 * np.abs(reference.mean(axis=0)) + 1e-12
+    errors = np.max(np.abs(xdata - reference), axis=0) / scale
+
+    return {
+        'passed': bool(errors.max() <= tol),
+        'max_error': float(errors.max()),
+        'errors': errors,
+        'speedup': t_euler / t_method,
+        'rk_steps': rk_steps,
+    }
+
+
 def test_tep_in_py():
     # matrix of disturbances
     idata = np.zeros((5,20))
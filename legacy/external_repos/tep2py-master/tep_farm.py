@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+XDATA = tep_farm.run_scenarios(IDATA, SEEDS, MAX_WORKERS, METHOD)
+  Runs many independent TEP scenarios in parallel worker processes.
+
+  The Fortran simulator keeps its whole state in COMMON blocks, so it cannot
+  run concurrently in threads. Each worker process owns one copy of
+  `temain_mod` and simulates a shard of the scenarios with
+  `simulate_ensemble`; the results are written straight into one shared
+  memory block instead of being pickled back to the parent.
+
+  Parameters
+  ----------
+  IDATA : 3d-array
+    DISTURBANCES TIME-SERIES TENSOR (K, NX, 20)
+  SEEDS : array-like, optional
+    RANDOM SEED PER SCENARIO (K,). 0 or None keeps the TEINIT seed.
+  MAX_WORKERS : int, optional
+    NUMBER OF WORKER PROCESSES (default: number of CPUs)
+  METHOD : str, optional
+    INTEGRATOR, SEE tep2py.set_integrator (default: euler)
+
+  Returns
+  -------
+  XDATA : 3d-array
+    PROCESS MEASUREMENTS AND MANIPULATED VARIABLES (K, NX, 52)
+"""
+
+# modules
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _attach(name):
+    """Attach to an existing shared memory block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # pool workers share the parent's resource tracker, which already owns the block
+    return shared_memory.SharedMemory(name=name)
+
+
+def _run_shard(shm_name, shape, start, idata, seeds, verbose, method):
+    """Worker: simulate scenarios [start, start + len(idata)) into shared memory."""
+    from tep2py import simulate_ensemble
+
+    shm = _attach(shm_name)
+    try:
+        xdata = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        xdata[start:start + idata.shape[0]] = simulate_ensemble(idata, seeds, verbose, method)
+    finally:
+        shm.close()
+    return start, idata.shape[0]
+
+
+def shard_bounds(n_scenarios, n_workers, shards_per_worker=4):
+    """Split `n_scenarios` into contiguous (start, stop) shards for `n_workers`."""
+    n_shards = max(1, min(n_scenarios, n_workers * shards_per_worker))
+    edges = np.linspace(0, n_scenarios, n_shards + 1).astype(int)
+    return [(int(a), int(b)) for a, b in zip(edges[:-1], edges[1:]) if b > a]
+
+
+def run_scenarios(idata, seeds=None, max_workers=None, verbose=False, method='euler'):
+    """Simulate the (K, NX, 20) disturbance tensor across worker processes (see module docstring)."""
+    idata = np.ascontiguousarray(idata, dtype=np.int32)
+    if idata.ndim != 3 or idata.shape[2] != 20:
+        raise ValueError('Tensor of disturbances do not have the appropriate dimension.'
+            'It must be shape==(K, NX, 20)')
+
+    k, nx = idata.shape[0], idata.shape[1]
+    if seeds is None:
+        seeds = np.zeros(k)
+    seeds = np.asarray(seeds, dtype=np.float64)
+    if seeds.shape != (k,):
+        raise ValueError('One seed per scenario is required.')
+
+    max_workers = max(1, min(max_workers or os.cpu_count() or 1, k))
+    shape = (k, nx, 52)
+
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [
+                pool.submit(_run_shard, shm.name, shape, a,
+                            idata[a:b], seeds[a:b], verbose, method)
+                for a, b in shard_bounds(k, max_workers)
+            ]
+            for future in futures:
+                future.result()
+        xdata = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return xdata
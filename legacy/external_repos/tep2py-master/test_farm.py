@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the process-pool scenario farm (tep_farm.run_scenarios)
+Sharding must cover every scenario once and the farm must match an in-process ensemble run
+"""
+
+import numpy as np
+from tep2py import simulate_ensemble
+from tep_farm import run_scenarios, shard_bounds
+
+
+def test_shard_bounds():
+    """Shards are contiguous, non-empty and cover [0, K) exactly once"""
+    for k, workers in [(1, 4), (3, 8), (10, 2), (100, 3)]:
+        shards = shard_bounds(k, workers)
+        covered = [i for a, b in shards for i in range(a, b)]
+        print(f"K={k} workers={workers}: {len(shards)} shards")
+        assert covered == list(range(k))
+        assert all(b > a for a, b in shards)
+        assert len(shards) <= workers * 4
+
+
+def test_farm_matches_ensemble():
+    """Scenarios simulated across workers equal the same scenarios run in one process"""
+    k, nx = 4, 6
+    idata = np.zeros((k, nx, 20), dtype=np.int32)
+    for m in range(k):
+        idata[m, nx // 2:, m] = 1  # IDV(m+1) step half-way through
+    seeds = [1431655765., 4243534565., 1431655765., 4243534565.]
+
+    xdata = run_scenarios(idata, seeds, max_workers=2)
+    reference = simulate_ensemble(idata, seeds)
+    assert xdata.shape == (k, nx, 52)
+    print(f"Max abs difference: {np.max(np.abs(xdata - reference)):.3e}")
+    assert np.allclose(xdata, reference, rtol=1e-9, atol=0.0)
+
+
+def test_farm_rejects_bad_input():
+    """Wrong tensor shape or seed count raises ValueError"""
+    for idata, seeds in [(np.zeros((5, 20)), None), (np.zeros((2, 5, 20)), [1.0])]:
+        try:
+            run_scenarios(idata, seeds)
+            assert False, "ValueError expected"
+        except ValueError:
+            pass
+
+
+if __name__ == '__main__':
+    test_shard_bounds()
+    test_farm_matches_ensemble()
+    test_farm_rejects_bad_input()
+    print("✅ Scenario farm tests passed")
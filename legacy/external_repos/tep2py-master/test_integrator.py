@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script for the selectable integrators (tep2py.set_integrator)
+Checks the Runge-Kutta methods against Euler in the noise-free accuracy mode
+"""
+
+import numpy as np
+import tep2py
+
+
+def _fault_matrix(nx=60, idv=1):
+    idata = np.zeros((nx, 20), dtype=np.int32)
+    idata[10:, idv - 1] = 1
+    return idata
+
+
+def test_methods_match_euler():
+    """RK2 and RK4 stay within 1% of the Euler trajectories (IDV 1)"""
+    idata = _fault_matrix()
+    for method in ('rk2', 'rk4'):
+        report = tep2py.validate_integrator(idata, method, tol=1e-2)
+        print(f"{method:>8}: max scaled error {report['max_error']:.2e}, "
+              f"speedup {report['speedup']:.2f}x, rk steps {report['rk_steps']}")
+        assert report['passed']
+        assert report['rk_steps'] > 0
+
+
+def test_euler_is_default():
+    """validate_integrator restores the previous setting"""
+    idata = _fault_matrix(nx=4)
+    tep2py.validate_integrator(idata, 'rk2')
+    assert tep2py.integrator_stats() == 0
+
+    sim = tep2py.tep2py_stepper()
+    sim.advance(4, idata)
+    assert tep2py.integrator_stats() == 0
+
+
+def test_unknown_method():
+    for method in ('rk45', 'adaptive'):
+        try:
+            tep2py.set_integrator(method)
+        except ValueError:
+            continue
+        raise AssertionError(f'unknown integrator {method!r} accepted')
+
+
+if __name__ == '__main__':
+    test_methods_match_euler()
+    test_euler_is_default()
+    test_unknown_method()
+    print("✅ Integrator tests passed")
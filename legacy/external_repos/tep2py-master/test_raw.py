@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Test script for the raw NumPy result path of tep2py.simulate
+Checks that raw=True returns the same data as the lazily built DataFrame
+"""
+
+import numpy as np
+import tep2py
+
+
+def test_raw_matches_dataframe():
+    """simulate(raw=True) must be a Fortran-ordered view of process_data"""
+    idata = np.zeros((6, 20))
+    tep = tep2py.tep2py(idata)
+    xdata = tep.simulate(raw=True)
+
+    assert xdata.shape == (6, 52)
+    assert xdata.dtype == np.float64 and xdata.flags.f_contiguous
+    assert tep._process_data is None  # DataFrame not built yet
+
+    df = tep.process_data
+    assert tuple(df.columns) == tep2py.COLUMNS
+    assert np.array_equal(df.values, xdata)
+    assert tep.process_data is df  # built once
+
+
+def test_sample_dict():
+    """sample_dict maps one row to the live panel keys"""
+    row = np.arange(52, dtype=np.float64)
+    sample = tep2py.sample_dict(row)
+
+    assert list(sample) == list(tep2py.SAMPLE_KEYS)
+    assert sample['XMEAS_1'] == 0.0 and sample['XMV_11'] == 51.0
+    assert np.array_equal(row[tep2py.XMV], [sample[k] for k in tep2py.SAMPLE_KEYS[tep2py.XMV]])
+
+
+if __name__ == '__main__':
+    test_raw_matches_dataframe()
+    test_sample_dict()
+    print("✅ Raw result tests passed")
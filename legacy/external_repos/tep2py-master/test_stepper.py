@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the resumable stepping API (tep2py_stepper)
+Checks that incremental stepping and snapshot/restore reproduce TEMAIN exactly
+"""
+
+import os
+import tempfile
+
+import numpy as np
+import temain_mod
+import tep2py
+from tep2py import tep2py_stepper
+
+
+def _fault_matrix(nx=12):
+    idata = np.zeros((nx, 20), dtype=np.int32)
+    idata[nx // 2:, 0] = 1  # IDV(1) step half-way through
+    return idata
+
+
+def test_advance_matches_temain():
+    """Stepping one sample at a time must give the same data as one TEMAIN run"""
+    idata = _fault_matrix()
+    nx = idata.shape[0]
+    reference = temain_mod.temain(180 * nx, nx, idata, 0)
+
+    sim = tep2py_stepper()
+    stepped = np.vstack([sim.advance(1, row) for row in idata])
+
+    # TEINIT does not reset the temperature guesses TESUB2 iterates from, so
+    # runs in the same process can differ in the last few digits
+    print(f"Max abs difference: {np.max(np.abs(stepped - reference)):.3e}")
+    assert np.allclose(stepped, reference, rtol=1e-9, atol=0.0)
+    assert sim.n_samples == nx
+
+
+def test_snapshot_restore():
+    """Restoring a snapshot must replay the same trajectory"""
+    idata = _fault_matrix()
+    sim = tep2py_stepper()
+    sim.advance(4, idata[:4])
+    state = sim.snapshot()
+
+    first = sim.advance(8, idata[4:])
+    sim.init()
+    sim.advance(2, idata[:2])
+    sim.restore(state)
+    second = sim.advance(8, idata[4:])
+
+    print(f"State vector length: {state.shape[0]}")
+    assert sim.n_samples == 12
+    assert np.array_equal(first, second)
+
+
+def test_checkpoint_keyed_by_integrator_and_noise():
+    """A checkpoint written under one integrator or noise setting is not loaded under another"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sim = tep2py_stepper()
+        assert not sim.warm_start('mode1', warmup_samples=2, checkpoint_dir=tmp)
+        assert sim.warm_start('mode1', warmup_samples=2, checkpoint_dir=tmp)
+
+        tep2py.set_integrator('rk2')
+        try:
+            assert not sim.warm_start('mode1', warmup_samples=2, checkpoint_dir=tmp)
+        finally:
+            tep2py.set_integrator('euler')
+
+        quiet = tep2py_stepper(noise=False)
+        assert not quiet.warm_start('mode1', warmup_samples=2, checkpoint_dir=tmp)
+        print(f"Checkpoints: {sorted(os.listdir(tmp))}")
+        assert len(os.listdir(tmp)) == 3
+
+
+def test_checkpoint_metadata_checked():
+    """load_checkpoint rejects files from another version, integrator or noise setting"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sim = tep2py_stepper()
+        sim.advance(2, np.zeros(20))
+        path = os.path.join(tmp, 'ckpt.npz')
+        sim.save_checkpoint(path)
+        assert sim.load_checkpoint(path)
+
+        with np.load(path) as ckpt:
+            fields = dict(ckpt)
+        for name, value in (('version', tep2py.CHECKPOINT_VERSION - 1), ('integrator', 'rk4'), ('noise', False)):
+            other = os.path.join(tmp, 'ckpt_{}.npz'.format(name))
+            np.savez(other, **{**fields, name: value})
+            assert not sim.load_checkpoint(other), name
+        legacy = os.path.join(tmp, 'ckpt_legacy.npz')
+        np.savez(legacy, **{k: v for k, v in fields.items() if k != 'version'})
+        assert not sim.load_checkpoint(legacy)
+
+
+if __name__ == '__main__':
+    test_advance_matches_temain()
+    test_snapshot_restore()
+    test_checkpoint_keyed_by_integrator_and_noise()
+    test_checkpoint_metadata_checked()
+    print("✅ Stepper tests passed")
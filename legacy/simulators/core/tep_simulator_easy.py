@@ -133,6 +133,52 @@ class TEPSimulatorEasy:
         
         return results
     
+    def run_fault_batch(self, fault_types, duration_hours=8, fault_start_hour=1, save_results=True, max_workers=None, method='euler'):
+        """
+        Run several fault scenarios in parallel worker processes.
+
+        Produces the same CSV files as calling run_simulation() once per fault,
+        but the scenarios are sharded across all CPU cores. `method` selects
+        the integrator (see tep2py.set_integrator); 'rk2' is about 1.5x faster,
+        check it with tep2py.validate_integrator first.
+
+        Returns:
+        --------
+        dict
+            fault_type -> pandas.DataFrame with the simulation results
+        """
+        from tep_farm import run_scenarios
+
+        samples_per_hour = 20  # 60 minutes / 3 minutes per sample
+        total_samples = int(duration_hours * samples_per_hour)
+        fault_start_sample = int(fault_start_hour * samples_per_hour)
+
+        idata = np.zeros((len(fault_types), total_samples, 20))
+        for k, fault_type in enumerate(fault_types):
+            if 0 < fault_type <= 20 and fault_start_sample < total_samples:
+                idata[k, fault_start_sample:, fault_type-1] = 1
+
+        print(f"\n🚀 Running {len(fault_types)} TEP scenarios in parallel ({max_workers or os.cpu_count()} workers)")
+        xdata = run_scenarios(idata, max_workers=max_workers, method=method)
+
+        names = (
+            ["XMEAS({:})".format(i) for i in range(1, 41+1)]
+            + ["XMV({:})".format(i) for i in range(1, 11+1)]
+        )
+        index = np.arange(0, 3*total_samples, 3, dtype='datetime64[m]')
+
+        batch = {}
+        for k, fault_type in enumerate(fault_types):
+            results = pd.DataFrame(xdata[k], columns=names, index=index)
+            results['Time_Hours'] = np.arange(0, duration_hours, duration_hours/len(results))
+            if save_results:
+                filename = f"tep_simulation_fault_{fault_type}_{duration_hours}h.csv"
+                results.to_csv(filename)
+                print(f"💾 Results saved to: {filename}")
+            batch[fault_type] = results
+
+        return batch
+
     def _plot_results(self, results, fault_type, fault_start_hour):
         """Generate plots for simulation results."""
         
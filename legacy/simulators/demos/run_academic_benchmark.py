@@ -84,9 +84,7 @@ def run_standard_benchmark():
     # Standard academic faults (skip 16-20 as they're unknown)
     standard_faults = list(range(1, 16))  # Faults 1-15
     
-    print(f"\nThis will run {len(standard_faults)} fault simulations.")
-    print("Each simulation takes about 30-60 seconds.")
-    print(f"Estimated total time: {len(standard_faults) * 1} minutes")
+    print(f"\nThis will run {len(standard_faults)} fault simulations in parallel on {os.cpu_count()} cores.")
     
     confirm = input("\nProceed with full benchmark? (y/n): ").lower().strip()
     if confirm != 'y':
@@ -96,37 +94,18 @@ def run_standard_benchmark():
     successful_runs = 0
     start_time = time.time()
     
-    # Run each fault
-    for i, fault_id in enumerate(standard_faults, 1):
-        print(f"\n[{i}/{len(standard_faults)}] Running Fault {fault_id}...")
-        
-        try:
-            simulator.run_simulation(
-                duration_hours=8,
-                fault_type=fault_id,
-                fault_start_hour=1,
-                save_results=True,
-                plot_results=False  # Skip plots for speed
-            )
-            successful_runs += 1
-            print(f"   ✅ Fault {fault_id} completed")
-        except Exception as e:
-            print(f"   ❌ Fault {fault_id} failed: {e}")
-    
-    # Also run normal operation for comparison
-    print(f"\n[{len(standard_faults)+1}/{len(standard_faults)+1}] Running Normal Operation...")
+    # Run all faults plus normal operation (for comparison) across all CPU cores
     try:
-        simulator.run_simulation(
+        results = simulator.run_fault_batch(
+            standard_faults + [0],
             duration_hours=8,
-            fault_type=0,
             fault_start_hour=1,
-            save_results=True,
-            plot_results=False
+            save_results=True
         )
-        successful_runs += 1
-        print("   ✅ Normal operation completed")
+        successful_runs = len(results)
+        print(f"   ✅ Faults {standard_faults[0]}-{standard_faults[-1]} and normal operation completed")
     except Exception as e:
-        print(f"   ❌ Normal operation failed: {e}")
+        print(f"   ❌ Parallel benchmark failed: {e}")
     
     elapsed_time = time.time() - start_time
     print(f"\n🎉 Standard benchmark complete!")